@@ -0,0 +1,116 @@
+"""
+Micro-benchmark for convert_mongo_objs.
+
+Compares the per-document cost of the previous isinstance/import based
+converter with the type-dispatch converter on a person-shaped document
+(~40 values, nested address/student/metadata sub-documents).
+
+Run from the backend directory:
+
+    python benchmarks/convert_mongo_objs.py [--docs 20000] [--repeat 5]
+"""
+
+import argparse
+import copy
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from bson.decimal128 import Decimal128
+from bson.int64 import Int64
+from bson.objectid import ObjectId
+from dlt.common.time import ensure_pendulum_datetime_utc
+from dlt.common.utils import map_nested_values_in_place
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl_jobs.dlt_config.mongodb.source import convert_mongo_objs  # noqa: E402
+
+
+def legacy_convert_mongo_objs(value):
+    """The converter as it was before type dispatch"""
+    if isinstance(value, (ObjectId, Decimal128)):
+        return str(value)
+    try:
+        import pendulum
+
+        if isinstance(value, pendulum.DateTime):
+            return ensure_pendulum_datetime_utc(value)
+    except ImportError:
+        pass
+    from datetime import datetime
+
+    if isinstance(value, datetime):
+        return ensure_pendulum_datetime_utc(value)
+    return value
+
+
+def person_document():
+    now = datetime(2025, 12, 8, 14, 16, 23, tzinfo=timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "first_name": "Carol",
+        "last_name": "Doe",
+        "full_name": "Carol Doe",
+        "email": "carol.doe@example.com",
+        "phone": "536-555-0142",
+        "date_of_birth": datetime(1961, 4, 2, tzinfo=timezone.utc),
+        "person_type": "Student",
+        "address": {
+            "street": "20731 Duran Valleys",
+            "city": "Smithchester",
+            "state": "New Hampshire",
+            "postal_code": "48320",
+            "country": "Congo",
+            "geo": {"lat": 39.686203, "lng": -12.279112},
+        },
+        "student": {
+            "student_type": "PostGrad",
+            "year_of_study": "VII",
+            "major": "Chemistry",
+            "minor": "Physics",
+            "gpa": Decimal128("2.14"),
+            "credits_completed": Int64(144),
+            "status": "dismissed",
+            "international": False,
+            "on_scholarship": False,
+            "enrolled_at": now,
+            "enrolled_courses": [ObjectId() for _ in range(7)],
+        },
+        "metadata": {"last_portal_login": now, "notes": "", "flags": ["housing_waitlist"]},
+        "preferences": {"newsletter_opt_in": False, "preferred_contact": "email"},
+        "emergency_contacts": [],
+        "tags": [],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def per_document_us(converter, docs, repeat):
+    def run():
+        map_nested_values_in_place(converter, copy.deepcopy(docs))
+
+    baseline = min(timeit.repeat(lambda: copy.deepcopy(docs), number=1, repeat=repeat))
+    total = min(timeit.repeat(run, number=1, repeat=repeat))
+    return (total - baseline) / len(docs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = [person_document() for _ in range(args.docs)]
+    before = per_document_us(legacy_convert_mongo_objs, docs, args.repeat)
+    after = per_document_us(convert_mongo_objs, docs, args.repeat)
+
+    print(f"documents: {args.docs}, best of {args.repeat}")
+    print(f"isinstance/import converter: {before:8.2f} us/doc")
+    print(f"type-dispatch converter:     {after:8.2f} us/doc")
+    print(f"speedup:                     {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
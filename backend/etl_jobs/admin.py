@@ -16,10 +16,10 @@ class PipelineAdmin(admin.ModelAdmin):
 
     fieldsets = (
         ("Basic Information", {"fields": ("name", "description", "is_active")}),
-        ("Source Configuration", {"fields": ("source_uri", "source_database", "source_table", "source_aggregation_query")}),
+        ("Source Configuration", {"fields": ("source_type", "source_uri", "source_database", "source_table", "source_aggregation_query", "source_projection", "arrow_extraction", "arrow_schema")}),
         (
             "Destination Configuration",
-            {"fields": ("destination_uri", "destination_database", "destination_table")},
+            {"fields": ("destination_type", "destination_uri", "destination_database", "destination_table", "file_partition_field", "file_max_mb")},
         ),
         (
             "Load Configuration",
@@ -29,17 +29,33 @@ class PipelineAdmin(admin.ModelAdmin):
                     "incremental_strategy",
                     "incremental_key",
                     "primary_key",
+                    "sync_state",
                 )
             },
         ),
-        ("Masking Configuration", {"fields": ("masking_config",)}),
-        ("Scheduling", {"fields": ("frequency", "is_enabled")}),
+        (
+            "Performance",
+            {"fields": ("extract_partitions", "partition_key", "collection_workers", "fanout_partitions", "batch_size", "write_concurrency", "native_transfer", "async_reads", "checkpoint_size", "memory_budget_mb", "stream_flush_seconds")},
+        ),
+        ("Masking Configuration", {"fields": ("masking_config", "masking_cache_size")}),
+        ("Scheduling", {"fields": ("frequency", "is_enabled", "workload")}),
+        ("Diagnostics", {"fields": ("profile_runs",), "classes": ("collapse",)}),
         (
             "Timestamps",
             {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
         ),
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        dropped = obj.get_masked_fields_dropped_by_projection()
+        if dropped:
+            messages.warning(
+                request,
+                f"The source projection drops masked fields {', '.join(dropped)}; "
+                "their masking rules will have nothing to apply to.",
+            )
+
     def get_urls(self):
         urls = super().get_urls()
         return [
@@ -64,6 +80,7 @@ class JobExecutionAdmin(admin.ModelAdmin):
         "started_at",
         "duration_seconds",
         "rows_processed",
+        "rows_per_second",
         "created_at",
     )
     list_filter = ("status", "created_at", "pipeline")
@@ -79,12 +96,26 @@ class JobExecutionAdmin(admin.ModelAdmin):
             {
                 "fields": (
                     "rows_processed",
+                    "rows_normalized",
                     "rows_inserted",
                     "rows_updated",
+                    "rows_deleted",
                     "rows_failed",
+                    "bytes_extracted",
+                    "bytes_normalized",
+                    "files_extracted",
+                    "files_loaded",
+                    "rows_per_second",
+                    "extract_rows_per_second",
+                    "masking_cache_hits",
+                    "masking_cache_misses",
+                    "peak_rss_bytes",
+                    "rss_growth_bytes",
+                    "table_metrics",
                 )
             },
         ),
+        ("Stage Timings", {"fields": ("stage_timings", "profile"), "classes": ("collapse",)}),
         ("Output", {"fields": ("logs", "error_message"), "classes": ("collapse",)}),
         ("Record Information", {"fields": ("created_at",), "classes": ("collapse",)}),
     )
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class EtlJobsConfig(AppConfig):
     name = "etl_jobs"
+
+    def ready(self):
+        # schedules follow pipeline saves and deletes
+        from . import signals  # noqa: F401
@@ -5,14 +5,20 @@ This package contains:
 - Type definitions for sources and destinations
 - Factory functions for creating source and destination instances
 - Registry system for extensible pipeline components
+- Field masking applied to extracted data
 """
 
 from .types import SourceType, DestinationType
-from .factories import get_source_factory, get_destination_factory
+from .factories import get_source_factory, get_destination_factory, finalize_destination
+from .masking import Masker
+from .timing import StageTimings
 
 __all__ = [
     "SourceType",
     "DestinationType",
     "get_source_factory",
     "get_destination_factory",
+    "finalize_destination",
+    "Masker",
+    "StageTimings",
 ]
@@ -14,6 +14,8 @@ def _get_mongodb_source(config: Dict[str, Any]) -> Any:
     logger.info(f"Creating MongoDB source with config: {config}")
     from .mongodb.source import mongodb_collection
 
+    if config.get("collections"):
+        return _get_mongodb_collections_source(config)
     return mongodb_collection(
         connection_url=config["connection_url"],
         database=config["database"],
@@ -21,6 +23,45 @@ def _get_mongodb_source(config: Dict[str, Any]) -> Any:
         aggregation_pipeline=config.get("aggregation_pipeline"),
         query=config.get("query"),
         write_disposition=config.get("write_disposition", "append"),
+        incremental_key=config.get("incremental_key"),
+        state=config.get("state"),
+        partitions=config.get("partitions", 1),
+        partition_key=config.get("partition_key") or "_id",
+        projection=config.get("projection"),
+        masker=config.get("masker"),
+        timings=config.get("timings"),
+        checkpoint=config.get("checkpoint"),
+        arrow=config.get("arrow", False),
+        arrow_schema=config.get("arrow_schema"),
+        memory_budget=config.get("memory_budget") or 0,
+        async_reads=config.get("async_reads", False),
+    )
+
+
+def _get_mongodb_collections_source(config: Dict[str, Any]) -> Any:
+    """Configure a MongoDB source of several collections (names or glob patterns)"""
+    from .mongodb.source import mongodb_collections
+
+    return mongodb_collections(
+        connection_url=config["connection_url"],
+        database=config["database"],
+        collections=config["collections"],
+        table_name_template=config.get("table_name_template") or "*",
+        aggregation_pipeline=config.get("aggregation_pipeline"),
+        query=config.get("query"),
+        write_disposition=config.get("write_disposition", "append"),
+        incremental_key=config.get("incremental_key"),
+        state=config.get("state"),
+        partitions=config.get("partitions", 1),
+        partition_key=config.get("partition_key") or "_id",
+        projection=config.get("projection"),
+        masker=config.get("masker"),
+        timings=config.get("timings"),
+        arrow=config.get("arrow", False),
+        arrow_schema=config.get("arrow_schema"),
+        memory_budget=config.get("memory_budget") or 0,
+        workers=config.get("collection_workers") or 1,
+        async_reads=config.get("async_reads", False),
     )
 
 
@@ -28,19 +69,62 @@ def _get_mongodb_destination(config: Dict[str, Any]) -> Any:
     """Configure MongoDB destination"""
     logger.info(f"Creating MongoDB destination with config: {config}")
     from .mongodb.destination import mongo_sink
+    from .mongodb.writer import DEFAULT_BATCH_SIZE
+
+    write_batch_size = config.get("batch_size") or DEFAULT_BATCH_SIZE
+    max_in_flight = config.get("write_concurrency") or 1
 
     return mongo_sink(
         connection_url=config["connection_url"],
         database=config["database"],
         collection=config["collection"],
+        # hand the sink enough items per call to keep every writer thread busy
+        batch_size=write_batch_size * max_in_flight,
+        write_batch_size=write_batch_size,
+        max_in_flight=max_in_flight,
+        write_result=config.get("write_result"),
+        timings=config.get("timings"),
+        write_disposition=config.get("write_disposition") or "append",
+        primary_key=config.get("primary_key") or ["_id"],
+        checkpoint=config.get("checkpoint"),
     )
 
 
-# Future source factories can be added here
+def _finalize_mongodb_destination(config: Dict[str, Any], succeeded: bool) -> None:
+    """Wait for the MongoDB destination's in-flight writes and swap in replaced collections"""
+    from .mongodb.client import get_client
+    from .mongodb.destination import close_writers, finish_unwritten_replace
+
+    checkpoint = config.get("checkpoint")
+    written = close_writers(config.get("write_result"), succeeded=succeeded, checkpoint=checkpoint)
+    collection = config.get("collection")
+    if config.get("write_disposition") == "replace" and collection and collection not in written:
+        # the source yielded nothing, so dlt never called the sink
+        target = get_client(config["connection_url"])[config["database"]][collection]
+        finish_unwritten_replace(target, succeeded, checkpoint)
+
+
 def _get_postgresql_source(config: Dict[str, Any]) -> Any:
-    """Configure PostgreSQL source (placeholder for future implementation)"""
-    logger.info(f"Attempting to create PostgreSQL source with config: {config}")
-    raise NotImplementedError("PostgreSQL source not implemented yet")
+    """Configure PostgreSQL source"""
+    logger.info(f"Creating PostgreSQL source with config: {config}")
+    from .postgresql.source import FETCH_SIZE, postgres_table
+
+    return postgres_table(
+        connection_url=config["connection_url"],
+        schema=config.get("schema") or "public",
+        table=config["table"],
+        write_disposition=config.get("write_disposition", "append"),
+        incremental_key=config.get("incremental_key"),
+        state=config.get("state"),
+        partitions=config.get("partitions", 1),
+        partition_key=config.get("partition_key"),
+        fetch_size=config.get("fetch_size") or FETCH_SIZE,
+        masker=config.get("masker"),
+        timings=config.get("timings"),
+    )
+
+
+# Future source factories can be added here
 
 
 def _get_api_source(config: Dict[str, Any]) -> Any:
@@ -49,17 +133,66 @@ def _get_api_source(config: Dict[str, Any]) -> Any:
     raise NotImplementedError("API source not implemented yet")
 
 
-# Future destination factories can be added here
 def _get_postgresql_destination(config: Dict[str, Any]) -> Any:
-    """Configure PostgreSQL destination (placeholder for future implementation)"""
-    logger.info(f"Attempting to create PostgreSQL destination with config: {config}")
-    raise NotImplementedError("PostgreSQL destination not implemented yet")
+    """Configure PostgreSQL destination"""
+    logger.info(f"Creating PostgreSQL destination with config: {config}")
+    from .postgresql.destination import DEFAULT_COPY_BATCH_SIZE, postgres_sink
+
+    return postgres_sink(
+        connection_url=config["connection_url"],
+        schema=config.get("schema") or "public",
+        table_name=config["table"],
+        # rows per COPY into the staging table
+        batch_size=config.get("batch_size") or DEFAULT_COPY_BATCH_SIZE,
+        write_result=config.get("write_result"),
+        timings=config.get("timings"),
+        write_disposition=config.get("write_disposition") or "append",
+        primary_key=config.get("primary_key") or ["_id"],
+        checkpoint=config.get("checkpoint"),
+    )
+
+
+def _finalize_postgresql_destination(config: Dict[str, Any], succeeded: bool) -> None:
+    """Merge the run's staging tables into their targets, or roll them back"""
+    from .postgresql.destination import close_writers
+
+    close_writers(config.get("write_result"), succeeded=succeeded)
+
+
+# Future destination factories can be added here
 
 
 def _get_s3_destination(config: Dict[str, Any]) -> Any:
-    """Configure S3 destination (placeholder for future implementation)"""
-    logger.info(f"Attempting to create S3 destination with config: {config}")
-    raise NotImplementedError("S3 destination not implemented yet")
+    """Configure Parquet file destination (local path, S3 or MinIO)"""
+    logger.info(f"Creating Parquet destination with config: {config}")
+    from .parquet.destination import (
+        DEFAULT_COMPRESSION,
+        DEFAULT_MAX_FILE_BYTES,
+        DEFAULT_MAX_OPEN_PARTITIONS,
+        DEFAULT_PARQUET_BATCH_SIZE,
+        parquet_sink,
+    )
+
+    return parquet_sink(
+        bucket_url=config["bucket_url"],
+        table_name=config["table"],
+        batch_size=config.get("batch_size") or DEFAULT_PARQUET_BATCH_SIZE,
+        partition_field=config.get("partition_field"),
+        max_file_bytes=config.get("max_file_bytes") or DEFAULT_MAX_FILE_BYTES,
+        compression=config.get("compression") or DEFAULT_COMPRESSION,
+        max_open_partitions=config.get("max_open_partitions") or DEFAULT_MAX_OPEN_PARTITIONS,
+        storage_options=config.get("storage_options"),
+        write_result=config.get("write_result"),
+        timings=config.get("timings"),
+        write_disposition=config.get("write_disposition") or "append",
+    )
+
+
+def _finalize_s3_destination(config: Dict[str, Any], succeeded: bool) -> None:
+    """Complete the run's Parquet files, or delete them"""
+    from .parquet.destination import close_writers
+
+    close_writers(config.get("write_result"), succeeded=succeeded)
 
 
 # Registry for source and destination factories
@@ -78,6 +211,14 @@ DESTINATION_FACTORIES = {
 }
 
 
+# Finalizers run once after the load step, whether or not it succeeded
+DESTINATION_FINALIZERS = {
+    DestinationType.MONGODB: _finalize_mongodb_destination,
+    DestinationType.POSTGRESQL: _finalize_postgresql_destination,
+    DestinationType.S3: _finalize_s3_destination,
+}
+
+
 def get_source_factory(source_type: SourceType):
     """Get the factory function for a source type"""
     logger.info(f"Getting source factory for type: {source_type}")
@@ -94,3 +235,12 @@ def get_destination_factory(destination_type: DestinationType):
     if not factory:
         raise ValueError(f"Destination type '{destination_type.value}' not registered")
     return factory
+
+
+def finalize_destination(
+    destination_type: DestinationType, config: Dict[str, Any], succeeded: bool = True
+) -> None:
+    """Run the finalizer registered for a destination type, if any"""
+    finalizer = DESTINATION_FINALIZERS.get(destination_type)
+    if finalizer:
+        finalizer(config, succeeded)
@@ -0,0 +1,204 @@
+"""
+Field masking applied to extracted chunks before they are loaded.
+
+`masking_config` maps dotted field paths to rule names, e.g.
+{"first_name": "hash", "email": "email", "address.geo.lat": "stars"}.
+Rules are compiled once per run; `Masker.mask` then applies them column by
+column over a whole chunk of documents.
+
+Every rule is deterministic, so each compiled function sits behind a
+bounded LRU memo. The memo belongs to the Masker of a single run, and the
+hash salt is derived per pipeline from a secret (pipeline_salt), so neither
+cached values nor hashes are shared between pipelines.
+"""
+
+import hashlib
+import hmac
+from functools import lru_cache
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+MaskFunction = Callable[[Any], Any]
+
+DEFAULT_CACHE_SIZE = 100_000
+
+
+def pipeline_salt(secret: str, pipeline_id: Any) -> str:
+    """
+    The hash salt of one pipeline: the secret keyed by the pipeline id, so
+    one value hashes differently in every pipeline and the secret itself
+    never reaches a run. Empty without a secret.
+    """
+    if not secret:
+        return ""
+    return hmac.new(secret.encode(), f"pipeline:{pipeline_id}".encode(), hashlib.sha256).hexdigest()
+
+
+class HashMask:
+    """SHA-256 hex digest of the value, salted with the pipeline's salt"""
+
+    def __init__(self, salt: str = "") -> None:
+        if not salt:
+            # unsalted hashes of names or emails are reversed by a dictionary lookup
+            raise ValueError("The hash rule needs a salt; set MASKING_SALT")
+        # hashing the salt once and copying the state saves re-hashing it per value
+        self._state = hashlib.sha256(salt.encode())
+
+    def __call__(self, value: Any) -> str:
+        digest = self._state.copy()
+        digest.update(str(value).encode())
+        return digest.hexdigest()
+
+
+def mask_email(value: Any) -> Any:
+    """Keep the first and last character of the local part and the domain"""
+    text = str(value)
+    local, at, domain = text.partition("@")
+    if not at:
+        return mask_stars(text)
+    if len(local) <= 2:
+        return f"{'*' * len(local)}@{domain}"
+    return f"{local[0]}{'*' * (len(local) - 2)}{local[-1]}@{domain}"
+
+
+def mask_phone(value: Any, keep_digits: int = 3) -> str:
+    """Keep the leading digits and the separators, mask the remaining digits"""
+    masked = []
+    seen = 0
+    for char in str(value):
+        if char.isdigit():
+            seen += 1
+            masked.append(char if seen <= keep_digits else "*")
+        else:
+            masked.append(char)
+    return "".join(masked)
+
+
+def mask_year_only(value: Any) -> Optional[int]:
+    """Reduce a date to its year; values that aren't dates are dropped"""
+    if isinstance(value, (datetime, date)):
+        return value.year
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).year
+        except ValueError:
+            pass
+    return None
+
+
+def mask_stars(value: Any) -> str:
+    return "*" * len(str(value))
+
+
+# Rule name -> factory taking the run's salt
+MASKING_RULES: Dict[str, Callable[[str], MaskFunction]] = {
+    "hash": HashMask,
+    "email": lambda salt: mask_email,
+    "phone": lambda salt: mask_phone,
+    "year_only": lambda salt: mask_year_only,
+    "stars": lambda salt: mask_stars,
+}
+
+
+class MemoizedMask:
+    """LRU memo in front of a deterministic mask function"""
+
+    def __init__(self, function: MaskFunction, maxsize: int) -> None:
+        self.function = function
+        # typed: 1, 1.0 and True mask differently
+        self._cached = lru_cache(maxsize=maxsize, typed=True)(function)
+        self.uncacheable = 0
+
+    def __call__(self, value: Any) -> Any:
+        try:
+            return self._cached(value)
+        except TypeError:
+            # unhashable values (documents, arrays) aren't memoized
+            self.uncacheable += 1
+            return self.function(value)
+
+    def stats(self) -> Dict[str, int]:
+        info = self._cached.cache_info()
+        return {"hits": info.hits, "misses": info.misses + self.uncacheable, "size": info.currsize}
+
+
+class FieldRule:
+    """A mask function bound to a dotted field path"""
+
+    def __init__(self, path: str, rule: str, function: MaskFunction) -> None:
+        self.path = path
+        self.rule = rule
+        self.parts = path.split(".")
+        self.function = function
+
+    def apply(self, docs: List[Dict[str, Any]]) -> None:
+        function = self.function
+        if len(self.parts) == 1:
+            key = self.parts[0]
+            for doc in docs:
+                value = doc.get(key)
+                if value is not None:
+                    doc[key] = _mask_value(value, function)
+            return
+        for doc in docs:
+            _mask_path(doc, self.parts, function)
+
+
+class Masker:
+    """Masking rules of a pipeline, compiled for one run"""
+
+    def __init__(
+        self, masking_config: Dict[str, str], salt: str = "", cache_size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        unknown = {rule for rule in masking_config.values() if rule not in MASKING_RULES}
+        if unknown:
+            raise ValueError(
+                f"Unknown masking rules {sorted(unknown)}. Supported: {sorted(MASKING_RULES)}"
+            )
+        # one function per rule, shared by every field using it
+        functions = {rule: MASKING_RULES[rule](salt) for rule in set(masking_config.values())}
+        if cache_size:
+            functions = {rule: MemoizedMask(function, cache_size) for rule, function in functions.items()}
+        self.functions = functions
+        self.rules = [FieldRule(path, rule, functions[rule]) for path, rule in masking_config.items()]
+
+    def __repr__(self) -> str:
+        # never expose the salt in logged configs
+        return f"Masker({', '.join(f'{rule.path}:{rule.rule}' for rule in self.rules)})"
+
+    def mask(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Mask a chunk of documents in place"""
+        for rule in self.rules:
+            rule.apply(docs)
+        return docs
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Memo hits and misses summed over every rule of the run"""
+        totals = {"hits": 0, "misses": 0}
+        for function in self.functions.values():
+            if isinstance(function, MemoizedMask):
+                stats = function.stats()
+                totals["hits"] += stats["hits"]
+                totals["misses"] += stats["misses"]
+        return totals
+
+
+def _mask_value(value: Any, function: MaskFunction) -> Any:
+    if isinstance(value, list):
+        return [None if item is None else function(item) for item in value]
+    return function(value)
+
+
+def _mask_path(value: Any, parts: List[str], function: MaskFunction) -> None:
+    # arrays along the path are masked element-wise, e.g. emergency_contacts.phone
+    if isinstance(value, list):
+        for item in value:
+            _mask_path(item, parts, function)
+        return
+    if not isinstance(value, dict) or parts[0] not in value:
+        return
+    if len(parts) == 1:
+        if value[parts[0]] is not None:
+            value[parts[0]] = _mask_value(value[parts[0]], function)
+        return
+    _mask_path(value[parts[0]], parts[1:], function)
@@ -0,0 +1,105 @@
+"""
+Memory budget and RSS tracking for a pipeline run.
+
+A run with a memory budget reads its source in chunks bounded by BSON bytes
+rather than document counts, hands them to dlt through a bounded queue, and
+has dlt write extracted chunks to disk as they arrive instead of buffering
+thousands of rows. MemoryBudget splits the budget over the chunks that can
+be held at once.
+
+MemoryMonitor samples the process RSS on a background thread during a run,
+so the peak can be reported on the execution.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from .partitions import PREFETCH_CHUNKS
+
+logger = logging.getLogger(__name__)
+
+# never read in chunks smaller than this, whatever the budget
+MIN_CHUNK_BYTES = 1024 * 1024
+SAMPLE_SECONDS = 0.25
+
+
+@dataclass(frozen=True)
+class MemoryBudget:
+    """How a run's memory budget bounds its chunks"""
+
+    budget_bytes: int
+    readers: int = 1
+
+    @property
+    def chunks_in_memory(self) -> int:
+        # queued chunks, one being read per reader, and one with dlt
+        return self.readers * (PREFETCH_CHUNKS + 1) + 1
+
+    @property
+    def chunk_bytes(self) -> int:
+        # half the budget for chunks; the rest is left to decoded documents,
+        # dlt and the destination
+        return max(MIN_CHUNK_BYTES, self.budget_bytes // 2 // self.chunks_in_memory)
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None where it can't be read"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryMonitor:
+    """Samples the RSS between start() and stop(), keeping the peak"""
+
+    def __init__(self, interval: float = SAMPLE_SECONDS) -> None:
+        self.interval = interval
+        self.start_rss: Optional[int] = None
+        self.peak_rss: Optional[int] = None
+        self.end_rss: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "MemoryMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self.start_rss = self.peak_rss = current_rss()
+        if self.start_rss is None:
+            logger.info("Process RSS isn't available here; memory won't be reported")
+            return
+        self._thread = threading.Thread(target=self._sample, name="memory-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.end_rss = self._record()
+
+    @property
+    def growth(self) -> Optional[int]:
+        """How far the peak rose above the RSS at the start"""
+        if self.peak_rss is None or self.start_rss is None:
+            return None
+        return self.peak_rss - self.start_rss
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._record()
+
+    def _record(self) -> Optional[int]:
+        rss = current_rss()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+        return rss
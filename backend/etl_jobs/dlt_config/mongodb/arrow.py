@@ -0,0 +1,168 @@
+"""
+Arrow extraction with PyMongoArrow.
+
+Raw BSON batches from `find_raw_batches` / `aggregate_raw_batches` are
+decoded by PyMongoArrow straight into `pyarrow.Table`s, skipping Python
+dicts. The tables are handed to dlt as arrow items, so normalization is
+columnar.
+
+Column types come from a declared schema ({"field": "type name"}, see
+ARROW_TYPE_NAMES), or are inferred per batch. InferredColumns keeps the
+inferred types consistent across the batches of a load, as dlt requires;
+declare the schema when a field's BSON type varies.
+
+BSON-specific extension types are turned into types dlt understands:
+ObjectId and Decimal128 become strings, UUIDs become their string form,
+other binary values plain binary, and BSON datetimes UTC timestamps.
+"""
+
+from datetime import timezone
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from bson.codec_options import CodecOptions
+from bson.decimal128 import Decimal128
+
+# type names a declared schema can use
+ARROW_TYPE_NAMES = (
+    "string",
+    "int32",
+    "int64",
+    "double",
+    "bool",
+    "timestamp",
+    "date",
+    "objectid",
+    "decimal128",
+    "binary",
+    "uuid",
+)
+
+
+def build_schema(declared: Dict[str, str]) -> Any:
+    """A PyMongoArrow Schema from {"field": "type name"}"""
+    import pyarrow as pa
+    from pymongoarrow.schema import Schema
+    from pymongoarrow.types import BinaryType, Decimal128Type, ObjectIdType
+
+    types = {
+        "string": pa.string,
+        "int32": pa.int32,
+        "int64": pa.int64,
+        "double": pa.float64,
+        "bool": pa.bool_,
+        "timestamp": lambda: pa.timestamp("ms", tz="UTC"),
+        "date": pa.date32,
+        "objectid": ObjectIdType,
+        "decimal128": Decimal128Type,
+        "binary": lambda: BinaryType(0),
+        "uuid": lambda: BinaryType(4),
+    }
+    unknown = {field: name for field, name in declared.items() if name not in types}
+    if unknown:
+        raise ValueError(f"Unknown Arrow types {unknown}. Supported: {list(ARROW_TYPE_NAMES)}")
+    return Schema({field: types[name]() for field, name in declared.items()})
+
+
+def decode_batches(raw_batches: Iterable[bytes], schema: Optional[Any] = None) -> Any:
+    """Decode raw BSON batches into one Arrow table"""
+    from pymongoarrow.context import PyMongoArrowContext
+
+    # BSON datetimes are UTC; inferred timestamps carry the zone
+    context = PyMongoArrowContext(schema, codec_options=CodecOptions(tz_aware=True, tzinfo=timezone.utc))
+    for batch in raw_batches:
+        context.process_bson_stream(batch)
+    return context.finish()
+
+
+def to_dlt_table(table: Any) -> Any:
+    """Replace the BSON extension types of a table's columns with types dlt understands"""
+    import pyarrow as pa
+
+    columns = [_to_dlt_array(column.combine_chunks()) for column in table.columns]
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+class InferredColumns:
+    """The column types of a load's tables, as first seen with values"""
+
+    def __init__(self) -> None:
+        self.types: Dict[str, Any] = {}
+
+    def align(self, table: Any) -> Any:
+        """
+        Give the columns of a table the types seen in earlier tables. Columns
+        without values take the earlier type, or are left out until values
+        show up; other columns are cast, or raise ValueError.
+        """
+        import pyarrow as pa
+
+        columns, names = [], []
+        for name, column in zip(table.column_names, table.columns):
+            known = self.types.get(name)
+            if column.null_count == len(column):
+                if known is None:
+                    continue
+                column = pa.nulls(len(column), known)
+            elif known is None:
+                self.types[name] = column.type
+            elif column.type != known:
+                try:
+                    column = column.cast(known)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    raise ValueError(
+                        f"Field '{name}' changed type from {known} to {column.type}; "
+                        "declare its type in the Arrow schema"
+                    )
+            columns.append(column)
+            names.append(name)
+        if len(names) == table.num_columns and all(c is o for c, o in zip(columns, table.columns)):
+            return table
+        return pa.Table.from_arrays(columns, names=names)
+
+
+def _to_dlt_array(array: Any) -> Any:
+    import pyarrow as pa
+    from pymongoarrow.types import BinaryType, CodeType, Decimal128Type, ObjectIdType
+
+    array_type = array.type
+    if isinstance(array_type, ObjectIdType):
+        return _object_id_strings(array)
+    if isinstance(array_type, Decimal128Type):
+        values = array.storage.to_pylist()
+        return pa.array([None if v is None else str(Decimal128.from_bid(v)) for v in values], pa.string())
+    if isinstance(array_type, BinaryType):
+        if array_type.subtype in (3, 4):
+            values = array.storage.to_pylist()
+            return pa.array([None if v is None else str(UUID(bytes=v)) for v in values], pa.string())
+        return array.storage
+    if isinstance(array_type, CodeType):
+        return array.storage
+    if pa.types.is_timestamp(array_type) and array_type.tz is None:
+        return array.cast(pa.timestamp(array_type.unit, tz="UTC"))
+    if pa.types.is_struct(array_type):
+        children = [_to_dlt_array(array.field(index)) for index in range(array_type.num_fields)]
+        names = [array_type.field(index).name for index in range(array_type.num_fields)]
+        return pa.StructArray.from_arrays(children, names=names, mask=array.is_null() if array.null_count else None)
+    if pa.types.is_list(array_type):
+        values = _to_dlt_array(array.values)
+        if values.type == array_type.value_type:
+            return array
+        return pa.ListArray.from_arrays(array.offsets, values, mask=array.is_null() if array.null_count else None)
+    return array
+
+
+def _object_id_strings(array: Any) -> Any:
+    """ObjectIds (12 fixed-size bytes) as 24 character hex strings, without a Python loop per value"""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    storage = array.storage
+    data = storage.buffers()[1].to_pybytes()[storage.offset * 12 : (storage.offset + len(storage)) * 12]
+    hex_values = np.frombuffer(data.hex().encode("ascii"), dtype="S24")
+    strings = pa.array(hex_values, pa.binary(24)).cast(pa.string())
+    if storage.null_count:
+        strings = pc.if_else(storage.is_null(), pa.scalar(None, pa.string()), strings)
+    return strings
+
@@ -0,0 +1,128 @@
+"""
+asyncio reads of a collection's key ranges with PyMongo's async API.
+
+Over a high-latency link every getMore leaves a synchronous reader idle for
+a round trip. Here the cursor of every range runs as a task on one event
+loop (on a background thread), so the getMores of all ranges are in flight
+together, and each cursor fetches its next batch while its earlier chunks
+wait in a bounded queue for dlt. A server cursor answers one getMore at a
+time, so a read with a single range only gains the read-ahead.
+
+The consumer sees the same stream as read_partitions: (index, chunk) as
+chunks arrive and (index, PARTITION_DONE) as ranges finish.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from pymongo import AsyncMongoClient
+
+from ..partitions import PARTITION_DONE, PREFETCH_CHUNKS
+from ..timing import NO_TIMINGS
+from .client import DEFAULT_CLIENT_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+# opens the cursor of one range on the run's AsyncMongoClient
+CursorOpener = Callable[[Any], Awaitable[Any]]
+
+
+def read_partitions_async(
+    connection_url: str,
+    openers: Dict[int, CursorOpener],
+    chunk_size: int,
+    timings: Optional[Any] = None,
+    **client_options: Any,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Read every range's cursor concurrently on an event loop, yielding
+    (index, chunk) and (index, PARTITION_DONE). A read's exception is
+    raised here. Closing the iterator cancels the reads and closes the
+    client, which is created for this read: async clients belong to the
+    loop they were created on.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="mongo-async-reader", daemon=True)
+    thread.start()
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_CHUNKS * len(openers))
+    options = {**DEFAULT_CLIENT_OPTIONS, **client_options}
+    reader = asyncio.run_coroutine_threadsafe(
+        _start(connection_url, options, openers, chunks, chunk_size, timings or NO_TIMINGS), loop
+    ).result()
+    try:
+        remaining = len(openers)
+        while remaining:
+            index, item = asyncio.run_coroutine_threadsafe(chunks.get(), loop).result()
+            if item is PARTITION_DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            yield index, item
+    finally:
+        asyncio.run_coroutine_threadsafe(_stop(reader), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def _start(*args: Any) -> "asyncio.Task":
+    return asyncio.create_task(_read_all(*args))
+
+
+async def _stop(reader: "asyncio.Task") -> None:
+    reader.cancel()
+    await asyncio.gather(reader, return_exceptions=True)
+
+
+async def _read_all(
+    connection_url: str,
+    options: Dict[str, Any],
+    openers: Dict[int, CursorOpener],
+    chunks: asyncio.Queue,
+    chunk_size: int,
+    timings: Any,
+) -> None:
+    try:
+        client = AsyncMongoClient(connection_url, **options)
+    except Exception as e:
+        await chunks.put((None, e))
+        return
+    try:
+        await asyncio.gather(
+            *(
+                _read_range(index, open_cursor, client, chunks, chunk_size, timings)
+                for index, open_cursor in openers.items()
+            )
+        )
+    finally:
+        await client.close()
+
+
+async def _read_range(
+    index: int,
+    open_cursor: CursorOpener,
+    client: Any,
+    chunks: asyncio.Queue,
+    chunk_size: int,
+    timings: Any,
+) -> None:
+    try:
+        cursor = await open_cursor(client)
+        try:
+            while True:
+                with timings.measure("mongo_read"):
+                    docs = await cursor.to_list(chunk_size)
+                if not docs:
+                    break
+                # waits while the queue is full; the cursor stays open meanwhile
+                await chunks.put((index, docs))
+        finally:
+            await cursor.close()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await chunks.put((index, e))
+        return
+    await chunks.put((index, PARTITION_DONE))
@@ -0,0 +1,133 @@
+"""
+Checkpoints for full loads split over several task runs.
+
+A checkpointed full load reads each partition of the source collection in
+_id order and stops after `segment_size` documents. The last _id read from
+every partition is kept as the pending position; it is committed to
+`state["checkpoint"]` (and handed to `on_save`) only once the destination has
+written those documents, so the next run resumes after the last committed
+batch. Positions use `$gt` on _id, so a collection's _ids are expected to
+share one BSON type.
+
+While a segment runs the stored checkpoint is marked in progress. A run that
+finds that mark set replays documents the interrupted run may already have
+written, and the destination writes them idempotently (by _id).
+"""
+
+import copy
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from .source import and_filters
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    def __init__(
+        self,
+        state: Optional[Dict[str, Any]] = None,
+        segment_size: int = 0,
+        on_save: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        self.state = state if state is not None else {}
+        self.segment_size = segment_size
+        self.on_save = on_save
+        saved = self.state.get("checkpoint") or {}
+        # [{"filter": range filter, "last_id": last _id loaded, "done": bool}]
+        self.partitions: Optional[List[Dict[str, Any]]] = copy.deepcopy(saved.get("partitions"))
+        self._committed = copy.deepcopy(self.partitions)
+        # staging collection of a replace load, kept until the last segment
+        self.staging: Optional[str] = saved.get("staging")
+        self.interrupted = bool(saved.get("in_progress"))
+        self.in_progress = False
+        self.read = 0
+
+    @property
+    def resumed(self) -> bool:
+        """A previous run of this load committed its positions"""
+        return self._committed is not None
+
+    @property
+    def complete(self) -> bool:
+        """Every partition has been read to the end"""
+        return self.partitions is not None and all(partition["done"] for partition in self.partitions)
+
+    @property
+    def exhausted(self) -> bool:
+        """This run's segment is full"""
+        return bool(self.segment_size) and self.read >= self.segment_size
+
+    def plan(self, range_filters: List[Dict[str, Any]]) -> None:
+        """Start a new load over the given partition ranges"""
+        self.partitions = [{"filter": f, "last_id": None, "done": False} for f in range_filters]
+
+    def pending(self) -> Dict[int, Dict[str, Any]]:
+        """Query filters of the unfinished partitions, resuming after their last _id"""
+        filters = {}
+        for index, partition in enumerate(self.partitions or []):
+            if partition["done"]:
+                continue
+            resume = {"_id": {"$gt": partition["last_id"]}} if partition["last_id"] is not None else {}
+            filters[index] = and_filters(partition["filter"], resume)
+        return filters
+
+    def take(self, docs: List[Any]) -> List[Any]:
+        """The documents that still fit into this run's segment"""
+        if not self.segment_size:
+            return docs
+        return docs[: max(0, self.segment_size - self.read)]
+
+    def advance(self, index: int, docs: List[Any]) -> None:
+        """Move a partition's pending position past documents read in _id order"""
+        if not docs:
+            return
+        self.partitions[index]["last_id"] = docs[-1]["_id"]
+        self.read += len(docs)
+
+    def mark_done(self, index: int) -> None:
+        self.partitions[index]["done"] = True
+
+    def begin(self) -> None:
+        """Mark the stored checkpoint in progress before a segment is loaded"""
+        self.in_progress = True
+        self._save()
+
+    def set_staging(self, name: str) -> None:
+        if name != self.staging:
+            self.staging = name
+            self._save()
+
+    def commit(self) -> None:
+        """Store the pending positions once the destination has written them"""
+        self._committed = copy.deepcopy(self.partitions)
+        self._save()
+
+    def finish(self) -> None:
+        """
+        Commit the segment of a successful run. The checkpoint is removed
+        once the load is complete. The caller persists the state.
+        """
+        self.in_progress = False
+        if self.complete:
+            self.state.pop("checkpoint", None)
+            logger.info("Checkpointed load complete")
+            return
+        self._committed = copy.deepcopy(self.partitions)
+        self.state["checkpoint"] = self._as_dict()
+
+    def reset(self) -> None:
+        """Forget the load, so the next run starts over"""
+        self.partitions = self._committed = None
+        self.staging = None
+        self.state.pop("checkpoint", None)
+        if self.on_save:
+            self.on_save(self.state)
+
+    def _save(self) -> None:
+        self.state["checkpoint"] = self._as_dict()
+        if self.on_save:
+            self.on_save(self.state)
+
+    def _as_dict(self) -> Dict[str, Any]:
+        return {"partitions": self._committed, "staging": self.staging, "in_progress": self.in_progress}
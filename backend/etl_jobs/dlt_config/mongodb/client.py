@@ -0,0 +1,105 @@
+"""
+Process-wide registry of pooled MongoClient instances.
+
+A MongoClient owns a connection pool and background monitoring threads, so it
+is meant to be created once and shared. Clients are keyed by connection URL and
+options and reused across batches and across pipeline runs in the same worker
+process.
+"""
+
+import logging
+import os
+import threading
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Dict, Tuple
+
+from bson.codec_options import TypeRegistry
+from bson.decimal128 import Decimal128, create_decimal128_context
+from pymongo import MongoClient
+
+logger = logging.getLogger(__name__)
+
+
+
+def _encode_fallback(value: Any) -> Any:
+    """Encode values BSON has no type for, as handed over by non-Mongo sources"""
+    if isinstance(value, Decimal):
+        # rounds to the 34 digits Decimal128 holds
+        return Decimal128(create_decimal128_context().create_decimal(value))
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if isinstance(value, time):
+        return value.isoformat()
+    return value
+
+
+DEFAULT_CLIENT_OPTIONS = {
+    "uuidRepresentation": "standard",
+    "tz_aware": True,
+    # PostgreSQL numeric / date / time columns
+    "type_registry": TypeRegistry(fallback_encoder=_encode_fallback),
+}
+
+_clients: Dict[Tuple, MongoClient] = {}
+_stats = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+
+
+def _client_key(connection_url: str, options: Dict[str, Any]) -> Tuple:
+    return (connection_url, tuple(sorted((k, repr(v)) for k, v in options.items())))
+
+
+def get_client(connection_url: str, **options: Any) -> MongoClient:
+    """Return a shared MongoClient for the given URL and options, creating it on first use"""
+    options = {**DEFAULT_CLIENT_OPTIONS, **options}
+    key = _client_key(connection_url, options)
+
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            _stats["hits"] += 1
+            return client
+
+        _stats["misses"] += 1
+        client = MongoClient(connection_url, **options)
+        _clients[key] = client
+        logger.info(f"Created pooled MongoClient ({len(_clients)} open)")
+        return client
+
+
+def close_clients() -> None:
+    """Close every pooled client and reset the registry"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            logger.warning("Failed to close pooled MongoClient", exc_info=True)
+
+    if clients:
+        logger.info(f"Closed {len(clients)} pooled MongoClient(s). Pool stats: {pool_stats()}")
+
+
+def pool_stats() -> Dict[str, int]:
+    """Return registry hit/miss counters and the number of open clients"""
+    with _lock:
+        return {**_stats, "open_clients": len(_clients)}
+
+
+def _reset_after_fork() -> None:
+    # MongoClient is not fork-safe: a forked child (e.g. a prefork Celery worker)
+    # must not reuse the parent's sockets, so drop the inherited references
+    # without closing them.
+    global _lock
+    _lock = threading.Lock()
+    _clients.clear()
+    _stats["hits"] = 0
+    _stats["misses"] = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,11 +1,25 @@
-from typing import Optional
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 import dlt
-from pymongo import MongoClient
+
+from ..timing import NO_TIMINGS
+from .client import get_client
+from .staging import StagingCollection
+from .writer import APPEND, DEFAULT_BATCH_SIZE, DEFAULT_MAX_RETRIES, MERGE, REPLACE, BulkWriter, WriteResult
+
+logger = logging.getLogger(__name__)
+
+# One writer (and thread pool) per target collection for the duration of a run
+_writers: Dict[Tuple, BulkWriter] = {}
+# Staging collections of "replace" writers, by the same key
+_stagings: Dict[Tuple, StagingCollection] = {}
+_writers_lock = threading.Lock()
 
 
 @dlt.destination(
     name="mongo_destination",
-    batch_size=1_000,  # items is a list[dict]
+    batch_size=DEFAULT_BATCH_SIZE,  # items is a list[dict]; overridden per pipeline
     loader_file_format="typed-jsonl",  # dlt writes JSONL, we get Python dicts here
     max_table_nesting=0,
     skip_dlt_columns_and_tables=True,
@@ -16,6 +30,14 @@ def mongo_sink(
     connection_url: str = dlt.secrets.value,
     database: str = dlt.config.value,
     collection: Optional[str] = None,
+    write_batch_size: int = DEFAULT_BATCH_SIZE,
+    max_in_flight: int = 1,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    write_result: Optional[Any] = None,
+    timings: Optional[Any] = None,
+    write_disposition: str = APPEND,
+    primary_key: Optional[List[str]] = None,
+    checkpoint: Optional[Any] = None,
 ) -> None:
     """
     Custom Mongo destination.
@@ -24,15 +46,181 @@ def mongo_sink(
       - connection_url
       - database
       - collection (fallback: table["name"])
+      - write_batch_size: documents per unordered bulk insert
+      - max_in_flight: bulk inserts kept in flight at once
+      - max_retries: retries for failed documents of a bulk insert
+      - write_result: WriteResult collecting counters for the run
+      - timings: StageTimings receiving the time spent writing
+      - write_disposition: "append" (insert), "merge" (replace by primary key),
+        "upsert" ($set by primary key) or "replace" (load into a staging
+        collection that replaces the target when the run succeeds)
+      - primary_key: fields identifying a document for merge/upsert (default _id)
+      - checkpoint: Checkpoint of a full load split over several runs; its
+        replace loads keep one staging collection until the last run
+
+    Every document of the call is acknowledged when this returns, so dlt only
+    marks the load job complete once its writes are done; close_writers()
+    releases the writers (and swaps in replaced collections) at the end of
+    the run.
     """
+    if not isinstance(items, list):
+        # record batches of sources yielding Arrow tables
+        items = items.to_pylist()
     if not items:
         return
 
-    client = MongoClient(connection_url, uuidRepresentation="standard", tz_aware=True)
-    db = client[database]
-
     coll_name = collection or table["name"]
-    coll = db[coll_name]
+    writer = _get_writer(
+        connection_url,
+        database,
+        coll_name,
+        write_batch_size=write_batch_size,
+        max_in_flight=max_in_flight,
+        max_retries=max_retries,
+        write_result=write_result,
+        write_disposition=write_disposition,
+        primary_key=primary_key or ["_id"],
+        checkpoint=checkpoint,
+    )
+    with (timings or NO_TIMINGS).measure("mongo_write"):
+        writer.write(items)
+
+
+def _get_writer(
+    connection_url: str,
+    database: str,
+    coll_name: str,
+    write_batch_size: int,
+    max_in_flight: int,
+    max_retries: int,
+    write_result: Optional[WriteResult],
+    write_disposition: str = APPEND,
+    primary_key: Optional[List[str]] = None,
+    checkpoint: Optional[Any] = None,
+) -> BulkWriter:
+    key = (connection_url, database, coll_name, id(write_result))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            coll, staging, write_disposition, primary_key = open_target(
+                get_client(connection_url)[database][coll_name], write_disposition, primary_key, checkpoint
+            )
+            if staging is not None:
+                _stagings[key] = staging
+            writer = BulkWriter(
+                coll,
+                batch_size=write_batch_size,
+                max_in_flight=max_in_flight,
+                max_retries=max_retries,
+                result=write_result,
+                write_disposition=write_disposition,
+                primary_key=primary_key or ["_id"],
+            )
+            _writers[key] = writer
+        return writer
+
 
-    # items is a list of dicts
-    coll.insert_many(list(items))
+def open_target(
+    collection: Any,
+    write_disposition: str,
+    primary_key: Optional[List[str]] = None,
+    checkpoint: Optional[Any] = None,
+) -> Tuple[Any, Optional[StagingCollection], str, Optional[List[str]]]:
+    """
+    The collection, staging collection, disposition and key a run writes with.
+
+    Replace loads are appended to a staging collection. Documents replayed
+    after an interrupted checkpointed run are merged by _id instead of
+    appended, so they aren't written twice.
+    """
+    staging = None
+    if write_disposition == REPLACE:
+        staging = StagingCollection(collection, name=checkpoint.staging if checkpoint is not None else None)
+        if checkpoint is not None:
+            checkpoint.set_staging(staging.collection.name)
+        collection, write_disposition = staging.collection, APPEND
+    if write_disposition == APPEND and checkpoint is not None and checkpoint.interrupted:
+        write_disposition, primary_key = MERGE, ["_id"]
+    return collection, staging, write_disposition, primary_key
+
+
+def close_writers(
+    write_result: Optional[WriteResult] = None,
+    succeeded: bool = True,
+    checkpoint: Optional[Any] = None,
+) -> List[str]:
+    """
+    Release the thread pools of a run's writers, returning the names of the
+    collections they wrote to.
+
+    Staging collections of replace loads are swapped in if the run succeeded
+    and every document was written, and dropped otherwise (see finish_staging).
+    """
+    with _writers_lock:
+        keys = [key for key in _writers if key[3] == id(write_result)]
+        writers = [(_writers.pop(key), _stagings.pop(key, None)) for key in keys]
+
+    errors = []
+    for writer, staging in writers:
+        try:
+            writer.close()
+        except Exception as e:
+            errors.append(e)
+        if writer.result.failed or writer.result.ambiguous:
+            logger.warning(
+                f"Writes to {writer.collection.name}: {writer.result.failed} failed, "
+                f"{writer.result.ambiguous} ambiguous duplicates"
+            )
+        if staging is not None:
+            try:
+                finish_staging(staging, succeeded and not errors, writer.result, checkpoint)
+            except Exception as e:
+                errors.append(e)
+    if errors:
+        raise errors[0]
+    return [key[2] for key in keys]
+
+
+def finish_staging(
+    staging: StagingCollection,
+    succeeded: bool,
+    result: WriteResult,
+    checkpoint: Optional[Any] = None,
+) -> None:
+    """
+    Swap a complete replace load in, or drop it.
+
+    The staging collection of a checkpointed load is kept for the next run
+    until the load is complete, also when a run fails; the load starts over
+    if documents failed to load.
+    """
+    if checkpoint is not None and not result.failed and not (succeeded and checkpoint.complete):
+        logger.info(f"Keeping {staging.collection.full_name} for the next run of the checkpointed load")
+        return
+    if succeeded and not result.failed:
+        staging.swap()
+        if checkpoint is not None:
+            checkpoint.staging = None
+        return
+    staging.discard()
+    if checkpoint is not None:
+        checkpoint.reset()
+    if succeeded:
+        raise RuntimeError(
+            f"{result.failed} documents failed to load into {staging.target.full_name}; "
+            "kept the existing collection instead of replacing it with a partial load"
+        )
+
+
+def finish_unwritten_replace(collection: Any, succeeded: bool, checkpoint: Optional[Any] = None) -> None:
+    """
+    Finish a replace load whose run wrote nothing to `collection`.
+
+    The staging collection of a checkpointed load's earlier runs, or else an
+    empty one, replaces the target once the load is complete, so a source
+    that yields nothing empties the target instead of leaving it stale.
+    """
+    if not succeeded or (checkpoint is not None and not checkpoint.complete):
+        return
+    staging = StagingCollection(collection, name=checkpoint.staging if checkpoint is not None else None)
+    finish_staging(staging, succeeded, WriteResult(), checkpoint)
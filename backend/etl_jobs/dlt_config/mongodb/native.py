@@ -0,0 +1,137 @@
+"""
+Native MongoDB -> MongoDB copy.
+
+Moves documents from the source cursor straight into bulk inserts on the
+destination, without dlt's extract/normalize/load staging. Documents are read
+as RawBSONDocument and written back as the same BSON bytes, so values keep
+their BSON types (ObjectId, Decimal128, dates, ...) and are never converted to
+JSON. When masking is configured documents are decoded to dicts, masked and
+re-encoded by the driver.
+
+A checkpointed copy commits its checkpoint after every chunk the destination
+has acknowledged.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from bson.raw_bson import RawBSONDocument
+
+from ..timing import NO_TIMINGS
+from .client import get_client
+from .source import CollectionLoader, IncrementalCursor
+from .destination import finish_staging, open_target
+from .writer import APPEND, DEFAULT_BATCH_SIZE, BulkWriter, WriteResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NativeCopyInfo:
+    """Outcome of a native copy, standing in for dlt's LoadInfo"""
+
+    source: str
+    destination: str
+    documents: int
+    chunks: int
+    duration_seconds: float
+    write_result: WriteResult
+    # BSON bytes read; unknown when documents were decoded for masking
+    bytes_read: Optional[int] = None
+
+    def __str__(self) -> str:
+        return (
+            f"Native copy {self.source} -> {self.destination}: {self.documents} documents read "
+            f"in {self.chunks} chunks, {self.write_result.inserted} inserted, "
+            f"{self.write_result.failed} failed in {self.duration_seconds:.2f}s"
+        )
+
+
+def copy_collection(source_config: Dict[str, Any], destination_config: Dict[str, Any]) -> NativeCopyInfo:
+    """Copy a source collection into the destination collection as raw BSON"""
+    source_client = get_client(source_config["connection_url"])
+    source_db = (
+        source_client[source_config["database"]]
+        if source_config.get("database")
+        else source_client.get_default_database()
+    )
+    source = source_db[source_config["collection"]]
+
+    masker = source_config.get("masker")
+    if not masker:
+        # masking needs mutable documents; otherwise keep the BSON bytes as read
+        source = source.with_options(
+            codec_options=source.codec_options.with_options(document_class=RawBSONDocument)
+        )
+
+    incremental_key = source_config.get("incremental_key")
+    checkpoint = source_config.get("checkpoint")
+    loader = CollectionLoader(
+        source_client,
+        source,
+        query=source_config.get("query") or {},
+        aggregation_pipeline=source_config.get("aggregation_pipeline"),
+        incremental=IncrementalCursor(incremental_key, source_config.get("state")) if incremental_key else None,
+        partitions=source_config.get("partitions", 1),
+        partition_key=source_config.get("partition_key") or "_id",
+        projection=source_config.get("projection"),
+        masker=masker,
+        convert=False,
+        timings=source_config.get("timings"),
+        checkpoint=checkpoint,
+    )
+
+    destination_client = get_client(destination_config["connection_url"])
+    destination = destination_client[destination_config["database"]][
+        destination_config.get("collection") or source.name
+    ]
+    write_result = destination_config.get("write_result")
+    target, staging, write_disposition, primary_key = open_target(
+        destination,
+        destination_config.get("write_disposition") or APPEND,
+        destination_config.get("primary_key"),
+        checkpoint,
+    )
+    writer = BulkWriter(
+        target,
+        batch_size=destination_config.get("batch_size") or DEFAULT_BATCH_SIZE,
+        max_in_flight=destination_config.get("write_concurrency") or 1,
+        result=write_result if write_result is not None else WriteResult(),
+        write_disposition=write_disposition,
+        primary_key=primary_key or ["_id"],
+    )
+
+    timings = destination_config.get("timings") or NO_TIMINGS
+    logger.info(f"Native copy {source.full_name} -> {destination.full_name}")
+    started = time.monotonic()
+    documents = chunks = bytes_read = 0
+    succeeded = False
+    try:
+        for docs in loader.load_documents():
+            with timings.measure("mongo_write"):
+                writer.write(docs)
+            if checkpoint is not None:
+                checkpoint.commit()
+            documents += len(docs)
+            chunks += 1
+            if not masker:
+                bytes_read += sum(len(doc.raw) for doc in docs)
+        succeeded = True
+    finally:
+        with timings.measure("finalize_destination"):
+            writer.close()
+            if staging is not None:
+                # with nothing read, the empty staging collection replaces the target
+                finish_staging(staging, succeeded, writer.result, checkpoint)
+
+    return NativeCopyInfo(
+        source=source.full_name,
+        destination=destination.full_name,
+        documents=documents,
+        chunks=chunks,
+        duration_seconds=time.monotonic() - started,
+        write_result=writer.result,
+        bytes_read=None if masker else bytes_read,
+    )
@@ -0,0 +1,60 @@
+"""
+Helpers for MongoDB projections (inclusion or exclusion documents).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def is_inclusion(projection: Dict[str, Any]) -> bool:
+    """Whether a projection lists the fields to keep (as opposed to the ones to drop)"""
+    return any(_keeps(value) for field, value in projection.items() if field != "_id")
+
+
+def projection_drops_field(projection: Optional[Dict[str, Any]], path: str) -> bool:
+    """Whether a dotted field path is removed entirely by the projection"""
+    if not projection:
+        return False
+
+    parts = path.split(".")
+    prefixes = [".".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+    if parts[0] == "_id" and "_id" not in projection:
+        return False
+
+    if is_inclusion(projection):
+        if any(prefix in projection and _keeps(projection[prefix]) for prefix in prefixes):
+            return False
+        # keeping part of a sub-document still keeps the field around
+        return not any(
+            field.startswith(path + ".") and _keeps(value) for field, value in projection.items()
+        )
+
+    return any(prefix in projection and not _keeps(projection[prefix]) for prefix in prefixes)
+
+
+def dropped_fields(projection: Optional[Dict[str, Any]], paths: Iterable[str]) -> List[str]:
+    """The subset of paths that the projection removes"""
+    return [path for path in paths if projection_drops_field(projection, path)]
+
+
+def ensure_projected(projection: Optional[Dict[str, Any]], paths: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Return a copy of the projection that keeps every given path"""
+    if not projection:
+        return projection
+
+    projection = dict(projection)
+    for path in paths:
+        if not projection_drops_field(projection, path):
+            continue
+        if is_inclusion(projection):
+            projection[path] = 1
+        else:
+            parts = path.split(".")
+            for i in range(1, len(parts) + 1):
+                projection.pop(".".join(parts[:i]), None)
+    return projection
+
+
+def _keeps(value: Any) -> bool:
+    # 0/False exclude a field; 1/True and expressions ($slice, ...) keep it
+    return value not in (0, False)
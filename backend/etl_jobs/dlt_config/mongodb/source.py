@@ -1,16 +1,51 @@
+import logging
+import re
+from contextlib import closing
+from fnmatch import fnmatchcase
+from functools import partial
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
 from itertools import islice
-from typing import Any, Dict, Iterator, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from bson import decode_all, json_util
+from bson.json_util import JSONOptions
+from bson.binary import OLD_UUID_SUBTYPE, UUID_SUBTYPE, Binary, UuidRepresentation
 from bson.decimal128 import Decimal128
+from bson.int64 import Int64
 from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+from bson.regex import Regex
+from bson.timestamp import Timestamp
 
 import dlt
-from pymongo import MongoClient
+from pymongo import ASCENDING
 from dlt.common.time import ensure_pendulum_datetime_utc
 from dlt.common.typing import TDataItem
 from dlt.common.utils import map_nested_values_in_place
 
+from .client import get_client
+from ..memory import MemoryBudget
+from ..partitions import PARTITION_DONE, read_partitions
+from ..timing import NO_TIMINGS
+from .projection import ensure_projected
+
+logger = logging.getLogger(__name__)
+
+# keys of loaded _ids; UUIDs keep their value instead of failing to encode
+ID_KEY_JSON_OPTIONS = JSONOptions(uuid_representation=UuidRepresentation.STANDARD)
+
 CHUNK_SIZE = 10_000
 
+# BSON type aliases for $type, by Python type of a partition boundary
+PARTITION_KEY_TYPES = (
+    (bool, "bool"),
+    ((int, float, Decimal128), "number"),
+    (str, "string"),
+    (ObjectId, "objectId"),
+    (datetime, "date"),
+)
+
 
 @dlt.source(max_table_nesting=0)  # no nested subtables unless you want them
 def mongodb_collection(
@@ -20,34 +55,269 @@ def mongodb_collection(
     query: Optional[Dict[str, Any]] = None,
     aggregation_pipeline: Optional[list] = None,
     write_disposition: Optional[str] = dlt.config.value,
+    incremental_key: Optional[str] = None,
+    state: Optional[Dict[str, Any]] = None,
+    partitions: int = 1,
+    partition_key: str = "_id",
+    projection: Optional[Dict[str, Any]] = None,
+    masker: Optional[Any] = None,
+    timings: Optional[Any] = None,
+    checkpoint: Optional[Any] = None,
+    arrow: bool = False,
+    arrow_schema: Optional[Dict[str, str]] = None,
+    memory_budget: int = 0,
+    async_reads: bool = False,
 ) -> Any:
-    client: Any = MongoClient(
-        connection_url, uuidRepresentation="standard", tz_aware=True
-    )
+    client: Any = get_client(connection_url)
 
     mongo_database = client.get_default_database() if not database else client[database]
     collection_obj = mongo_database[collection]
 
+    incremental = IncrementalCursor(incremental_key, state) if incremental_key else None
+
+    return _collection_resource(
+        client,
+        collection_obj,
+        name=collection_obj.name,  # table/collection name
+        write_disposition=write_disposition,
+        query=query,
+        aggregation_pipeline=aggregation_pipeline,
+        incremental=incremental,
+        partitions=partitions,
+        partition_key=partition_key,
+        projection=projection,
+        masker=masker,
+        timings=timings,
+        checkpoint=checkpoint,
+        arrow=arrow,
+        arrow_schema=arrow_schema,
+        memory_budget=memory_budget,
+        async_connection_url=connection_url if async_reads else None,
+    )
+
+
+@dlt.source(max_table_nesting=0)
+def mongodb_collections(
+    connection_url: str = dlt.secrets.value,
+    database: Optional[str] = dlt.config.value,
+    collections: List[str] = dlt.config.value,
+    table_name_template: str = "*",
+    query: Optional[Dict[str, Any]] = None,
+    aggregation_pipeline: Optional[list] = None,
+    write_disposition: Optional[str] = dlt.config.value,
+    incremental_key: Optional[str] = None,
+    state: Optional[Dict[str, Any]] = None,
+    partitions: int = 1,
+    partition_key: str = "_id",
+    projection: Optional[Dict[str, Any]] = None,
+    masker: Optional[Any] = None,
+    timings: Optional[Any] = None,
+    arrow: bool = False,
+    arrow_schema: Optional[Dict[str, str]] = None,
+    memory_budget: int = 0,
+    workers: int = 1,
+    async_reads: bool = False,
+) -> List[Any]:
+    """
+    One resource per collection named in `collections` (names or glob
+    patterns), loaded into table_name_template with "*" replaced by the
+    collection name. The resources share the client and are extracted side
+    by side on dlt's `workers` threads, so a memory budget is split between
+    them. Incremental state is kept per collection in state["collections"].
+    """
+    client: Any = get_client(connection_url)
+    mongo_database = client.get_default_database() if not database else client[database]
+    names = match_collections(mongo_database.list_collection_names(), collections)
+    if not names:
+        raise ValueError(f"No collections of {mongo_database.name} match {collections}")
+    logger.info(f"Loading {len(names)} collections of {mongo_database.name}: {names}")
+
+    collection_states = state.setdefault("collections", {}) if state is not None else {}
+    readers = max(1, min(workers, len(names)))
+    return [
+        _collection_resource(
+            client,
+            mongo_database[name],
+            name=table_name_template.replace("*", name),
+            write_disposition=write_disposition,
+            query=query,
+            aggregation_pipeline=aggregation_pipeline,
+            incremental=IncrementalCursor(incremental_key, collection_states.setdefault(name, {}))
+            if incremental_key
+            else None,
+            parallelized=True,
+            partitions=partitions,
+            partition_key=partition_key,
+            projection=projection,
+            masker=masker,
+            timings=timings,
+            arrow=arrow,
+            arrow_schema=arrow_schema,
+            memory_budget=memory_budget // readers,
+            async_connection_url=connection_url if async_reads else None,
+        )
+        for name in names
+    ]
+
+
+def match_collections(available: List[str], patterns: List[str]) -> List[str]:
+    """Collections matching any of the names or glob patterns, in pattern order (system collections excluded)"""
+    matched: List[str] = []
+    for pattern in patterns:
+        for name in sorted(available):
+            if not name.startswith("system.") and fnmatchcase(name, pattern) and name not in matched:
+                matched.append(name)
+    return matched
+
+
+def _collection_resource(
+    client: Any,
+    collection_obj: Any,
+    name: str,
+    write_disposition: Optional[str],
+    query: Optional[Dict[str, Any]],
+    aggregation_pipeline: Optional[list],
+    incremental: Optional["IncrementalCursor"],
+    parallelized: bool = False,
+    **loader_options: Any,
+) -> Any:
     def collection_documents(
         client: Any,
         collection: Any,
         query: Optional[Dict[str, Any]] = None,
         aggregation_pipeline: Optional[list] = None,
+        incremental: Optional["IncrementalCursor"] = None,
     ) -> Iterator[TDataItem]:
         loader = CollectionLoader(
             client,
             collection,
             query=query or {},
             aggregation_pipeline=aggregation_pipeline,
+            incremental=incremental,
+            **loader_options,
         )
         yield from loader.load_documents()
 
-    return dlt.resource(  # type: ignore
+    resource = dlt.resource(  # type: ignore
         collection_documents,
-        name=collection_obj.name,  # table/collection name
+        name=name,
         primary_key="_id",
         write_disposition=write_disposition,
-    )(client, collection_obj, query=query, aggregation_pipeline=aggregation_pipeline)
+    )(
+        client,
+        collection_obj,
+        query=query,
+        aggregation_pipeline=aggregation_pipeline,
+        incremental=incremental,
+    )
+    # parallelized once bound: dlt drops parallelized=True on binding keyword arguments
+    return resource.parallelize() if parallelized else resource
+
+
+class IncrementalCursor:
+    """
+    High-water mark of `key` for incremental loads.
+
+    Documents are selected with `$gte` on the last value seen, so documents
+    written later with exactly that value are not lost. The `_id`s (or
+    `id_key` values) of the documents already loaded at that value are kept
+    alongside it, and those documents are dropped again on the next run.
+
+    The state is written back into `state["incremental"]`, which the caller
+    persists once the load has succeeded. A stored value is only reused while
+    the incremental key stays the same.
+    """
+
+    def __init__(self, key: str, state: Optional[Dict[str, Any]] = None, id_key: str = "_id") -> None:
+        self.key = key
+        self.id_key = id_key
+        self.state = state if state is not None else {}
+        saved = self.state.get("incremental") or {}
+        if saved.get("key") != key:
+            saved = {}
+        self.start_value = saved.get("last_value")
+        self.start_ids = {_id_key(_id) for _id in saved.get("last_ids", [])}
+        self.last_value = self.start_value
+        self.last_ids: List[Any] = list(saved.get("last_ids", []))
+        self._start_sort_key = bson_sort_key(self.start_value)
+        self._last_sort_key = self._start_sort_key
+        self._warned_unorderable = False
+
+    def filter(self) -> Dict[str, Any]:
+        if self.start_value is None:
+            return {}
+        return {self.key: {"$gte": self.start_value}}
+
+    def sort(self) -> List[Any]:
+        return [(self.key, ASCENDING)]
+
+    def drop_loaded(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop documents at the start value that the previous run already loaded"""
+        if not self.start_ids:
+            return docs
+        return [
+            doc
+            for doc in docs
+            if not (
+                self.id_key in doc
+                and _id_key(doc[self.id_key]) in self.start_ids
+                and bson_sort_key(get_path(doc, self.key)) == self._start_sort_key
+            )
+        ]
+
+    def update(self, docs: List[Dict[str, Any]]) -> int:
+        """Advance the high-water mark; return how many documents carried an orderable key"""
+        tracked = 0
+        changed = False
+        for doc in docs:
+            value = get_path(doc, self.key)
+            if value is None:
+                continue
+            sort_key = bson_sort_key(value)
+            if sort_key is None:
+                if not self._warned_unorderable:
+                    logger.warning(
+                        f"Ignoring unorderable {type(value).__name__} value of incremental key '{self.key}'"
+                    )
+                    self._warned_unorderable = True
+                continue
+
+            tracked += 1
+            if self._last_sort_key is None or sort_key > self._last_sort_key:
+                self.last_value = value
+                self.last_ids = [doc[self.id_key]] if self.id_key in doc else []
+                self._last_sort_key = sort_key
+                changed = True
+            elif sort_key == self._last_sort_key and self.id_key in doc:
+                self.last_ids.append(doc[self.id_key])
+                changed = True
+
+        if changed:
+            self.state["incremental"] = {
+                "key": self.key,
+                "last_value": self.last_value,
+                "last_ids": self.last_ids,
+            }
+        return tracked
+
+
+# Read options of CollectionLoader that each take over how cursors are read
+# or decoded, so they can't be used together
+EXCLUSIVE_READ_OPTIONS = (
+    ("checkpoint", "aggregation_pipeline", "checkpointed loads resume find() queries by _id"),
+    ("arrow", "checkpoint", "Arrow tables aren't split at checkpoint positions"),
+    ("arrow", "masking", "masking rules apply to decoded documents"),
+    ("arrow", "memory_budget", "Arrow tables are decoded per cursor batch, not sized to a budget"),
+    ("async_reads", "arrow", "async reads decode documents"),
+    ("async_reads", "memory_budget", "async reads decode documents instead of sizing raw chunks"),
+)
+
+
+def check_read_options(**enabled: bool) -> None:
+    """Raise ValueError for read options (see EXCLUSIVE_READ_OPTIONS) that can't be combined"""
+    for first, second, reason in EXCLUSIVE_READ_OPTIONS:
+        if enabled.get(first) and enabled.get(second):
+            raise ValueError(f"{first} can't be combined with {second}: {reason}")
 
 
 class CollectionLoader:
@@ -57,39 +327,513 @@ class CollectionLoader:
         collection: Any,
         query: Dict[str, Any],
         aggregation_pipeline: Optional[list] = None,
+        incremental: Optional[IncrementalCursor] = None,
+        partitions: int = 1,
+        partition_key: str = "_id",
+        projection: Optional[Dict[str, Any]] = None,
+        masker: Optional[Any] = None,
+        convert: bool = True,
+        timings: Optional[Any] = None,
+        checkpoint: Optional[Any] = None,
+        arrow: bool = False,
+        arrow_schema: Optional[Dict[str, str]] = None,
+        memory_budget: int = 0,
+        async_connection_url: Optional[str] = None,
     ) -> None:
+        check_read_options(
+            checkpoint=checkpoint is not None,
+            aggregation_pipeline=bool(aggregation_pipeline),
+            arrow=arrow or bool(arrow_schema),
+            masking=bool(masker),
+            memory_budget=bool(memory_budget),
+            async_reads=bool(async_connection_url),
+        )
         self.client = client
         self.collection = collection
         self.query = query
         self.aggregation_pipeline = aggregation_pipeline
+        self.incremental = incremental
+        self.partitions = max(1, partitions)
+        self.partition_key = partition_key
+        self.masker = masker
+        self.convert = convert
+        self.timings = timings or NO_TIMINGS
+        self.checkpoint = checkpoint
+        self.arrow = arrow or bool(arrow_schema)
+        self.arrow_schema = None
+        self.arrow_columns = None
+        if arrow_schema:
+            from .arrow import build_schema
+
+            self.arrow_schema = build_schema(arrow_schema)
+            if incremental and incremental.key.split(".")[0] not in arrow_schema:
+                raise ValueError(f"Incremental key '{incremental.key}' is missing from the Arrow schema")
+            if not projection:
+                # read only the declared fields
+                projection = {field: 1 for field in arrow_schema}
+        elif self.arrow:
+            from .arrow import InferredColumns
+
+            self.arrow_columns = InferredColumns()
+        self.partition_counts: Dict[int, int] = {}
+        # With a memory budget (bytes) chunks are bounded by their BSON size,
+        # and a single cursor is read ahead on a thread through a bounded queue
+        self.memory_budget = memory_budget
+        self.chunk_bytes = MemoryBudget(memory_budget, readers=self.partitions).chunk_bytes if memory_budget else 0
+        # With a connection URL, cursors are read by the asyncio reader on a
+        # client of their own, every range's getMores in flight at once
+        self.async_connection_url = async_connection_url
+        # The incremental key (and _id for checkpoints) has to survive the projection
+        tracked_keys = [incremental.key] if incremental else []
+        if checkpoint is not None:
+            tracked_keys.append("_id")
+        self.projection = ensure_projected(projection, tracked_keys)
 
     def load_documents(self) -> Iterator[TDataItem]:
+        if self.incremental:
+            self._warn_if_unindexed(self.incremental.key)
+
+        if self.checkpoint is not None:
+            yield from self._load_checkpointed()
+        elif self.partitions > 1:
+            yield from self._load_partitioned()
+        else:
+            yield from self._load_single()
+
+    def _load_single(self) -> Iterator[TDataItem]:
+        for docs_slice in self._read_single():
+            docs_slice = self._prepare(docs_slice)
+            if docs_slice:
+                yield docs_slice
+
+    def _read_single(self) -> Iterator[List[Any]]:
+        if self.async_connection_url:
+            with closing(self._read_partitions({0: None})) as chunks:
+                for _, item in chunks:
+                    if item is not PARTITION_DONE:
+                        yield item
+            return
+        if not self.memory_budget:
+            yield from self._read_chunks()
+            return
+        # the next chunks are read while dlt takes this one, up to the queue's bound
+        with closing(read_partitions({0: self._read_chunks}, thread_name_prefix="mongo-reader")) as chunks:
+            for _, item in chunks:
+                if item is not PARTITION_DONE:
+                    yield item
+
+    def _read_chunks(self, range_filter: Optional[Dict[str, Any]] = None) -> Iterator[List[Any]]:
+        if self.arrow:
+            yield from self._read_tables(range_filter)
+            return
+        cursor = self._open_cursor(range_filter)
+        while docs := self._read_chunk(cursor):
+            yield docs
+
+    def _read_tables(self, range_filter: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """Decode every raw batch of the cursor (up to CHUNK_SIZE documents) into an Arrow table"""
+        from .arrow import decode_batches
+
+        cursor = iter(self._open_cursor(range_filter, raw=True))
+        while True:
+            with self.timings.measure("mongo_read"):
+                batch = next(cursor, None)
+                if batch is None:
+                    return
+                table = decode_batches([batch], self.arrow_schema)
+            if table.num_rows:
+                yield table
+
+    def _read_chunk(self, cursor: Any) -> List[Any]:
+        if self.chunk_bytes:
+            return self._read_sized_chunk(cursor)
+        with self.timings.measure("mongo_read"):
+            return list(islice(cursor, CHUNK_SIZE))
+
+    def _read_sized_chunk(self, cursor: Any) -> List[Any]:
+        """Documents up to `chunk_bytes` of BSON, read raw and decoded once the chunk is complete"""
+        raw: List[bytes] = []
+        size = 0
+        with self.timings.measure("mongo_read"):
+            for doc in cursor:
+                raw.append(doc.raw)
+                size += len(doc.raw)
+                if size >= self.chunk_bytes:
+                    break
+        if not raw:
+            return []
+        with self.timings.measure("decode"):
+            return decode_all(b"".join(raw), self.collection.codec_options)
+
+    def _open_cursor(self, range_filter: Optional[Dict[str, Any]] = None, raw: bool = False) -> Any:
+        """A cursor over the documents to load, or over raw BSON batches of them"""
+        collection = self.collection
+        if self.chunk_bytes and not raw:
+            # undecoded documents, so a chunk can be sized before it is decoded
+            collection = collection.with_options(
+                codec_options=collection.codec_options.with_options(document_class=RawBSONDocument)
+            )
+
         if self.aggregation_pipeline:
             # Use aggregation pipeline if provided
-            cursor = self.collection.aggregate(self.aggregation_pipeline)
+            if raw:
+                return collection.aggregate_raw_batches(self._build_pipeline(range_filter), batchSize=CHUNK_SIZE)
+            return collection.aggregate(self._build_pipeline(range_filter))
+
+        # Fall back to regular find query
+        if raw:
+            cursor = collection.find_raw_batches(
+                self._build_query(range_filter), self.projection or None, batch_size=CHUNK_SIZE
+            )
         else:
-            # Fall back to regular find query
-            cursor = self.collection.find(self.query)
+            cursor = collection.find(self._build_query(range_filter), self.projection or None)
+        return self._sort(cursor)
+
+    async def _open_async_cursor(self, client: Any, range_filter: Optional[Dict[str, Any]] = None) -> Any:
+        """The cursor of _open_cursor on the asyncio reader's client"""
+        collection = client[self.collection.database.name][self.collection.name]
+        if self.aggregation_pipeline:
+            return await collection.aggregate(self._build_pipeline(range_filter))
+        return self._sort(collection.find(self._build_query(range_filter), self.projection or None))
+
+    def _sort(self, cursor: Any) -> Any:
+        if self.incremental:
+            return cursor.sort(self.incremental.sort())
+        if self.checkpoint is not None:
+            # checkpoint positions are the last _id read
+            return cursor.sort([("_id", ASCENDING)])
+        return cursor
 
-        while docs_slice := list(islice(cursor, CHUNK_SIZE)):
+    def _prepare(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.arrow:
+            return self._prepare_table(docs)
+        if self.incremental:
+            with self.timings.measure("incremental_tracking"):
+                docs = self._track_incremental(docs)
+        if self.convert:
             # convert ObjectId / Decimal / datetimes to JSON-friendly values
-            yield map_nested_values_in_place(convert_mongo_objs, docs_slice)
+            with self.timings.measure("convert"):
+                docs = map_nested_values_in_place(convert_mongo_objs, docs)
+        if self.masker:
+            with self.timings.measure("mask"):
+                docs = self.masker.mask(docs)
+        return docs
 
+    def _prepare_table(self, table: Any) -> Any:
+        if self.incremental:
+            with self.timings.measure("incremental_tracking"):
+                table = self._track_incremental_table(table)
+        from .arrow import to_dlt_table
 
-def convert_mongo_objs(value: Any) -> Any:
-    if isinstance(value, (ObjectId, Decimal128)):
-        return str(value)
-    # Handle datetime objects
-    try:
-        import pendulum
+        with self.timings.measure("convert"):
+            table = to_dlt_table(table)
+            if self.arrow_columns is not None:
+                table = self.arrow_columns.align(table)
+            return table
 
-        if isinstance(value, pendulum.DateTime):
-            return ensure_pendulum_datetime_utc(value)
-    except ImportError:
-        pass
-    # Handle standard datetime objects
-    from datetime import datetime
+    def _track_incremental_table(self, table: Any) -> Any:
+        """Incremental tracking on the key (and _id) columns of an Arrow table"""
+        import pyarrow as pa
 
-    if isinstance(value, datetime):
-        return ensure_pendulum_datetime_utc(value)
+        columns = [name for name in (self.incremental.key.split(".")[0], "_id") if name in table.column_names]
+        rows = table.select(columns).to_pylist()
+        docs = self._track_incremental(rows)
+        if len(docs) == len(rows):
+            return table
+        kept = {id(doc) for doc in docs}
+        return table.filter(pa.array([id(row) in kept for row in rows]))
+
+    def _load_partitioned(self) -> Iterator[TDataItem]:
+        base_query = self.query if not self.aggregation_pipeline else {}
+        range_filters = compute_partition_filters(
+            self.collection, self.partition_key, self.partitions, base_query
+        )
+        if len(range_filters) == 1:
+            logger.info(f"Reading {self.collection.name} with one cursor: no partition boundaries found")
+            yield from self._load_single()
+            return
+
+        self.partition_counts = {index: 0 for index in range(len(range_filters))}
+        with closing(self._read_partitions(dict(enumerate(range_filters)))) as chunks:
+            for index, item in chunks:
+                if item is PARTITION_DONE:
+                    continue
+                docs = self._prepare(item)
+                if docs:
+                    self.partition_counts[index] += len(docs)
+                    yield docs
+
+        logger.info(
+            f"Read {sum(self.partition_counts.values())} documents from {self.collection.name} "
+            f"in {len(range_filters)} partitions: {self.partition_counts}"
+        )
+
+    def _load_checkpointed(self) -> Iterator[TDataItem]:
+        checkpoint = self.checkpoint
+        if checkpoint.partitions is None:
+            range_filters = [{}]
+            if self.partitions > 1:
+                range_filters = compute_partition_filters(
+                    self.collection, self.partition_key, self.partitions, self.query
+                )
+            checkpoint.plan(range_filters)
+        else:
+            logger.info(f"Resuming the load of {self.collection.name} from its checkpoint")
+
+        pending = checkpoint.pending()
+        if not pending:
+            return
+        with closing(self._read_partitions(pending)) as chunks:
+            for index, item in chunks:
+                if item is PARTITION_DONE:
+                    checkpoint.mark_done(index)
+                    continue
+                docs = checkpoint.take(item)
+                # positions advance before conversion turns _ids into strings
+                checkpoint.advance(index, docs)
+                docs = self._prepare(docs)
+                if docs:
+                    yield docs
+                if checkpoint.exhausted:
+                    logger.info(
+                        f"Read {checkpoint.read} documents of {self.collection.name}; "
+                        "the next run continues from the checkpoint"
+                    )
+                    return
+
+    def _read_partitions(self, range_filters: Dict[int, Optional[Dict[str, Any]]]) -> Iterator[Tuple[int, Any]]:
+        if self.async_connection_url:
+            from .async_reader import read_partitions_async
+
+            openers = {
+                index: partial(self._open_async_cursor, range_filter=range_filter)
+                for index, range_filter in range_filters.items()
+            }
+            return read_partitions_async(self.async_connection_url, openers, CHUNK_SIZE, timings=self.timings)
+        readers = {index: partial(self._read_chunks, range_filter) for index, range_filter in range_filters.items()}
+        return read_partitions(readers, thread_name_prefix="mongo-partition-reader")
+
+    def _track_incremental(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        docs = self.incremental.drop_loaded(docs)
+        tracked = self.incremental.update(docs)
+        if docs and not tracked and self.aggregation_pipeline:
+            # Every document entering the user's stages has the key (see
+            # _build_pipeline), so the stages must have removed or renamed it
+            raise ValueError(
+                f"Incremental key '{self.incremental.key}' is missing from the output of the "
+                "aggregation pipeline; keep it in the pipeline's output so the high-water "
+                "mark can advance"
+            )
+        return docs
+
+    def _build_query(self, range_filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        incremental_filter = self.incremental.filter() if self.incremental else {}
+        return and_filters(self.query, incremental_filter, range_filter)
+
+    def _build_pipeline(self, range_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        stages = self._filter_stages(range_filter) + list(self.aggregation_pipeline)
+        if self.projection:
+            stages.append({"$project": self.projection})
+        return stages
+
+    def _filter_stages(self, range_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        if not self.incremental:
+            return [{"$match": range_filter}] if range_filter else []
+
+        # Filter and sort before any user stage so both can use the index.
+        # Documents without the key are excluded so a missing key in the
+        # output can only mean the user's stages dropped it.
+        key = self.incremental.key
+        incremental_filter = self.incremental.filter() or {key: {"$exists": True, "$ne": None}}
+        return [
+            {"$match": and_filters(incremental_filter, range_filter)},
+            {"$sort": dict(self.incremental.sort())},
+        ]
+
+    def _warn_if_unindexed(self, key: str) -> None:
+        try:
+            indexes = self.collection.index_information()
+        except Exception:
+            return
+        if not any(index["key"][0][0] == key for index in indexes.values()):
+            logger.warning(
+                f"No index on '{key}' in {self.collection.name}: incremental loads "
+                "will scan the whole collection"
+            )
+
+
+def and_filters(*filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine query filters with $and, skipping empty ones"""
+    filters = [f for f in filters if f]
+    if not filters:
+        return {}
+    if len(filters) == 1:
+        return filters[0]
+    return {"$and": filters}
+
+
+def compute_partition_filters(
+    collection: Any,
+    key: str,
+    partitions: int,
+    query: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Split a collection into up to `partitions` disjoint ranges of `key`.
+
+    Boundaries come from $bucketAuto over the key. Because MongoDB range
+    operators only match values of the boundaries' type, the first range also
+    takes every document whose key is missing or of another type, so the
+    ranges together cover the whole collection.
+    """
+    stages: List[Dict[str, Any]] = []
+    if query:
+        stages.append({"$match": query})
+    stages.append({"$bucketAuto": {"groupBy": f"${key}", "buckets": partitions}})
+    buckets = list(collection.aggregate(stages, allowDiskUse=True))
+
+    bounds = [bucket["_id"]["min"] for bucket in buckets[1:]]
+    bound_type = _partition_key_type(bounds)
+    if not bounds or bound_type is None:
+        if bounds:
+            logger.warning(f"Can't partition {collection.name} on '{key}': mixed or unsupported key types")
+        return [{}]
+
+    filters: List[Dict[str, Any]] = [
+        {"$or": [{key: {"$lt": bounds[0]}}, {key: {"$not": {"$type": bound_type}}}]}
+    ]
+    for lower, upper in zip(bounds, bounds[1:]):
+        filters.append({key: {"$gte": lower, "$lt": upper}})
+    filters.append({key: {"$gte": bounds[-1]}})
+    return filters
+
+
+def _partition_key_type(bounds: List[Any]) -> Optional[str]:
+    types = set()
+    for bound in bounds:
+        for python_type, alias in PARTITION_KEY_TYPES:
+            if isinstance(bound, python_type):
+                types.add(alias)
+                break
+        else:
+            return None
+    return types.pop() if len(types) == 1 else None
+
+
+def get_path(doc: Dict[str, Any], path: str) -> Any:
+    """Return the value at a dotted path of a document, or None if missing"""
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, (dict, RawBSONDocument)) or part not in value:
+            return None
+        value = value[part]
     return value
+
+
+def bson_sort_key(value: Any) -> Optional[Tuple[int, Any]]:
+    """
+    Sort key following MongoDB's comparison order across BSON types.
+
+    Values of PostgreSQL sources fit the same order: numeric columns
+    (Decimal) are numbers, uuid columns binary data and date columns dates
+    at midnight UTC. Returns None for values that can't be ordered here
+    (documents, arrays, NaN decimals, ...).
+    """
+    if isinstance(value, bool):
+        return (8, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, Decimal128):
+        value = value.to_decimal()
+    if isinstance(value, Decimal):
+        return None if value.is_nan() else (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    if isinstance(value, UUID):
+        # BinData compares by length, subtype, then bytes; a UUID is 16 bytes of subtype 4
+        return (6, (16, UUID_SUBTYPE, value.bytes))
+    if isinstance(value, Binary):
+        return (6, (len(value), value.subtype, bytes(value)))
+    if isinstance(value, ObjectId):
+        return (7, value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (9, value)
+    if isinstance(value, date):
+        return (9, datetime.combine(value, time.min, tzinfo=timezone.utc))
+    if isinstance(value, Timestamp):
+        return (10, (value.time, value.inc))
+    return None
+
+
+def _id_key(value: Any) -> str:
+    # _id can be any BSON value, including unhashable documents; primary
+    # keys of PostgreSQL rows can also be UUIDs, Decimals or dates
+    return json_util.dumps(value, json_options=ID_KEY_JSON_OPTIONS, default=_tagged_id)
+
+
+def _tagged_id(value: Any) -> Dict[str, str]:
+    return {f"${type(value).__name__}": str(value)}
+
+
+def _convert_datetime(value: datetime) -> Any:
+    return ensure_pendulum_datetime_utc(value)
+
+
+def _convert_binary(value: Binary) -> Any:
+    if value.subtype == UUID_SUBTYPE:
+        return str(value.as_uuid(UuidRepresentation.STANDARD))
+    if value.subtype == OLD_UUID_SUBTYPE:
+        return str(value.as_uuid(UuidRepresentation.PYTHON_LEGACY))
+    return bytes(value)
+
+
+def _convert_timestamp(value: Timestamp) -> Any:
+    return ensure_pendulum_datetime_utc(value.as_datetime())
+
+
+def _convert_regex(value: Any) -> str:
+    return value.pattern
+
+
+# Converters by type; subclasses (e.g. pendulum.DateTime) resolve through the MRO
+MONGO_CONVERTERS: Dict[type, Optional[Callable[[Any], Any]]] = {
+    ObjectId: str,
+    Decimal128: str,
+    UUID: str,
+    Int64: int,
+    Binary: _convert_binary,
+    Timestamp: _convert_timestamp,
+    Regex: _convert_regex,
+    re.Pattern: _convert_regex,
+    datetime: _convert_datetime,
+}
+
+# Exact type -> converter, None for values passed through unchanged
+_converter_cache: Dict[type, Optional[Callable[[Any], Any]]] = {
+    str: None,
+    int: None,
+    float: None,
+    bool: None,
+    type(None): None,
+    dict: None,
+    list: None,
+}
+
+
+def _resolve_converter(value_type: type) -> Optional[Callable[[Any], Any]]:
+    for base in value_type.__mro__:
+        if base in MONGO_CONVERTERS:
+            return MONGO_CONVERTERS[base]
+    return None
+
+
+def convert_mongo_objs(value: Any) -> Any:
+    """Convert BSON values to JSON-friendly ones, dispatching on the exact type"""
+    value_type = type(value)
+    try:
+        converter = _converter_cache[value_type]
+    except KeyError:
+        converter = _converter_cache[value_type] = _resolve_converter(value_type)
+    return value if converter is None else converter(value)
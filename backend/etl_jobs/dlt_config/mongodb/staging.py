@@ -0,0 +1,52 @@
+"""
+Staging collections for the "replace" write disposition.
+
+A replace load is written into a fresh staging collection next to the
+target. Only the _id index exists while loading; the target's secondary
+indexes are built once the load is complete, and the staging collection is
+then swapped in with renameCollection(dropTarget=True), so readers see either
+the old or the new data, never a partial load.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STAGING_SUFFIX = "__etl_staging_"
+
+# index_information() entries that aren't create_index options
+_INDEX_INFO_SKIP = {"key", "v", "ns"}
+
+
+class StagingCollection:
+    def __init__(self, target: Any, name: Optional[str] = None) -> None:
+        self.target = target
+        # a named staging collection carries a checkpointed load over several runs
+        self.collection = target.database[name or f"{target.name}{STAGING_SUFFIX}{uuid.uuid4().hex[:12]}"]
+
+    def swap(self) -> None:
+        """Build the target's indexes on the staging collection and rename it over the target"""
+        self._ensure_created()
+        self._copy_indexes()
+        logger.info(f"Replacing {self.target.full_name} with {self.collection.full_name}")
+        self.collection.rename(self.target.name, dropTarget=True)
+
+    def discard(self) -> None:
+        logger.info(f"Dropping staging collection {self.collection.full_name}")
+        self.collection.drop()
+
+    def _ensure_created(self) -> None:
+        # nothing was written to a load that read nothing: swapping in an
+        # empty collection replaces the target with the empty result
+        database = self.target.database
+        if not database.list_collection_names(filter={"name": self.collection.name}):
+            database.create_collection(self.collection.name)
+
+    def _copy_indexes(self) -> None:
+        for name, info in self.target.index_information().items():
+            if name == "_id_":
+                continue
+            options: Dict[str, Any] = {k: v for k, v in info.items() if k not in _INDEX_INFO_SKIP}
+            self.collection.create_index(info["key"], name=name, **options)
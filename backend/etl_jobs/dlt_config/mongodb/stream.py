@@ -0,0 +1,252 @@
+"""
+Change stream replication of one collection into another (streaming loads).
+
+Tails the source collection's change stream and applies inserts, updates,
+replaces and deletes to the destination in micro-batches, flushed when a batch
+reaches `batch_size` events or `flush_seconds` have passed. Only the last
+event per _id of a batch is applied: updates are read with
+fullDocument="updateLookup", so that event carries the document's latest
+state. After every flush the resume token is stored in `state["change_stream"]`
+and handed to `on_flush`, so a restarted worker resumes after the last
+applied batch. A token that has aged out of the oplog can't be resumed:
+the token is cleared and the session ends with `history_lost` set, and the
+destination needs a full load before streaming again.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from ..timing import NO_TIMINGS
+from .client import get_client
+from .source import _id_key
+from .writer import DEFAULT_BATCH_SIZE, DEFAULT_MAX_RETRIES, RETRY_BACKOFF_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_SECONDS = 5
+WATCHED_OPERATIONS = ["insert", "update", "replace", "delete"]
+# ChangeStreamHistoryLost: the resume point is no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+@dataclass
+class StreamInfo:
+    """Outcome of one streaming session, standing in for dlt's LoadInfo"""
+
+    source: str
+    destination: str
+    events: int = 0
+    batches: int = 0
+    upserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    duration_seconds: float = 0.0
+    invalidated: bool = False
+    # the saved resume token had aged out of the oplog; a full load must re-sync
+    history_lost: bool = False
+    resume_token: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    def __str__(self) -> str:
+        return (
+            f"Streamed {self.source} -> {self.destination}: {self.events} events in {self.batches} batches, "
+            f"{self.upserted} inserted, {self.updated} updated, {self.deleted} deleted "
+            f"in {self.duration_seconds:.2f}s"
+            + ("; change stream history lost, re-sync with a full load" if self.history_lost else "")
+        )
+
+
+class ChangeStreamSync:
+    def __init__(
+        self,
+        source: Any,
+        destination: Any,
+        state: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        masker: Optional[Any] = None,
+        on_flush: Optional[Callable[[Dict[str, Any]], None]] = None,
+        timings: Optional[Any] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
+        self.source = source
+        self.destination = destination
+        self.state = state if state is not None else {}
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.masker = masker
+        self.on_flush = on_flush
+        self.timings = timings or NO_TIMINGS
+        self.max_retries = max_retries
+        self.info = StreamInfo(source=source.full_name, destination=destination.full_name)
+
+    @property
+    def resume_token(self) -> Optional[Dict[str, Any]]:
+        return (self.state.get("change_stream") or {}).get("resume_token")
+
+    def run(self, run_seconds: Optional[float] = None) -> StreamInfo:
+        """Apply changes until `run_seconds` have passed (forever if None) or the stream is invalidated"""
+        started = time.monotonic()
+        deadline = started + run_seconds if run_seconds is not None else None
+        if self.resume_token is None:
+            logger.info(
+                f"No resume token for {self.source.full_name}: streaming changes from now on "
+                "(run a full load first to copy existing documents)"
+            )
+
+        events: List[Dict[str, Any]] = []
+        batch_started = time.monotonic()
+        try:
+            with self._watch() as stream:
+                while stream.alive:
+                    with self.timings.measure("change_stream_read"):
+                        change = stream.try_next()
+                    if change is not None:
+                        if change["operationType"] == "invalidate":
+                            self.info.invalidated = True
+                            logger.warning(f"Change stream on {self.source.full_name} was invalidated")
+                            if events:
+                                self._flush(events)
+                                events = []
+                            # the old token can't be resumed after a drop or rename
+                            self._save_token(None)
+                            break
+                        if not events:
+                            batch_started = time.monotonic()
+                        events.append(change)
+
+                    now = time.monotonic()
+                    if events and (len(events) >= self.batch_size or now - batch_started >= self.flush_seconds):
+                        self._flush(events)
+                        events = []
+                    if deadline is not None and now >= deadline:
+                        break
+
+                if events:
+                    self._flush(events)
+        except OperationFailure as e:
+            if e.code != CHANGE_STREAM_HISTORY_LOST:
+                raise
+            if events:
+                self._flush(events)
+            self._lose_history(e)
+
+        self.info.duration_seconds = time.monotonic() - started
+        self.info.resume_token = self.resume_token
+        return self.info
+
+    def _lose_history(self, error: OperationFailure) -> None:
+        self.info.history_lost = True
+        logger.error(
+            f"Change stream on {self.source.full_name} can't resume, its resume token is no longer "
+            f"in the oplog ({error}). Run a full load to re-sync {self.destination.full_name}, then stream again"
+        )
+        # streaming again without a token starts from now instead of failing on the stale one
+        self._save_token(None)
+
+    def _watch(self) -> Any:
+        options: Dict[str, Any] = {
+            "full_document": "updateLookup",
+            # try_next() returns None after this long without changes
+            "max_await_time_ms": int(min(self.flush_seconds, 1) * 1000),
+        }
+        if self.resume_token is not None:
+            options["resume_after"] = self.resume_token
+        return self.source.watch(
+            [{"$match": {"operationType": {"$in": WATCHED_OPERATIONS + ["invalidate"]}}}], **options
+        )
+
+    def _flush(self, events: List[Dict[str, Any]]) -> None:
+        operations = self._operations(events)
+        with self.timings.measure("change_stream_write"):
+            self._bulk_write(operations)
+        self.info.events += len(events)
+        self.info.batches += 1
+
+        self._save_token(events[-1]["_id"])
+
+    def _save_token(self, token: Optional[Dict[str, Any]]) -> None:
+        self.state["change_stream"] = {"resume_token": token} if token is not None else {}
+        if self.on_flush:
+            self.on_flush(self.state)
+
+    def _operations(self, events: List[Dict[str, Any]]) -> List[Any]:
+        # the last event of a document decides its state after the batch
+        latest: Dict[str, Dict[str, Any]] = {}
+        for event in events:
+            latest[_id_key(event["documentKey"]["_id"])] = event
+
+        documents = []
+        operations: List[Any] = []
+        for event in latest.values():
+            key = {"_id": event["documentKey"]["_id"]}
+            document = event.get("fullDocument")
+            if event["operationType"] == "delete":
+                operations.append(DeleteOne(key))
+            elif document is None:
+                # deleted again before the update was looked up; its delete event follows
+                continue
+            else:
+                documents.append(document)
+                operations.append(ReplaceOne(key, document, upsert=True))
+
+        if self.masker and documents:
+            with self.timings.measure("mask"):
+                self.masker.mask(documents)
+        return operations
+
+    def _bulk_write(self, operations: List[Any]) -> None:
+        if not operations:
+            return
+        attempt = 0
+        while True:
+            try:
+                result = self.destination.bulk_write(operations, ordered=False)
+                break
+            except AutoReconnect as e:
+                # replaces and deletes by _id are idempotent, so the batch is resent as is
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                logger.warning(f"Change batch for {self.destination.full_name} interrupted: {e}")
+                time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+
+        self.info.upserted += result.upserted_count
+        self.info.updated += result.matched_count
+        self.info.deleted += result.deleted_count
+
+
+def stream_collection(
+    source_config: Dict[str, Any],
+    destination_config: Dict[str, Any],
+    on_flush: Optional[Callable[[Dict[str, Any]], None]] = None,
+    run_seconds: Optional[float] = None,
+) -> StreamInfo:
+    """Replicate a source collection's changes into the destination collection"""
+    source_client = get_client(source_config["connection_url"])
+    source_db = (
+        source_client[source_config["database"]]
+        if source_config.get("database")
+        else source_client.get_default_database()
+    )
+    source = source_db[source_config["collection"]]
+    destination = get_client(destination_config["connection_url"])[destination_config["database"]][
+        destination_config.get("collection") or source.name
+    ]
+
+    sync = ChangeStreamSync(
+        source,
+        destination,
+        state=source_config.get("state"),
+        batch_size=destination_config.get("batch_size") or DEFAULT_BATCH_SIZE,
+        flush_seconds=source_config.get("flush_seconds") or DEFAULT_FLUSH_SECONDS,
+        masker=source_config.get("masker"),
+        on_flush=on_flush,
+        timings=source_config.get("timings"),
+    )
+    logger.info(f"Streaming changes {source.full_name} -> {destination.full_name}")
+    return sync.run(run_seconds=run_seconds)
@@ -0,0 +1,281 @@
+"""
+Bulk write engine for the MongoDB destination.
+
+Splits incoming items into fixed-size batches and writes them with unordered
+bulk inserts, optionally keeping several batches in flight on a thread pool.
+Failed writes are retried per document; errors that cannot succeed on retry
+(such as duplicate keys) are counted instead of failing the whole load.
+
+Besides plain inserts ("append"), batches can be merged into the target by
+primary key: "merge" replaces whole documents (ReplaceOne) and "upsert" sets
+the incoming fields (UpdateOne with $set), both with upsert=True and backed
+by a unique index on the key. "replace" loads are appended to a staging
+collection that is swapped in at the end (see staging.py).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from bson import json_util
+from pymongo import ASCENDING, ReplaceOne, UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from .source import get_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1_000
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+
+DUPLICATE_KEY_ERROR = 11000
+IMMUTABLE_FIELD_ERROR = 66
+
+APPEND = "append"
+MERGE = "merge"
+UPSERT = "upsert"
+REPLACE = "replace"
+WRITE_DISPOSITIONS = (APPEND, MERGE, UPSERT)
+
+# Write errors that will fail the same way on every retry
+NON_RETRYABLE_ERROR_CODES = {
+    DUPLICATE_KEY_ERROR,
+    121,  # document failed validation
+}
+
+# Concurrent upserts of one key can race into a duplicate key error, which
+# succeeds on retry; changing the _id of an existing document never does
+NON_RETRYABLE_UPSERT_ERROR_CODES = {
+    121,
+    IMMUTABLE_FIELD_ERROR,
+}
+
+
+@dataclass
+class WriteResult:
+    """Counters for one or more bulk writes (safe to share between threads)"""
+
+    inserted: int = 0
+    # existing documents matched by merge/upsert writes
+    updated: int = 0
+    failed: int = 0
+    retried: int = 0
+    write_errors: int = 0
+    # duplicates seen after resending an interrupted batch: either written by
+    # the interrupted attempt or already present in the target
+    ambiguous: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, other: "WriteResult") -> None:
+        with self._lock:
+            self.inserted += other.inserted
+            self.updated += other.updated
+            self.failed += other.failed
+            self.retried += other.retried
+            self.write_errors += other.write_errors
+            self.ambiguous += other.ambiguous
+
+
+class BulkWriter:
+    """
+    Writes batches to one collection for the duration of a run.
+
+    In merge and upsert mode a unique index on the primary key is created
+    up front, so every upsert is an index lookup.
+
+    With max_in_flight > 1 the batches of one write() call are sent side by
+    side on a thread pool owned by the writer, at most max_in_flight at a
+    time. write() returns once all of them are acknowledged, so a caller that
+    records its items as loaded never runs ahead of the server, and a failed
+    batch is raised from the call that wrote it. The pool is kept for the
+    writer's next calls; close() releases it at the end of the run.
+    """
+
+    def __init__(
+        self,
+        collection: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_in_flight: int = 1,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        result: Optional[WriteResult] = None,
+        write_disposition: str = APPEND,
+        primary_key: Sequence[str] = ("_id",),
+    ) -> None:
+        if write_disposition not in WRITE_DISPOSITIONS:
+            raise ValueError(
+                f"Unsupported write disposition '{write_disposition}'. Supported: {list(WRITE_DISPOSITIONS)}"
+            )
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.result = result if result is not None else WriteResult()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[Future] = deque()
+        self._errors: List[BaseException] = []
+        self._lock = threading.Lock()
+        self.write_disposition = write_disposition
+        self.primary_key = list(primary_key) or ["_id"]
+        self._non_retryable = (
+            NON_RETRYABLE_ERROR_CODES if write_disposition == APPEND else NON_RETRYABLE_UPSERT_ERROR_CODES
+        )
+        if write_disposition != APPEND:
+            self._ensure_key_index()
+
+    def write(self, items: Sequence[Any]) -> None:
+        """Write all items, accumulating counters into self.result"""
+        if not items:
+            return
+
+        if self.max_in_flight == 1:
+            for batch in self._batches(items):
+                self.result.add(self._write_batch(batch))
+            return
+        try:
+            for batch in self._batches(items):
+                self._submit(batch)
+        finally:
+            self.flush()
+
+    def flush(self) -> None:
+        """Wait for every batch in flight, then raise the first error of a batch"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    break
+                future = self._pending.popleft()
+            self._collect(future)
+        if self._errors:
+            error = self._errors[0]
+            self._errors.clear()
+            raise error
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _submit(self, batch: Sequence[Any]) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_in_flight,
+                    thread_name_prefix="mongo-bulk-writer",
+                )
+            while len(self._pending) >= self.max_in_flight:
+                self._collect(self._pending.popleft())
+            self._pending.append(self._executor.submit(self._write_batch, batch))
+
+    def _collect(self, future: Future) -> None:
+        # errors are raised by flush(), once no batch of the call is in flight
+        try:
+            self.result.add(future.result())
+        except Exception as e:
+            self._errors.append(e)
+
+    def _batches(self, items: Sequence[Any]) -> List[Sequence[Any]]:
+        if len(items) <= self.batch_size:
+            return [items]
+        return [items[i : i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    def _write_batch(self, batch: Sequence[Any]) -> WriteResult:
+        result = WriteResult()
+        pending = batch if self.write_disposition == APPEND else self._last_per_key(batch)
+        attempt = 0
+        resent = False
+
+        while pending:
+            try:
+                self._send(pending, result)
+                return result
+            except BulkWriteError as e:
+                details = e.details
+                result.inserted += details.get("nInserted", 0) + details.get("nUpserted", 0)
+                result.updated += details.get("nMatched", 0)
+                errors = details.get("writeErrors", [])
+                result.write_errors += len(errors)
+
+                retryable = []
+                for err in errors:
+                    code = err.get("code")
+                    if code not in self._non_retryable:
+                        retryable.append(pending[err["index"]])
+                    elif code == DUPLICATE_KEY_ERROR and resent:
+                        result.ambiguous += 1
+                    else:
+                        result.failed += 1
+                pending = retryable
+                resent = False
+            except AutoReconnect as e:
+                # Unordered inserts may have partially applied, so the whole
+                # batch is resent; its duplicates are counted as ambiguous.
+                logger.warning(f"Bulk write to {self.collection.name} interrupted: {e}")
+                resent = True
+
+            if not pending:
+                break
+
+            attempt += 1
+            if attempt > self.max_retries:
+                logger.error(
+                    f"Giving up on {len(pending)} documents for {self.collection.name} "
+                    f"after {self.max_retries} retries"
+                )
+                result.failed += len(pending)
+                break
+
+            result.retried += len(pending)
+            time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+
+        return result
+
+    def _send(self, docs: Sequence[Any], result: WriteResult) -> None:
+        if self.write_disposition == APPEND:
+            inserted = self.collection.insert_many(docs, ordered=False)
+            result.inserted += len(inserted.inserted_ids)
+            return
+
+        if self.write_disposition == MERGE:
+            operations = [ReplaceOne(self._key_filter(doc), doc, upsert=True) for doc in docs]
+        else:
+            operations = [
+                UpdateOne(self._key_filter(doc), self._upsert_update(doc), upsert=True) for doc in docs
+            ]
+        written = self.collection.bulk_write(operations, ordered=False)
+        result.inserted += written.upserted_count
+        result.updated += written.matched_count
+
+    def _key_filter(self, doc: Any) -> Dict[str, Any]:
+        return {field: get_path(doc, field) for field in self.primary_key}
+
+    def _upsert_update(self, doc: Any) -> Dict[str, Any]:
+        # _id can't be changed on an existing document, so it's only set on insert
+        fields = {name: value for name, value in doc.items() if name != "_id"}
+        update: Dict[str, Any] = {}
+        if fields:
+            update["$set"] = fields
+        if "_id" in doc and "_id" not in self.primary_key:
+            update["$setOnInsert"] = {"_id": doc["_id"]}
+        return update or {"$set": {"_id": doc["_id"]}}
+
+    def _last_per_key(self, batch: Sequence[Any]) -> List[Any]:
+        # unordered writes of one key would race; the last version wins, as it would in order
+        latest = {json_util.dumps(list(self._key_filter(doc).values())): doc for doc in batch}
+        return list(latest.values())
+
+    def _ensure_key_index(self) -> None:
+        if self.primary_key == ["_id"]:
+            return
+        self.collection.create_index(
+            [(field, ASCENDING) for field in self.primary_key],
+            unique=True,
+            name=f"etl_primary_key_{'_'.join(self.primary_key)}",
+        )
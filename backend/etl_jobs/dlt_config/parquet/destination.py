@@ -0,0 +1,301 @@
+"""
+Parquet file destination (the S3 DestinationType), on a local path or any
+fsspec filesystem such as S3 or MinIO.
+
+dlt normalizes items into Arrow record batches (loader_file_format="parquet")
+and hands them to the sink, which writes them as zstd-compressed Parquet
+files under `<bucket_url>/<table>/`:
+
+  - with `partition_field`, files go to Hive-style directories
+    (`created_at=2025-01-31/`); timestamps partition by their UTC date
+  - batches are buffered per partition into row groups of `row_group_rows`
+  - at most `max_open_partitions` partitions keep an open file and buffer;
+    the least recently written one is flushed and closed to make room, and
+    continues in a new file if more of its rows arrive
+  - a file is closed and the next one started once it reaches
+    `max_file_bytes`, or when the batches' schema changes
+
+Files of a failed run are deleted. A successful "replace" run deletes the
+table's files from earlier runs.
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import dlt
+
+from ..mongodb.writer import APPEND, REPLACE, WriteResult
+from ..timing import NO_TIMINGS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARQUET_BATCH_SIZE = 50_000
+DEFAULT_ROW_GROUP_ROWS = 100_000
+DEFAULT_MAX_FILE_BYTES = 128 * 1024 * 1024
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_MAX_OPEN_PARTITIONS = 32
+# Hive's directory name for null partition values
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# One writer per target table for the duration of a run
+_writers: Dict[Tuple, "ParquetDatasetWriter"] = {}
+_writers_lock = threading.Lock()
+
+
+@dlt.destination(
+    name="parquet_destination",
+    batch_size=DEFAULT_PARQUET_BATCH_SIZE,
+    loader_file_format="parquet",  # items arrive as pyarrow RecordBatches
+    max_table_nesting=0,
+    skip_dlt_columns_and_tables=True,
+)
+def parquet_sink(
+    items,
+    table,
+    bucket_url: str = dlt.config.value,
+    table_name: Optional[str] = None,
+    partition_field: Optional[str] = None,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
+    max_open_partitions: int = DEFAULT_MAX_OPEN_PARTITIONS,
+    storage_options: Optional[Dict[str, Any]] = None,
+    write_result: Optional[Any] = None,
+    timings: Optional[Any] = None,
+    write_disposition: str = APPEND,
+) -> None:
+    """
+    Custom Parquet destination.
+
+    You can parametrize it via:
+      - bucket_url: local directory or fsspec URL (s3://bucket/prefix)
+      - table_name (fallback: table["name"]): directory of the table's files
+      - partition_field: column partitioning the files (date of timestamps)
+      - max_file_bytes: size at which the next file is started
+      - compression: Parquet codec (zstd, snappy, gzip, ...)
+      - max_open_partitions: partitions with an open file and buffered rows
+      - storage_options: fsspec options, e.g. {"client_kwargs": {"endpoint_url": ...}} for MinIO
+      - write_result: WriteResult counting the rows written
+      - timings: StageTimings receiving the time spent writing
+      - write_disposition: "append", or "replace" to drop earlier files
+
+    Files are completed in close_writers() at the end of the run.
+    """
+    if not items.num_rows:
+        return
+
+    writer = _get_writer(
+        bucket_url,
+        table_name or table["name"],
+        partition_field=partition_field,
+        max_file_bytes=max_file_bytes,
+        compression=compression,
+        max_open_partitions=max_open_partitions,
+        storage_options=storage_options,
+        write_result=write_result,
+        timings=timings,
+        write_disposition=write_disposition,
+    )
+    writer.write(items)
+
+
+class ParquetDatasetWriter:
+    def __init__(
+        self,
+        bucket_url: str,
+        table: str,
+        partition_field: Optional[str] = None,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        compression: str = DEFAULT_COMPRESSION,
+        row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+        max_open_partitions: int = DEFAULT_MAX_OPEN_PARTITIONS,
+        storage_options: Optional[Dict[str, Any]] = None,
+        write_disposition: str = APPEND,
+        result: Optional[WriteResult] = None,
+        timings: Optional[Any] = None,
+    ) -> None:
+        from fsspec.core import url_to_fs
+
+        if write_disposition not in (APPEND, REPLACE):
+            raise ValueError(
+                f"Unsupported write disposition '{write_disposition}' for Parquet files. Supported: append, replace"
+            )
+        self.fs, root = url_to_fs(bucket_url, **(storage_options or {}))
+        self.root = f"{root.rstrip('/')}/{table}"
+        self.partition_field = partition_field
+        self.max_file_bytes = max_file_bytes
+        self.compression = compression
+        self.row_group_rows = max(1, row_group_rows)
+        self.max_open_partitions = max(1, max_open_partitions)
+        self.write_disposition = write_disposition
+        self.result = result if result is not None else WriteResult()
+        self.timings = timings or NO_TIMINGS
+        self.run_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.files: List[str] = []
+        # least recently written first
+        self._partitions: "OrderedDict[str, _PartitionFiles]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def write(self, batch: Any) -> None:
+        with self._lock, self.timings.measure("parquet_write"):
+            for partition, rows in self._split(batch):
+                self._partition(partition).add(rows)
+            self.result.add(WriteResult(inserted=batch.num_rows))
+
+    def close(self, succeeded: bool = True) -> None:
+        """Complete the run's files, then drop replaced files; or delete the run's files"""
+        errors = []
+        with self.timings.measure("parquet_write"):
+            for files in self._partitions.values():
+                try:
+                    files.close()
+                except Exception as e:
+                    errors.append(e)
+            self._partitions.clear()
+        if not succeeded or errors:
+            if self.files:
+                logger.info(f"Deleting {len(self.files)} files of the failed run under {self.root}")
+                self.fs.rm(self.files)
+            if errors:
+                raise errors[0]
+            return
+
+        logger.info(f"Wrote {self.result.inserted} rows to {len(self.files)} Parquet files under {self.root}")
+        if self.write_disposition == REPLACE and self.files:
+            written = set(self.files)
+            stale = [path for path in self.fs.find(self.root) if path.endswith(".parquet") and path not in written]
+            if stale:
+                logger.info(f"Replacing: deleting {len(stale)} earlier files under {self.root}")
+                self.fs.rm(stale)
+
+    def _partition(self, partition: str) -> "_PartitionFiles":
+        """The files of a partition, closing the least recently written one to stay under the cap"""
+        files = self._partitions.get(partition)
+        if files is not None:
+            self._partitions.move_to_end(partition)
+            return files
+        while len(self._partitions) >= self.max_open_partitions:
+            _, evicted = self._partitions.popitem(last=False)
+            evicted.close()
+        files = self._partitions[partition] = _PartitionFiles(self, partition)
+        return files
+
+    def _split(self, batch: Any) -> List[Tuple[str, Any]]:
+        """(partition directory, rows) pairs of a record batch"""
+        if not self.partition_field:
+            return [("", batch)]
+        if self.partition_field not in batch.schema.names:
+            return [(self._directory(None), batch)]
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        column = batch.column(self.partition_field)
+        if pa.types.is_timestamp(column.type):
+            column = pc.cast(column, pa.date32())
+        values = pc.cast(column, pa.string())
+        if values.null_count == 0 and len(pc.unique(values)) == 1:
+            return [(self._directory(values[0].as_py()), batch)]
+
+        values = pc.fill_null(values, NULL_PARTITION)
+        return [
+            (self._directory(None if value == NULL_PARTITION else value), batch.filter(pc.equal(values, value)))
+            for value in pc.unique(values).to_pylist()
+        ]
+
+    def _directory(self, value: Optional[str]) -> str:
+        value = NULL_PARTITION if value is None else quote(value, safe="")
+        return f"{self.partition_field}={value}"
+
+
+class _PartitionFiles:
+    """The open file and buffered rows of one partition directory, rolled over by size"""
+
+    def __init__(self, writer: ParquetDatasetWriter, partition: str) -> None:
+        self.writer = writer
+        self.directory = f"{writer.root}/{partition}" if partition else writer.root
+        self.pending: List[Any] = []
+        self.pending_rows = 0
+        self.schema = None
+        self._file = None
+        self._parquet = None
+
+    def add(self, rows: Any) -> None:
+        if self.schema is not None and not rows.schema.equals(self.schema):
+            # a file has one schema; columns dlt added since go to a new file
+            self._flush()
+            self._close_file()
+        self.schema = rows.schema
+        self.pending.append(rows)
+        self.pending_rows += rows.num_rows
+        if self.pending_rows >= self.writer.row_group_rows:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        self._close_file()
+
+    def _flush(self) -> None:
+        if not self.pending:
+            return
+        import pyarrow as pa
+
+        if self._parquet is None:
+            self._open_file()
+        self._parquet.write_table(pa.Table.from_batches(self.pending), row_group_size=self.pending_rows)
+        self.pending, self.pending_rows = [], 0
+        if self._file.tell() >= self.writer.max_file_bytes:
+            self._close_file()
+
+    def _open_file(self) -> None:
+        import pyarrow.parquet as pq
+
+        writer = self.writer
+        path = f"{self.directory}/part-{writer.run_id}-{len(writer.files):05d}.parquet"
+        writer.fs.makedirs(self.directory, exist_ok=True)
+        self._file = writer.fs.open(path, "wb")
+        self._parquet = pq.ParquetWriter(self._file, self.schema, compression=writer.compression)
+        writer.files.append(path)
+
+    def _close_file(self) -> None:
+        if self._parquet is None:
+            return
+        try:
+            self._parquet.close()
+        finally:
+            self._file.close()
+            self._parquet = self._file = None
+
+
+def _get_writer(
+    bucket_url: str,
+    table: str,
+    write_result: Optional[WriteResult],
+    **options: Any,
+) -> ParquetDatasetWriter:
+    key = (bucket_url, table, id(write_result))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = ParquetDatasetWriter(bucket_url, table, result=write_result, **options)
+        return writer
+
+
+def close_writers(write_result: Optional[WriteResult] = None, succeeded: bool = True) -> None:
+    """Complete (or delete) the files of a run's writers"""
+    with _writers_lock:
+        keys = [key for key in _writers if key[2] == id(write_result)]
+        writers = [_writers.pop(key) for key in keys]
+
+    errors = []
+    for writer in writers:
+        try:
+            writer.close(succeeded=succeeded and not errors)
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
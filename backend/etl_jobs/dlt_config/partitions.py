@@ -0,0 +1,75 @@
+"""
+Concurrent reads of a source split into key ranges.
+
+Every range is read on its own thread. Chunks are merged through a bounded
+queue into one stream on the consuming thread, so incremental tracking,
+conversion and masking stay single-threaded.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+# yielded as (index, PARTITION_DONE) once a range has been read to the end
+PARTITION_DONE = object()
+# chunks a reader may have waiting in the queue
+PREFETCH_CHUNKS = 2
+
+
+def read_partitions(
+    readers: Dict[int, Callable[[], Iterator[Any]]], thread_name_prefix: str = "partition-reader"
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Run each reader (a function returning an iterator of chunks) on a thread,
+    yielding (index, chunk) as chunks arrive and (index, PARTITION_DONE) as
+    readers finish. A reader's exception is raised here. Closing the
+    iterator stops the readers.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=PREFETCH_CHUNKS * len(readers))
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(readers), thread_name_prefix=thread_name_prefix)
+    try:
+        for index, read in readers.items():
+            executor.submit(_read_partition, index, read, chunks, stop)
+
+        remaining = len(readers)
+        while remaining:
+            index, item = chunks.get()
+            if item is PARTITION_DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            yield index, item
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _read_partition(
+    index: int,
+    read: Callable[[], Iterator[Any]],
+    chunks: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    try:
+        with closing(read()) as reader:
+            for chunk in reader:
+                if stop.is_set():
+                    return
+                _put_until_stopped(chunks, (index, chunk), stop)
+    except BaseException as e:
+        _put_until_stopped(chunks, (index, e), stop)
+    finally:
+        _put_until_stopped(chunks, (index, PARTITION_DONE), stop)
+
+
+def _put_until_stopped(chunks: queue.Queue, item: Any, stop: threading.Event) -> None:
+    # A bounded put that gives up once the consumer has gone away
+    while not stop.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
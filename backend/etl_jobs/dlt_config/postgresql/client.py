@@ -0,0 +1,20 @@
+"""
+PostgreSQL connections.
+
+Unlike MongoClients, psycopg2 connections aren't pooled: a run opens one per
+target table it writes and one per partition it reads, and closes them at the
+end of the run.
+"""
+
+from typing import Any
+
+
+def connect(connection_url: str, **options: Any) -> Any:
+    import psycopg2
+
+    return psycopg2.connect(connection_url, **options)
+
+
+def quote(identifier: str) -> str:
+    """Quote an identifier (table, column or schema name)"""
+    return '"' + identifier.replace('"', '""') + '"'
@@ -0,0 +1,336 @@
+"""
+PostgreSQL destination.
+
+Every batch handed to the sink is streamed with COPY ... FROM STDIN (CSV) into
+an unlogged staging table created for the run. When the run ends the staging
+table is merged into the target and dropped, all in the run's transaction, so
+a failed run leaves the target as it was:
+
+  - "append" inserts the staged rows
+  - "replace" truncates the target first
+  - "merge" inserts or replaces rows by primary key (INSERT ... ON CONFLICT)
+  - "upsert" inserts rows, or sets the non-null incoming columns of existing ones
+
+Columns come from dlt's table schema; nested documents (dlt's "json" type)
+are stored as JSONB.
+"""
+
+import io
+import json
+import logging
+import threading
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import dlt
+
+from ..mongodb.writer import APPEND, MERGE, REPLACE, UPSERT, WriteResult
+from ..timing import NO_TIMINGS
+from .client import connect, quote
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COPY_BATCH_SIZE = 10_000
+
+# dlt data types -> PostgreSQL column types
+POSTGRES_TYPES = {
+    "text": "text",
+    "double": "double precision",
+    "bool": "boolean",
+    "timestamp": "timestamptz",
+    "date": "date",
+    "time": "time",
+    "bigint": "bigint",
+    "binary": "bytea",
+    "json": "jsonb",
+    "decimal": "numeric",
+    "wei": "numeric",
+}
+WRITE_DISPOSITIONS = (APPEND, MERGE, UPSERT, REPLACE)
+# orders staged rows, so the last row of a key wins a merge
+SEQUENCE_COLUMN = "_etl_seq"
+
+# One writer (and connection) per target table for the duration of a run
+_writers: Dict[Tuple, "PostgresWriter"] = {}
+_writers_lock = threading.Lock()
+
+
+@dlt.destination(
+    name="postgres_destination",
+    batch_size=DEFAULT_COPY_BATCH_SIZE,  # rows per COPY; overridden per pipeline
+    loader_file_format="typed-jsonl",
+    max_table_nesting=0,
+    skip_dlt_columns_and_tables=True,
+)
+def postgres_sink(
+    items,
+    table,
+    connection_url: str = dlt.secrets.value,
+    schema: str = "public",
+    table_name: Optional[str] = None,
+    write_result: Optional[Any] = None,
+    timings: Optional[Any] = None,
+    write_disposition: str = APPEND,
+    primary_key: Optional[List[str]] = None,
+    checkpoint: Optional[Any] = None,
+) -> None:
+    """
+    Custom PostgreSQL destination.
+
+    You can parametrize it via:
+      - connection_url: postgresql:// URL of the target database
+      - schema: schema of the target table (created if missing)
+      - table_name (fallback: table["name"])
+      - write_result: WriteResult collecting counters for the run
+      - timings: StageTimings receiving the time spent copying and merging
+      - write_disposition: "append", "replace", "merge" or "upsert"
+      - primary_key: columns identifying a row for merge/upsert (default _id)
+      - checkpoint: Checkpoint of a full load split over several runs; only
+        its first run truncates a replaced table
+
+    Staged rows reach the target in close_writers() at the end of the run.
+    """
+    if not isinstance(items, list):
+        # record batches of sources yielding Arrow tables
+        items = items.to_pylist()
+    if not items:
+        return
+
+    writer = _get_writer(
+        connection_url,
+        schema,
+        table_name or table["name"],
+        write_result=write_result,
+        timings=timings,
+        write_disposition=write_disposition,
+        primary_key=primary_key or ["_id"],
+        checkpoint=checkpoint,
+    )
+    writer.write(items, table["columns"])
+
+
+class PostgresWriter:
+    def __init__(
+        self,
+        connection: Any,
+        schema: str,
+        table: str,
+        write_disposition: str = APPEND,
+        primary_key: Sequence[str] = ("_id",),
+        result: Optional[WriteResult] = None,
+        timings: Optional[Any] = None,
+    ) -> None:
+        if write_disposition not in WRITE_DISPOSITIONS:
+            raise ValueError(
+                f"Unsupported write disposition '{write_disposition}'. Supported: {list(WRITE_DISPOSITIONS)}"
+            )
+        self.connection = connection
+        self.schema = schema
+        self.table = table
+        self.staging_table = f"{table[:40]}__etl_staging_{uuid.uuid4().hex[:12]}"
+        self.write_disposition = write_disposition
+        self.primary_key = list(primary_key) or ["_id"]
+        self.result = result if result is not None else WriteResult()
+        self.timings = timings or NO_TIMINGS
+        # column name -> PostgreSQL type, in table order
+        self.columns: Dict[str, str] = {}
+        self.copied = 0
+        self._lock = threading.Lock()
+
+    @property
+    def target_name(self) -> str:
+        return f"{quote(self.schema)}.{quote(self.table)}"
+
+    @property
+    def staging_name(self) -> str:
+        return f"{quote(self.schema)}.{quote(self.staging_table)}"
+
+    def write(self, items: Sequence[Dict[str, Any]], columns: Dict[str, Dict[str, Any]]) -> None:
+        """COPY items into the staging table, adding columns dlt has seen since the last batch"""
+        if not items:
+            return
+        with self._lock, self.timings.measure("postgres_copy"):
+            with self.connection.cursor() as cursor:
+                self._ensure_columns(cursor, columns)
+                names = list(self.columns)
+                types = [columns.get(name, {}).get("data_type") for name in names]
+                buffer = io.StringIO()
+                for item in items:
+                    buffer.write(",".join(_csv_value(item.get(name), t) for name, t in zip(names, types)))
+                    buffer.write("\n")
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {self.staging_name} ({_column_list(names)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            self.copied += len(items)
+
+    def close(self, succeeded: bool = True) -> None:
+        """Merge the staged rows into the target and commit, or roll the run back"""
+        try:
+            if succeeded and self.columns:
+                with self.timings.measure("postgres_merge"), self.connection.cursor() as cursor:
+                    self._merge(cursor)
+                    cursor.execute(f"DROP TABLE {self.staging_name}")
+                self.connection.commit()
+                logger.info(
+                    f"Loaded {self.copied} rows into {self.schema}.{self.table}: "
+                    f"{self.result.inserted} inserted, {self.result.updated} updated"
+                )
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+
+    def _ensure_columns(self, cursor: Any, columns: Dict[str, Dict[str, Any]]) -> None:
+        new = {
+            name: POSTGRES_TYPES.get(column.get("data_type"), "text")
+            for name, column in columns.items()
+            if name not in self.columns
+        }
+        if not new:
+            return
+        if not self.columns:
+            self._create_tables(cursor, new)
+        else:
+            for name, column_type in new.items():
+                for table in (self.target_name, self.staging_name):
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {quote(name)} {column_type}")
+        self.columns.update(new)
+
+    def _create_tables(self, cursor: Any, columns: Dict[str, str]) -> None:
+        definitions = ", ".join(f"{quote(name)} {column_type}" for name, column_type in columns.items())
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {quote(self.schema)}")
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.target_name} ({definitions})")
+        # an existing target may predate columns dlt has inferred since
+        for name, column_type in columns.items():
+            cursor.execute(f"ALTER TABLE {self.target_name} ADD COLUMN IF NOT EXISTS {quote(name)} {column_type}")
+        # unlogged: staged rows skip the WAL, and the table never outlives the run
+        cursor.execute(
+            f"CREATE UNLOGGED TABLE {self.staging_name} ({quote(SEQUENCE_COLUMN)} bigserial, {definitions})"
+        )
+
+    def _merge(self, cursor: Any) -> None:
+        columns = _column_list(self.columns)
+        if self.write_disposition in (APPEND, REPLACE):
+            if self.write_disposition == REPLACE:
+                cursor.execute(f"TRUNCATE {self.target_name}")
+            cursor.execute(
+                f"INSERT INTO {self.target_name} ({columns}) "
+                f"SELECT {columns} FROM {self.staging_name} ORDER BY {quote(SEQUENCE_COLUMN)}"
+            )
+            self.result.add(WriteResult(inserted=cursor.rowcount))
+            return
+
+        key = _column_list(self.primary_key)
+        cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {quote(_key_index_name(self.table, self.primary_key))} "
+            f"ON {self.target_name} ({key})"
+        )
+        cursor.execute(
+            f"WITH merged AS ("
+            f"INSERT INTO {self.target_name} AS target ({columns}) "
+            f"SELECT DISTINCT ON ({key}) {columns} FROM {self.staging_name} "
+            f"ORDER BY {key}, {quote(SEQUENCE_COLUMN)} DESC "
+            f"ON CONFLICT ({key}) {self._conflict_action()} "
+            # xmax is 0 on rows the statement inserted
+            f"RETURNING (xmax = 0) AS inserted) "
+            f"SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged"
+        )
+        inserted, updated = cursor.fetchone()
+        self.result.add(WriteResult(inserted=inserted, updated=updated))
+
+    def _conflict_action(self) -> str:
+        updated = [name for name in self.columns if name not in self.primary_key]
+        if not updated:
+            return "DO NOTHING"
+        if self.write_disposition == UPSERT:
+            assignments = (
+                f"{quote(name)} = COALESCE(EXCLUDED.{quote(name)}, target.{quote(name)})" for name in updated
+            )
+        else:
+            assignments = (f"{quote(name)} = EXCLUDED.{quote(name)}" for name in updated)
+        return f"DO UPDATE SET {', '.join(assignments)}"
+
+
+def _get_writer(
+    connection_url: str,
+    schema: str,
+    table: str,
+    write_result: Optional[WriteResult],
+    timings: Optional[Any] = None,
+    write_disposition: str = APPEND,
+    primary_key: Optional[List[str]] = None,
+    checkpoint: Optional[Any] = None,
+) -> PostgresWriter:
+    key = (connection_url, schema, table, id(write_result))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            if checkpoint is not None:
+                write_disposition, primary_key = _checkpointed_disposition(
+                    write_disposition, primary_key, checkpoint
+                )
+            writer = _writers[key] = PostgresWriter(
+                connect(connection_url),
+                schema,
+                table,
+                write_disposition=write_disposition,
+                primary_key=primary_key or ["_id"],
+                result=write_result,
+                timings=timings,
+            )
+        return writer
+
+
+def _checkpointed_disposition(
+    write_disposition: str, primary_key: Optional[List[str]], checkpoint: Any
+) -> Tuple[str, Optional[List[str]]]:
+    # later runs of a checkpointed replace add to the table the first run replaced,
+    # and rows replayed after an interrupted run are merged by _id
+    if write_disposition == REPLACE and checkpoint.resumed:
+        write_disposition = APPEND
+    if write_disposition == APPEND and checkpoint.interrupted:
+        return MERGE, ["_id"]
+    return write_disposition, primary_key
+
+
+def close_writers(write_result: Optional[WriteResult] = None, succeeded: bool = True) -> None:
+    """Merge or roll back the staged rows of a run's writers"""
+    with _writers_lock:
+        keys = [key for key in _writers if key[3] == id(write_result)]
+        writers = [_writers.pop(key) for key in keys]
+
+    errors = []
+    for writer in writers:
+        try:
+            writer.close(succeeded=succeeded and not errors)
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
+
+def _column_list(names: Iterable[str]) -> str:
+    return ", ".join(quote(name) for name in names)
+
+
+def _key_index_name(table: str, primary_key: Sequence[str]) -> str:
+    return f"{table[:30]}_etl_primary_key_{'_'.join(primary_key)}"[:63]
+
+
+def _csv_value(value: Any, data_type: Optional[str] = None) -> str:
+    """A CSV field for COPY: NULL is an empty unquoted field, everything else is quoted"""
+    if value is None:
+        return ""
+    if data_type == "json" or isinstance(value, (dict, list)):
+        text = json.dumps(value, default=str)
+    elif isinstance(value, bool):
+        text = "true" if value else "false"
+    elif isinstance(value, (bytes, bytearray)):
+        text = "\\x" + bytes(value).hex()
+    elif isinstance(value, (datetime, date, time)):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return '"' + text.replace('"', '""') + '"'
@@ -0,0 +1,247 @@
+"""
+PostgreSQL source.
+
+Tables are read through named (server-side) cursors in batches of
+`fetch_size` rows, so a table is never materialized in worker memory. With
+`partitions` > 1 the table is split into ranges of its primary key (or
+`partition_key`) at percentile boundaries, and each range is read on its
+own connection and thread.
+
+Incremental loads select rows with `incremental_key >= last value`, and
+use the same high-water mark as MongoDB collections (IncrementalCursor),
+keyed on the table's primary key.
+"""
+
+import logging
+import uuid
+from contextlib import closing
+from datetime import timedelta
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import dlt
+from dlt.common.typing import TDataItem
+
+from ..mongodb.source import IncrementalCursor
+from ..partitions import PARTITION_DONE, read_partitions
+from ..timing import NO_TIMINGS
+from .client import connect, quote
+
+logger = logging.getLogger(__name__)
+
+FETCH_SIZE = 10_000
+
+# (lower bound inclusive, upper bound exclusive) of a key range; None is open
+KeyRange = Tuple[Any, Any]
+
+
+@dlt.source(max_table_nesting=0)
+def postgres_table(
+    connection_url: str = dlt.secrets.value,
+    schema: str = "public",
+    table: str = dlt.config.value,
+    write_disposition: Optional[str] = dlt.config.value,
+    incremental_key: Optional[str] = None,
+    state: Optional[Dict[str, Any]] = None,
+    partitions: int = 1,
+    partition_key: Optional[str] = None,
+    fetch_size: int = FETCH_SIZE,
+    masker: Optional[Any] = None,
+    timings: Optional[Any] = None,
+) -> Any:
+    loader = TableLoader(
+        connection_url,
+        schema,
+        table,
+        incremental_key=incremental_key,
+        state=state,
+        partitions=partitions,
+        partition_key=partition_key,
+        fetch_size=fetch_size,
+        masker=masker,
+        timings=timings,
+    )
+    return dlt.resource(  # type: ignore
+        loader.load_rows,
+        name=table,
+        write_disposition=write_disposition,
+    )()
+
+
+class TableLoader:
+    def __init__(
+        self,
+        connection_url: str,
+        schema: str,
+        table: str,
+        incremental_key: Optional[str] = None,
+        state: Optional[Dict[str, Any]] = None,
+        partitions: int = 1,
+        partition_key: Optional[str] = None,
+        fetch_size: int = FETCH_SIZE,
+        masker: Optional[Any] = None,
+        timings: Optional[Any] = None,
+    ) -> None:
+        self.connection_url = connection_url
+        self.schema = schema
+        self.table = table
+        self.incremental_key = incremental_key
+        self.state = state
+        self.partitions = max(1, partitions)
+        self.partition_key = partition_key
+        self.fetch_size = max(1, fetch_size)
+        self.masker = masker
+        self.timings = timings or NO_TIMINGS
+        self.incremental: Optional[IncrementalCursor] = None
+        self.partition_counts: Dict[int, int] = {}
+
+    @property
+    def table_name(self) -> str:
+        return f"{quote(self.schema)}.{quote(self.table)}"
+
+    def load_rows(self) -> Iterator[TDataItem]:
+        with closing(connect(self.connection_url)) as connection:
+            primary_key = self._primary_key(connection)
+            if self.incremental_key:
+                if not primary_key:
+                    logger.warning(
+                        f"{self.schema}.{self.table} has no primary key: rows at the last "
+                        f"'{self.incremental_key}' value are loaded again on the next run"
+                    )
+                self.incremental = IncrementalCursor(
+                    self.incremental_key, self.state, id_key=primary_key[0] if primary_key else "_id"
+                )
+            ranges: List[KeyRange] = [(None, None)]
+            key = self.partition_key or (primary_key[0] if primary_key else None)
+            if self.partitions > 1:
+                if key:
+                    ranges = self._key_ranges(connection, key)
+                else:
+                    logger.warning(f"Can't partition {self.schema}.{self.table}: no primary key or partition key")
+
+        if len(ranges) == 1:
+            for rows in self._read_range(None, (None, None)):
+                rows = self._prepare(rows)
+                if rows:
+                    yield rows
+            return
+
+        self.partition_counts = {index: 0 for index in range(len(ranges))}
+        readers = {index: partial(self._read_range, key, key_range) for index, key_range in enumerate(ranges)}
+        with closing(read_partitions(readers, thread_name_prefix="postgres-partition-reader")) as chunks:
+            for index, item in chunks:
+                if item is PARTITION_DONE:
+                    continue
+                rows = self._prepare(item)
+                if rows:
+                    self.partition_counts[index] += len(rows)
+                    yield rows
+        logger.info(
+            f"Read {sum(self.partition_counts.values())} rows from {self.schema}.{self.table} "
+            f"in {len(ranges)} partitions: {self.partition_counts}"
+        )
+
+    def _read_range(self, key: Optional[str], key_range: KeyRange) -> Iterator[List[Dict[str, Any]]]:
+        """Stream one key range through a named cursor, `fetch_size` rows at a time"""
+        query, params = self._build_query(key, key_range)
+        with closing(connect(self.connection_url)) as connection:
+            connection.set_session(readonly=True)
+            # a named cursor keeps the result set on the server
+            cursor = connection.cursor(name=f"etl_{uuid.uuid4().hex[:12]}")
+            cursor.itersize = self.fetch_size
+            try:
+                cursor.execute(query, params)
+                while True:
+                    with self.timings.measure("postgres_read"):
+                        rows = cursor.fetchmany(self.fetch_size)
+                    if not rows:
+                        break
+                    columns = [column[0] for column in cursor.description]
+                    yield [dict(zip(columns, row)) for row in rows]
+            finally:
+                cursor.close()
+                connection.rollback()
+
+    def _build_query(self, key: Optional[str], key_range: KeyRange) -> Tuple[str, List[Any]]:
+        clauses, params = self._incremental_clauses()
+        lower, upper = key_range
+        if lower is not None:
+            clauses.append(f"{quote(key)} >= %s")
+            params.append(lower)
+        if upper is not None:
+            # NULLs of a partition key that isn't the primary key go to the first range
+            null_clause = f" OR {quote(key)} IS NULL" if lower is None else ""
+            clauses.append(f"({quote(key)} < %s{null_clause})")
+            params.append(upper)
+
+        query = f"SELECT * FROM {self.table_name}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if self.incremental:
+            query += f" ORDER BY {quote(self.incremental.key)}"
+        return query, params
+
+    def _incremental_clauses(self) -> Tuple[List[str], List[Any]]:
+        if not self.incremental or self.incremental.start_value is None:
+            return [], []
+        start_value = self.incremental.start_value
+        if isinstance(start_value, uuid.UUID):
+            # psycopg2 doesn't adapt UUIDs; the untyped literal is cast to the column's uuid
+            start_value = str(start_value)
+        return [f"{quote(self.incremental.key)} >= %s"], [start_value]
+
+    def _key_ranges(self, connection: Any, key: str) -> List[KeyRange]:
+        """Split the rows to read into up to `partitions` ranges of `key` at percentile boundaries"""
+        clauses, params = self._incremental_clauses()
+        fractions = [index / self.partitions for index in range(1, self.partitions)]
+        query = (
+            f"SELECT percentile_disc(%s::float8[]) WITHIN GROUP (ORDER BY {quote(key)}) "
+            f"FROM {self.table_name}"
+        )
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with connection.cursor() as cursor:
+            cursor.execute(query, [fractions, *params])
+            values = cursor.fetchone()[0] or []
+
+        bounds: List[Any] = []
+        for value in values:
+            if value is not None and (not bounds or value != bounds[-1]):
+                bounds.append(value)
+        if not bounds:
+            return [(None, None)]
+        edges = [None, *bounds, None]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _primary_key(self, connection: Any) -> List[str]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT a.attname FROM pg_index i "
+                "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+                "WHERE i.indrelid = %s::regclass AND i.indisprimary "
+                "ORDER BY array_position(i.indkey::int2[], a.attnum)",
+                [self.table_name],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _prepare(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.incremental:
+            with self.timings.measure("incremental_tracking"):
+                rows = self.incremental.drop_loaded(rows)
+                self.incremental.update(rows)
+        with self.timings.measure("convert"):
+            for row in rows:
+                for name, value in row.items():
+                    if type(value) in POSTGRES_CONVERTERS:
+                        row[name] = POSTGRES_CONVERTERS[type(value)](value)
+        if self.masker:
+            with self.timings.measure("mask"):
+                rows = self.masker.mask(rows)
+        return rows
+
+
+# psycopg2 values dlt can't take as they are
+POSTGRES_CONVERTERS = {
+    memoryview: bytes,  # bytea
+    timedelta: str,  # interval
+}
@@ -0,0 +1,59 @@
+"""
+Per-stage wall-clock timers for a pipeline run.
+
+A StageTimings object is created per run and threaded through the source and
+destination configs (like the write result), so the Mongo cursor, conversion,
+masking and sink writes each report their own time. Stages measured on
+several threads add up, so they can exceed the run's wall-clock time.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator
+
+
+class StageTimings:
+    """Seconds and call counts per stage (safe to share between threads)"""
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"StageTimings({', '.join(self._stages)})"
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            totals = self._stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            totals["seconds"] += seconds
+            totals["calls"] += calls
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-friendly copy, in the order stages were first seen"""
+        with self._lock:
+            return {
+                stage: {"seconds": round(totals["seconds"], 4), "calls": int(totals["calls"])}
+                for stage, totals in self._stages.items()
+            }
+
+
+class _NoTimings:
+    """Stand-in when a run isn't timed"""
+
+    def measure(self, stage: str) -> Any:
+        return nullcontext()
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        pass
+
+
+NO_TIMINGS = _NoTimings()
@@ -0,0 +1,131 @@
+"""
+Fan-out of one pipeline run over key ranges of its source collection.
+
+A pipeline with fanout_partitions > 1 is run as a celery chord: the
+coordinating run splits the collection into key ranges with $bucketAuto,
+one task per range loads it across the worker fleet, and the chord callback
+merges what the partition tasks report into the run's single JobExecution.
+Ranges are passed between tasks as Extended JSON, so ObjectId and datetime
+boundaries survive celery's JSON serializer.
+"""
+
+import logging
+from dataclasses import asdict, fields
+from typing import Any, Dict, List, Optional
+
+from bson import json_util
+from bson.json_util import JSONOptions, RELAXED_JSON_OPTIONS
+
+from .dlt_config import StageTimings
+from .dlt_config.mongodb.client import get_client
+from .dlt_config.mongodb.source import compute_partition_filters
+from .dlt_config.mongodb.writer import WriteResult
+from .metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+RANGE_JSON_OPTIONS: JSONOptions = RELAXED_JSON_OPTIONS.with_options(tz_aware=True)
+WRITE_COUNTERS = ("inserted", "updated", "failed", "retried", "write_errors", "ambiguous")
+
+
+def plan_partitions(source_config: Dict[str, Any], partitions: int, key: str = "_id") -> List[Dict[str, Any]]:
+    """Ranges of `key` over the source collection, one per partition task"""
+    client = get_client(source_config["connection_url"])
+    database = source_config["database"]
+    collection = (client[database] if database else client.get_default_database())[source_config["collection"]]
+    return compute_partition_filters(collection, key, partitions)
+
+
+def partition_source_config(source_config: Dict[str, Any], range_filter: Dict[str, Any]) -> Dict[str, Any]:
+    """The source config of one partition: the run's source narrowed to a key range"""
+    config = dict(source_config)
+    if not range_filter:
+        return config
+    if config.get("aggregation_pipeline"):
+        # ranges are of the collection, so they apply before the user's stages
+        config["aggregation_pipeline"] = [{"$match": range_filter}] + list(config["aggregation_pipeline"])
+    else:
+        config["query"] = range_filter
+    return config
+
+
+def encode_range(range_filter: Dict[str, Any]) -> str:
+    return json_util.dumps(range_filter, json_options=RANGE_JSON_OPTIONS)
+
+
+def decode_range(encoded: str) -> Dict[str, Any]:
+    return json_util.loads(encoded, json_options=RANGE_JSON_OPTIONS)
+
+
+def partition_report(
+    index: int,
+    metrics: RunMetrics,
+    write_result: WriteResult,
+    timings: StageTimings,
+    peak_rss: Optional[int],
+    rss_growth: Optional[int],
+) -> Dict[str, Any]:
+    """What a finished partition task returns to the chord callback"""
+    return {
+        "index": index,
+        "status": "success",
+        "metrics": asdict(metrics),
+        "write_result": {name: getattr(write_result, name) for name in WRITE_COUNTERS},
+        "stage_timings": timings.as_dict(),
+        "peak_rss_bytes": peak_rss,
+        "rss_growth_bytes": rss_growth,
+    }
+
+
+class MergedPartitions:
+    """The partition reports of a fanned-out run, combined"""
+
+    def __init__(self, reports: List[Dict[str, Any]]) -> None:
+        self.reports = sorted(reports, key=lambda report: report["index"])
+        self.failed = [report for report in self.reports if report["status"] != "success"]
+        succeeded = [report for report in self.reports if report["status"] == "success"]
+        self.metrics = _merge_metrics([report["metrics"] for report in succeeded])
+        self.write_result = WriteResult()
+        for report in succeeded:
+            self.write_result.add(WriteResult(**report["write_result"]))
+        self.timings = StageTimings()
+        for report in succeeded:
+            for stage, totals in report["stage_timings"].items():
+                self.timings.add(stage, totals["seconds"], totals["calls"])
+        # partitions run in separate processes: the largest is what a worker needs
+        self.peak_rss = _max_of(report.get("peak_rss_bytes") for report in self.reports)
+        self.rss_growth = _max_of(report.get("rss_growth_bytes") for report in self.reports)
+
+    @property
+    def error(self) -> Optional[str]:
+        if not self.failed:
+            return None
+        errors = "; ".join(f"partition {report['index']}: {report['error']}" for report in self.failed)
+        return f"{len(self.failed)} of {len(self.reports)} partitions failed: {errors}"
+
+    def __str__(self) -> str:
+        rows = [report["metrics"].get("rows_extracted") for report in self.reports if report["status"] == "success"]
+        return f"{len(self.reports)} partitions, rows extracted per partition: {rows}"
+
+
+def _merge_metrics(reported: List[Dict[str, Any]]) -> RunMetrics:
+    merged = RunMetrics()
+    for metrics in reported:
+        for table, counters in (metrics.get("tables") or {}).items():
+            totals = merged.tables.setdefault(table, {})
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+    for field in fields(RunMetrics):
+        if field.name == "tables":
+            continue
+        values = [metrics[field.name] for metrics in reported if metrics.get(field.name) is not None]
+        if not values:
+            continue
+        # partitions extract side by side, so the run extracted for as long as the slowest
+        setattr(merged, field.name, max(values) if field.name == "extract_seconds" else sum(values))
+    return merged
+
+
+def _max_of(values: Any) -> Optional[int]:
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
@@ -0,0 +1,90 @@
+"""
+Per-pipeline run lock in Redis.
+
+A run holds `etl:pipeline:<id>:lock` while it executes, so a beat tick or a
+manual run arriving meanwhile is skipped instead of reading the source a
+second time. The lock expires a little after the task time limit, so a
+worker killed mid-run doesn't keep its pipeline locked.
+
+A run fanned out over partitions hands its lock off to the chord callback,
+which releases it by token once the last partition has finished.
+"""
+
+import logging
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# grace after the task time limit before an abandoned lock expires
+LOCK_GRACE_SECONDS = 60
+
+_client: Optional[Any] = None
+
+
+def _redis() -> Any:
+    global _client
+    if _client is None:
+        import redis
+
+        _client = redis.Redis.from_url(settings.PIPELINE_LOCK_URL)
+    return _client
+
+
+def lock_name(pipeline_id: int) -> str:
+    return f"etl:pipeline:{pipeline_id}:lock"
+
+
+class RunLock:
+    """A held run lock"""
+
+    def __init__(self, lock: Any, token: str) -> None:
+        self._lock = lock
+        self.token = token
+        self.handed_off = False
+
+    def hand_off(self, seconds: int) -> str:
+        """Keep the lock for `seconds` after this task; returns the token that releases it"""
+        self._lock.extend(seconds, replace_ttl=True)
+        self.handed_off = True
+        return self.token
+
+    def take_back(self) -> None:
+        """Undo a hand-off whose receiver was never started"""
+        self.handed_off = False
+
+
+@contextmanager
+def pipeline_lock(pipeline_id: int) -> Iterator[Optional[RunLock]]:
+    """Hold the pipeline's run lock; yields None (without waiting) if another run holds it"""
+    token = uuid.uuid4().hex
+    lock = _redis().lock(
+        lock_name(pipeline_id), timeout=settings.CELERY_TASK_TIME_LIMIT + LOCK_GRACE_SECONDS
+    )
+    if not lock.acquire(blocking=False, token=token):
+        yield None
+        return
+    run_lock = RunLock(lock, token)
+    try:
+        yield run_lock
+    finally:
+        if not run_lock.handed_off:
+            _release(lock, pipeline_id)
+
+
+def release_pipeline_lock(pipeline_id: int, token: str) -> None:
+    """Release a handed-off run lock"""
+    lock = _redis().lock(lock_name(pipeline_id))
+    lock.local.token = token.encode()
+    _release(lock, pipeline_id)
+
+
+def _release(lock: Any, pipeline_id: int) -> None:
+    try:
+        lock.release()
+    except Exception as e:
+        # expired and possibly taken by the next run: that run's lock stays
+        logger.warning(f"Could not release the run lock of pipeline {pipeline_id}: {e}")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django_celery_beat.models import PeriodicTask
+
+from etl_jobs.models import Pipeline
+from etl_jobs.schedules import periodic_task_name, sync_pipeline_schedule
+
+
+class Command(BaseCommand):
+    help = "Create or update the celery beat entries of all pipelines, and remove those of deleted pipelines"
+
+    def handle(self, *args, **options):
+        names = set()
+        for pipeline in Pipeline.objects.all():
+            if sync_pipeline_schedule(pipeline) is not None:
+                names.add(periodic_task_name(pipeline.pk))
+
+        stale = PeriodicTask.objects.filter(name__startswith=periodic_task_name("")).exclude(name__in=names)
+        removed, _ = stale.delete()
+        self.stdout.write(f"{len(names)} pipelines scheduled, {removed} stale entries removed")
@@ -0,0 +1,126 @@
+"""
+Row, byte and file counters of a pipeline run.
+
+Counters come from dlt's run trace (extract and normalize job metrics,
+completed load jobs) and from the write counters of our own sinks. dlt's
+internal tables (_dlt_*) are left out so the numbers match the user's data.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from .dlt_config.mongodb.native import NativeCopyInfo
+from .dlt_config.mongodb.stream import StreamInfo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunMetrics:
+    rows_extracted: Optional[int] = None
+    rows_normalized: Optional[int] = None
+    rows_written: Optional[int] = None
+    rows_updated: Optional[int] = None
+    rows_deleted: Optional[int] = None
+    rows_failed: Optional[int] = None
+    bytes_extracted: Optional[int] = None
+    bytes_normalized: Optional[int] = None
+    files_extracted: Optional[int] = None
+    files_loaded: Optional[int] = None
+    extract_seconds: Optional[float] = None
+    # counters per destination table, e.g. {"people": {"rows_extracted": 10, ...}}
+    tables: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+def collect_run_metrics(load_info: Any, write_result: Optional[Any] = None) -> RunMetrics:
+    """Gather the counters of a finished run"""
+    if isinstance(load_info, NativeCopyInfo):
+        metrics = RunMetrics(
+            rows_extracted=load_info.documents,
+            bytes_extracted=load_info.bytes_read,
+            extract_seconds=load_info.duration_seconds,
+        )
+    elif isinstance(load_info, StreamInfo):
+        return RunMetrics(
+            rows_extracted=load_info.events,
+            rows_written=load_info.upserted,
+            rows_updated=load_info.updated,
+            rows_deleted=load_info.deleted,
+            rows_failed=0,
+        )
+    else:
+        metrics = _trace_metrics(load_info)
+
+    if write_result is not None and (
+        write_result.inserted or write_result.updated or write_result.failed or metrics.rows_written is None
+    ):
+        # sinks that wrote nothing through the WriteResult keep dlt's counts
+        metrics.rows_written = write_result.inserted
+        metrics.rows_updated = write_result.updated
+        metrics.rows_failed = write_result.failed
+    return metrics
+
+
+def _trace_metrics(load_info: Any) -> RunMetrics:
+    metrics = RunMetrics()
+    trace = getattr(getattr(load_info, "pipeline", None), "last_trace", None)
+    if trace is None:
+        return metrics
+
+    try:
+        if trace.last_extract_info:
+            tables = _table_job_metrics(trace.last_extract_info.metrics)
+            rows, size, files = _sum_tables(tables)
+            metrics.rows_extracted, metrics.bytes_extracted, metrics.files_extracted = rows, size, files
+            for table, (rows, size, _) in tables.items():
+                metrics.tables.setdefault(table, {}).update(rows_extracted=rows, bytes_extracted=size)
+        if trace.last_normalize_info:
+            tables = _table_job_metrics(trace.last_normalize_info.metrics)
+            rows, size, _ = _sum_tables(tables)
+            metrics.rows_normalized, metrics.bytes_normalized = rows, size
+            for table, (rows, _, _) in tables.items():
+                metrics.tables.setdefault(table, {})["rows_normalized"] = rows
+        if trace.last_load_info:
+            metrics.files_loaded = sum(
+                1
+                for package in trace.last_load_info.load_packages
+                for job in package.jobs.get("completed_jobs", [])
+                if not _is_dlt_table(job.job_file_info.table_name)
+            )
+            # destinations without their own write counters
+            metrics.rows_written = metrics.rows_normalized if metrics.files_loaded else 0
+        for step in trace.steps:
+            if step.step == "extract" and step.finished_at:
+                metrics.extract_seconds = (step.finished_at - step.started_at).total_seconds()
+    except Exception as e:
+        # metrics must never fail an otherwise successful run
+        logger.warning(f"Could not read metrics from the dlt trace: {e}")
+    return metrics
+
+
+def _table_job_metrics(step_metrics: Dict[str, Iterable[Dict[str, Any]]]) -> Dict[str, List[int]]:
+    """Rows, bytes and files per table of a step"""
+    tables: Dict[str, List[int]] = {}
+    for load_metrics in step_metrics.values():
+        for metric in load_metrics:
+            for name, job in metric.get("job_metrics", {}).items():
+                table = name.split(".", 1)[0]
+                if _is_dlt_table(table):
+                    continue
+                counts = tables.setdefault(table, [0, 0, 0])
+                counts[0] += job.items_count
+                counts[1] += job.file_size
+                counts[2] += 1
+    return tables
+
+
+def _sum_tables(tables: Dict[str, List[int]]):
+    rows = sum(counts[0] for counts in tables.values())
+    size = sum(counts[1] for counts in tables.values())
+    files = sum(counts[2] for counts in tables.values())
+    return rows, size, files
+
+
+def _is_dlt_table(table_name: str) -> bool:
+    return table_name.startswith("_dlt")
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0003_pipeline_source_aggregation_query'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='batch_size',
+            field=models.PositiveIntegerField(default=1000, help_text='Documents per bulk write to the destination'),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='write_concurrency',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Number of bulk writes kept in flight at once'),
+        ),
+    ]
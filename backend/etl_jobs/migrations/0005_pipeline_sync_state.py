@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0004_pipeline_batch_size_write_concurrency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='sync_state',
+            field=models.JSONField(blank=True, default=dict, help_text='State persisted between runs, stored as MongoDB Extended JSON'),
+        ),
+    ]
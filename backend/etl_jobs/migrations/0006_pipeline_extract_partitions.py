@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0005_pipeline_sync_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='extract_partitions',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Number of key ranges of the source collection read concurrently'),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='partition_key',
+            field=models.CharField(blank=True, help_text='Field the source collection is partitioned on (defaults to _id)', max_length=255, null=True),
+        ),
+    ]
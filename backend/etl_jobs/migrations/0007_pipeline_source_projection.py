@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0006_pipeline_extract_partitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='source_projection',
+            field=models.JSONField(blank=True, help_text='Fields to read from the source, e.g. {"name": 1, "email": 1} or {"notes": 0}', null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0007_pipeline_source_projection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='masking_cache_hits',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='masking_cache_misses',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='masking_cache_size',
+            field=models.PositiveIntegerField(default=100000, help_text='Masked values memoized per rule during a run (0 disables the cache)'),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='masking_config',
+            field=models.JSONField(blank=True, default=dict, help_text='Masking rules by dotted field path, e.g. {"email": "email", "address.geo.lat": "stars"}; rules: hash, email, phone, year_only, stars'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0008_masking_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='native_transfer',
+            field=models.BooleanField(default=False, help_text="MongoDB to MongoDB only: copy raw BSON directly, keeping native types and skipping dlt's file staging"),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0009_pipeline_native_transfer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='bytes_extracted',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='bytes_normalized',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='extract_rows_per_second',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Rows extracted per second of extraction', max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='files_extracted',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='files_loaded',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='rows_normalized',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='rows_per_second',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Rows written per second of the run', max_digits=20, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0010_jobexecution_run_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='profile',
+            field=models.TextField(blank=True, help_text='cProfile report of the run, if profiling was enabled', null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='stage_timings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='profile_runs',
+            field=models.BooleanField(default=False, help_text="Record a cProfile of each run's worker thread on its execution (adds overhead)"),
+        ),
+    ]
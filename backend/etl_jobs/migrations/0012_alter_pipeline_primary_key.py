@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0011_stage_timings_profile'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pipeline',
+            name='primary_key',
+            field=models.CharField(blank=True, help_text='Field(s) identifying a document for merge/upsert, comma separated (defaults to _id)', max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0012_alter_pipeline_primary_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pipeline',
+            name='incremental_strategy',
+            field=models.CharField(blank=True, choices=[('append', 'Append'), ('merge', 'Merge'), ('replace', 'Replace'), ('upsert', 'Upsert')], help_text='How documents are written; defaults to replace for full loads and append for incremental loads', max_length=50, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0013_alter_pipeline_incremental_strategy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='rows_deleted',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='stream_flush_seconds',
+            field=models.PositiveIntegerField(default=5, help_text='Streaming loads: longest wait before a partial batch of changes is written'),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='load_type',
+            field=models.CharField(choices=[('full', 'Full Load'), ('incremental', 'Incremental'), ('streaming', 'Streaming (change stream)')], default='full', max_length=50),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0014_streaming_load_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='checkpoint_size',
+            field=models.PositiveIntegerField(default=0, help_text='Full loads: documents loaded per run, resuming from a checkpoint of the last _id per partition on the next run (0 loads the whole collection in one run)'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0015_pipeline_checkpoint_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='destination_type',
+            field=models.CharField(choices=[('mongodb', 'MongoDB'), ('postgresql', 'PostgreSQL')], default='mongodb', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='destination_database',
+            field=models.CharField(blank=True, help_text='Database (MongoDB) or schema (PostgreSQL, defaults to public)', max_length=255, null=True),
+        ),
+    ]
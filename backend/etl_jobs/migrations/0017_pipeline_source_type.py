@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0016_pipeline_destination_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='source_type',
+            field=models.CharField(choices=[('mongodb', 'MongoDB'), ('postgresql', 'PostgreSQL')], default='mongodb', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='partition_key',
+            field=models.CharField(blank=True, help_text="Field the source is partitioned on (defaults to _id, or a table's primary key)", max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='source_database',
+            field=models.CharField(blank=True, help_text='Database (MongoDB) or schema (PostgreSQL, defaults to public)', max_length=255, null=True),
+        ),
+    ]
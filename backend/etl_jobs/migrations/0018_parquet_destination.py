@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0017_pipeline_source_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='file_max_mb',
+            field=models.PositiveIntegerField(default=128, help_text='Parquet files: size at which a file is closed and the next one started'),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='file_partition_field',
+            field=models.CharField(blank=True, help_text='Parquet files: field partitioning the files into directories (timestamps by date), e.g. created_at', max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='destination_type',
+            field=models.CharField(choices=[('mongodb', 'MongoDB'), ('postgresql', 'PostgreSQL'), ('s3', 'Parquet files (local path, S3 or MinIO)')], default='mongodb', max_length=50),
+        ),
+    ]
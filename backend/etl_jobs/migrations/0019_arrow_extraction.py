@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0018_parquet_destination'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='arrow_extraction',
+            field=models.BooleanField(default=False, help_text='MongoDB sources: decode documents straight into Arrow tables with PyMongoArrow (no masking or checkpoints)'),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='arrow_schema',
+            field=models.JSONField(blank=True, help_text='Arrow extraction: column types, e.g. {"_id": "objectid", "total": "double", "created_at": "timestamp"}; only these fields are read. Inferred per batch if empty', null=True),
+        ),
+    ]
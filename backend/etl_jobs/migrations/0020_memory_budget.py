@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0019_arrow_extraction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='peak_rss_bytes',
+            field=models.BigIntegerField(blank=True, help_text='Peak resident memory of the worker during the run', null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='rss_growth_bytes',
+            field=models.BigIntegerField(blank=True, help_text='How far resident memory rose above its level at the start of the run', null=True),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='memory_budget_mb',
+            field=models.PositiveIntegerField(default=0, help_text="MongoDB sources: memory a run's documents may take in the worker; chunks are sized by bytes, read ahead through a bounded queue and written to disk as they arrive (0 disables)"),
+        ),
+    ]
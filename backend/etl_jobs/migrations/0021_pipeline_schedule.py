@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0020_memory_budget'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pipeline',
+            name='frequency',
+            field=models.CharField(blank=True, help_text="Cron expression (e.g., '0 2 * * *'), run by celery beat in UTC", max_length=255, null=True),
+        ),
+    ]
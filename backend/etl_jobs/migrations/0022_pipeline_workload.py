@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0021_pipeline_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='workload',
+            field=models.CharField(choices=[('auto', 'Auto (by the size of the last run)'), ('light', 'Light'), ('heavy', 'Heavy')], default='auto', help_text='Worker queue runs go to; auto sends streaming loads, and pipelines whose last run extracted more than HEAVY_PIPELINE_MB, to the heavy queue', max_length=20),
+        ),
+    ]
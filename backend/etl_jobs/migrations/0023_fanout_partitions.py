@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0022_pipeline_workload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='fanout_partitions',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Full loads of MongoDB sources: key ranges loaded by separate tasks across the workers, merged into one execution (0 or 1 runs the load in one task)'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0023_fanout_partitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='table_metrics',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='pipeline',
+            name='collection_workers',
+            field=models.PositiveSmallIntegerField(default=4, help_text='Several source collections: collections extracted at once'),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='destination_table',
+            field=models.CharField(help_text="With several source collections, a name with '*' standing for each collection (e.g. 'raw_*')", max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='source_table',
+            field=models.CharField(help_text="Collection or table; MongoDB sources also take several collections, comma separated, and glob patterns (e.g. 'orders_*, people')", max_length=255),
+        ),
+    ]
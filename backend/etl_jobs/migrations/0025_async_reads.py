@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0024_multi_collection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='async_reads',
+            field=models.BooleanField(default=False, help_text="MongoDB sources: read with PyMongo's asyncio client, keeping the getMores of every partition in flight at once and reading ahead of dlt (for sources behind high-latency links)"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0025_async_reads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pipeline',
+            name='incremental_strategy',
+            field=models.CharField(blank=True, choices=[('append', 'Append'), ('merge', 'Merge'), ('replace', 'Replace'), ('upsert', 'Upsert')], help_text='How documents are written (defaults to append); replace swaps the target for the loaded documents', max_length=50, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etl_jobs', '0026_incremental_strategy_default_append'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobexecution',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('success', 'Success'), ('failed', 'Failed'), ('cancelled', 'Cancelled'), ('resync_required', 'Re-sync required')], default='pending', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='pipeline',
+            name='workload',
+            field=models.CharField(choices=[('auto', 'Auto (by the size of the last run)'), ('light', 'Light'), ('heavy', 'Heavy')], default='auto', help_text='Worker queue runs go to (streaming loads always use the streaming queue); auto sends pipelines whose last run extracted more than HEAVY_PIPELINE_MB to the heavy queue', max_length=20),
+        ),
+    ]
@@ -1,6 +1,52 @@
+import json
+import logging
+from datetime import date, timezone
+from decimal import Decimal
+
+from bson import json_util
+from bson.binary import UuidRepresentation
+from bson.json_util import JSONOptions
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
 
+from .dlt_config.masking import Masker, pipeline_salt
+from .dlt_config.mongodb.arrow import ARROW_TYPE_NAMES
+from .dlt_config.mongodb.projection import dropped_fields
+from .dlt_config.mongodb.source import check_read_options
+from .schedules import parse_cron
+
+logger = logging.getLogger(__name__)
+
+# Extended JSON keeps datetimes, ObjectIds and UUIDs round-trippable in a JSONField
+SYNC_STATE_JSON_OPTIONS = JSONOptions(
+    tz_aware=True, tzinfo=timezone.utc, uuid_representation=UuidRepresentation.STANDARD
+)
+# PostgreSQL numeric and date values, which Extended JSON has no type for
+DECIMAL_TAG = "$etlDecimal"
+DATE_TAG = "$etlDate"
+
+
+def _encode_state_value(value):
+    if isinstance(value, Decimal):
+        return {DECIMAL_TAG: str(value)}
+    if isinstance(value, date):
+        return {DATE_TAG: value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} can't be stored in sync_state")
+
+
+def _decode_state_values(value):
+    if isinstance(value, list):
+        return [_decode_state_values(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1 and DECIMAL_TAG in value:
+        return Decimal(value[DECIMAL_TAG])
+    if len(value) == 1 and DATE_TAG in value:
+        return date.fromisoformat(value[DATE_TAG])
+    return {name: _decode_state_values(item) for name, item in value.items()}
+
 
 class Pipeline(models.Model):
     """ETL Pipeline configuration."""
@@ -8,6 +54,18 @@ class Pipeline(models.Model):
     LOAD_TYPE_CHOICES = (
         ("full", "Full Load"),
         ("incremental", "Incremental"),
+        ("streaming", "Streaming (change stream)"),
+    )
+
+    SOURCE_TYPE_CHOICES = (
+        ("mongodb", "MongoDB"),
+        ("postgresql", "PostgreSQL"),
+    )
+
+    DESTINATION_TYPE_CHOICES = (
+        ("mongodb", "MongoDB"),
+        ("postgresql", "PostgreSQL"),
+        ("s3", "Parquet files (local path, S3 or MinIO)"),
     )
 
     INCREMENTAL_STRATEGY_CHOICES = (
@@ -17,38 +75,163 @@ class Pipeline(models.Model):
         ("upsert", "Upsert"),
     )
 
+    WORKLOAD_CHOICES = (
+        ("auto", "Auto (by the size of the last run)"),
+        ("light", "Light"),
+        ("heavy", "Heavy"),
+    )
+
     name = models.CharField(max_length=255, unique=True)
     description = models.TextField(blank=True, null=True)
 
     # Source Configuration
+    source_type = models.CharField(max_length=50, choices=SOURCE_TYPE_CHOICES, default="mongodb")
     source_uri = models.TextField()
-    source_database = models.CharField(max_length=255, blank=True, null=True)
-    source_table = models.CharField(max_length=255)
+    source_database = models.CharField(
+        max_length=255, blank=True, null=True, help_text="Database (MongoDB) or schema (PostgreSQL, defaults to public)"
+    )
+    source_table = models.CharField(
+        max_length=255,
+        help_text="Collection or table; MongoDB sources also take several collections, comma separated, "
+        "and glob patterns (e.g. 'orders_*, people')",
+    )
     source_aggregation_query = ArrayField(
         base_field=models.JSONField(),
         blank=True,
         null=True,
         help_text="Aggregation pipeline as a list of MongoDB aggregation stages",
     )
+    source_projection = models.JSONField(
+        blank=True,
+        null=True,
+        help_text="Fields to read from the source, e.g. {\"name\": 1, \"email\": 1} or {\"notes\": 0}",
+    )
+    arrow_extraction = models.BooleanField(
+        default=False,
+        help_text="MongoDB sources: decode documents straight into Arrow tables with PyMongoArrow "
+        "(no masking or checkpoints)",
+    )
+    arrow_schema = models.JSONField(
+        blank=True,
+        null=True,
+        help_text="Arrow extraction: column types, e.g. {\"_id\": \"objectid\", \"total\": \"double\", "
+        "\"created_at\": \"timestamp\"}; only these fields are read. Inferred per batch if empty",
+    )
 
     # Destination Configuration
+    destination_type = models.CharField(max_length=50, choices=DESTINATION_TYPE_CHOICES, default="mongodb")
     destination_uri = models.TextField()
-    destination_database= models.CharField(max_length=255, blank=True, null=True)
-    destination_table = models.CharField(max_length=255)
+    destination_database= models.CharField(
+        max_length=255, blank=True, null=True, help_text="Database (MongoDB) or schema (PostgreSQL, defaults to public)"
+    )
+    file_partition_field = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Parquet files: field partitioning the files into directories (timestamps by date), e.g. created_at",
+    )
+    file_max_mb = models.PositiveIntegerField(
+        default=128, help_text="Parquet files: size at which a file is closed and the next one started"
+    )
+    destination_table = models.CharField(
+        max_length=255,
+        help_text="With several source collections, a name with '*' standing for each collection (e.g. 'raw_*')",
+    )
 
     # Load Configuration
     load_type = models.CharField(
         max_length=50, choices=LOAD_TYPE_CHOICES, default="full"
     )
     incremental_strategy = models.CharField(
-        max_length=50, choices=INCREMENTAL_STRATEGY_CHOICES, blank=True, null=True
+        max_length=50,
+        choices=INCREMENTAL_STRATEGY_CHOICES,
+        blank=True,
+        null=True,
+        help_text="How documents are written (defaults to append); replace swaps the target for the loaded documents",
     )
     incremental_key = models.CharField(max_length=255, blank=True, null=True)
-    primary_key = models.CharField(max_length=255, blank=True, null=True)
+    primary_key = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Field(s) identifying a document for merge/upsert, comma separated (defaults to _id)",
+    )
+
+    # Destination Write Configuration
+    batch_size = models.PositiveIntegerField(
+        default=1000, help_text="Documents per bulk write to the destination"
+    )
+    write_concurrency = models.PositiveSmallIntegerField(
+        default=1, help_text="Number of bulk writes kept in flight at once"
+    )
+
+    native_transfer = models.BooleanField(
+        default=False,
+        help_text="MongoDB to MongoDB only: copy raw BSON directly, keeping native types and "
+        "skipping dlt's file staging",
+    )
+
+    checkpoint_size = models.PositiveIntegerField(
+        default=0,
+        help_text="Full loads: documents loaded per run, resuming from a checkpoint of the last _id per "
+        "partition on the next run (0 loads the whole collection in one run)",
+    )
+
+    async_reads = models.BooleanField(
+        default=False,
+        help_text="MongoDB sources: read with PyMongo's asyncio client, keeping the getMores of every partition "
+        "in flight at once and reading ahead of dlt (for sources behind high-latency links)",
+    )
+
+    memory_budget_mb = models.PositiveIntegerField(
+        default=0,
+        help_text="MongoDB sources: memory a run's documents may take in the worker; chunks are sized by "
+        "bytes, read ahead through a bounded queue and written to disk as they arrive (0 disables)",
+    )
+
+    stream_flush_seconds = models.PositiveIntegerField(
+        default=5, help_text="Streaming loads: longest wait before a partial batch of changes is written"
+    )
+
+    # Source Read Configuration
+    extract_partitions = models.PositiveSmallIntegerField(
+        default=1, help_text="Number of key ranges of the source collection read concurrently"
+    )
+    partition_key = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Field the source is partitioned on (defaults to _id, or a table's primary key)",
+    )
+    collection_workers = models.PositiveSmallIntegerField(
+        default=4, help_text="Several source collections: collections extracted at once"
+    )
+    fanout_partitions = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Full loads of MongoDB sources: key ranges loaded by separate tasks across the workers, "
+        "merged into one execution (0 or 1 runs the load in one task)",
+    )
+
+    # Sync state persisted between runs (e.g. incremental high-water mark)
+    sync_state = models.JSONField(
+        default=dict, blank=True, help_text="State persisted between runs, stored as MongoDB Extended JSON"
+    )
 
     # Masking (stored as JSON)
     masking_config = models.JSONField(
-        default=dict, blank=True, help_text="Masking rules as key-value pairs"
+        default=dict,
+        blank=True,
+        help_text="Masking rules by dotted field path, e.g. {\"email\": \"email\", \"address.geo.lat\": \"stars\"}; "
+        "rules: hash, email, phone, year_only, stars",
+    )
+    masking_cache_size = models.PositiveIntegerField(
+        default=100_000, help_text="Masked values memoized per rule during a run (0 disables the cache)"
+    )
+
+    # Diagnostics
+    profile_runs = models.BooleanField(
+        default=False,
+        help_text="Record a cProfile of each run's worker thread on its execution (adds overhead)",
     )
 
     # Scheduling
@@ -56,9 +239,16 @@ class Pipeline(models.Model):
         max_length=255,
         blank=True,
         null=True,
-        help_text="Cron expression (e.g., '0 2 * * *')",
+        help_text="Cron expression (e.g., '0 2 * * *'), run by celery beat in UTC",
     )
     is_enabled = models.BooleanField(default=True)
+    workload = models.CharField(
+        max_length=20,
+        choices=WORKLOAD_CHOICES,
+        default="auto",
+        help_text="Worker queue runs go to (streaming loads always use the streaming queue); auto sends "
+        "pipelines whose last run extracted more than HEAVY_PIPELINE_MB to the heavy queue",
+    )
 
     # Metadata
     is_active = models.BooleanField(default=True)
@@ -71,8 +261,103 @@ class Pipeline(models.Model):
     def __str__(self):
         return f"{self.name}"
 
+    def clean(self):
+        try:
+            Masker(self.masking_config or {}, salt=self.get_masking_salt())
+        except ValueError as e:
+            raise ValidationError({"masking_config": str(e)})
+        if self.frequency:
+            try:
+                parse_cron(self.frequency)
+            except ValueError as e:
+                raise ValidationError({"frequency": str(e)})
+        if self.load_type == "streaming" and (self.source_type, self.destination_type) != ("mongodb", "mongodb"):
+            raise ValidationError({"load_type": "Streaming loads replicate MongoDB collections into MongoDB only"})
+        if self.source_type == "postgresql" and (self.source_aggregation_query or self.source_projection):
+            raise ValidationError("Aggregation queries and projections apply to MongoDB sources only")
+        if self.source_type == "postgresql" and self.checkpoint_size:
+            raise ValidationError({"checkpoint_size": "Checkpointed loads read MongoDB sources only"})
+        if self.source_type == "postgresql" and self.memory_budget_mb:
+            raise ValidationError({"memory_budget_mb": "Memory budgets apply to MongoDB sources only"})
+        if self.arrow_extraction or self.arrow_schema:
+            self._clean_arrow_extraction()
+        if self.fanout_partitions > 1:
+            self._clean_fanout()
+        if self.is_multi_collection:
+            self._clean_collections()
+        if self.async_reads:
+            self._clean_async_reads()
+        if self.source_type == "mongodb":
+            self._clean_read_options()
+        if self.destination_type == "s3" and self.get_write_disposition() not in ("append", "replace"):
+            raise ValidationError({"incremental_strategy": "Parquet files are appended or replaced"})
+
+    def _clean_read_options(self):
+        """The combination of read options, as CollectionLoader checks it"""
+        try:
+            check_read_options(
+                checkpoint=bool(self.checkpoint_size),
+                aggregation_pipeline=bool(self.source_aggregation_query),
+                arrow=bool(self.arrow_extraction or self.arrow_schema),
+                masking=bool(self.masking_config),
+                memory_budget=bool(self.memory_budget_mb),
+                async_reads=self.async_reads,
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def _clean_arrow_extraction(self):
+        if self.source_type != "mongodb" or self.load_type == "streaming" or self.native_transfer:
+            raise ValidationError({"arrow_extraction": "Arrow extraction applies to dlt loads of MongoDB sources"})
+        if self.masking_config or self.checkpoint_size:
+            raise ValidationError({"arrow_extraction": "Arrow extraction can't be combined with masking or checkpoints"})
+        unknown = sorted(set((self.arrow_schema or {}).values()) - set(ARROW_TYPE_NAMES))
+        if unknown:
+            raise ValidationError({"arrow_schema": f"Unknown types {unknown}; use {', '.join(ARROW_TYPE_NAMES)}"})
+
+    def _clean_fanout(self):
+        if self.source_type != "mongodb" or self.load_type != "full" or self.checkpoint_size:
+            raise ValidationError(
+                {"fanout_partitions": "Fan-out applies to full loads of MongoDB sources without checkpoints"}
+            )
+        if self.get_write_disposition() == "replace":
+            # every partition would replace what the others loaded
+            raise ValidationError(
+                {"incremental_strategy": "Fanned-out loads append, merge or upsert; replace needs a single task"}
+            )
+
+    def _clean_collections(self):
+        if self.source_type != "mongodb":
+            raise ValidationError({"source_table": "Several collections can be loaded from MongoDB sources only"})
+        if self.load_type == "streaming" or self.checkpoint_size or self.fanout_partitions > 1 or self.native_transfer:
+            raise ValidationError(
+                {"source_table": "Several collections load through dlt, without streaming, checkpoints or fan-out"}
+            )
+        if "*" not in self.destination_table:
+            raise ValidationError(
+                {"destination_table": "With several collections, use '*' for each collection's name (e.g. 'raw_*')"}
+            )
+
+    def _clean_async_reads(self):
+        if self.source_type != "mongodb" or self.load_type == "streaming" or self.native_transfer:
+            raise ValidationError({"async_reads": "Async reads apply to dlt loads of MongoDB sources"})
+        if self.arrow_extraction or self.arrow_schema or self.memory_budget_mb:
+            raise ValidationError({"async_reads": "Async reads can't be combined with Arrow extraction or a memory budget"})
+
+    def get_source_collections(self):
+        """Collection names and glob patterns in source_table"""
+        return [name.strip() for name in self.source_table.split(",") if name.strip()]
+
+    @property
+    def is_multi_collection(self):
+        collections = self.get_source_collections()
+        return len(collections) > 1 or any(char in name for name in collections for char in "*?[")
+
     def get_source_config(self):
         """Build source configuration for this pipeline"""
+        if self.source_type == "postgresql":
+            return self._get_postgresql_source_config()
+
         config = {
             "type": "mongodb",
             "connection_url": self.source_uri,
@@ -80,22 +365,150 @@ class Pipeline(models.Model):
             "collection": self.source_table,
             "aggregation_pipeline": self.source_aggregation_query,
         }
+
+        if self.source_projection:
+            config["projection"] = self.source_projection
+            dropped = self.get_masked_fields_dropped_by_projection()
+            if dropped:
+                logger.warning(
+                    f"Pipeline {self.name}: source projection drops masked fields {dropped}"
+                )
         
         # Add incremental configuration if applicable
         if self.load_type == "incremental" and self.incremental_key:
             config["incremental_key"] = self.incremental_key
+            config["state"] = self.get_sync_state()
             if self.incremental_strategy:
                 config["incremental_strategy"] = self.incremental_strategy
+
+        if self.load_type == "full" and self.checkpoint_size:
+            config["state"] = self.get_sync_state()
+            config["checkpoint_size"] = self.checkpoint_size
+
+        if self.load_type == "streaming":
+            config["state"] = self.get_sync_state()
+            config["flush_seconds"] = self.stream_flush_seconds
+
+        if self.extract_partitions > 1:
+            config["partitions"] = self.extract_partitions
+            config["partition_key"] = self.partition_key or "_id"
+
+        if self.memory_budget_mb:
+            config["memory_budget"] = self.memory_budget_mb * 1024 * 1024
+
+        if self.arrow_extraction or self.arrow_schema:
+            config["arrow"] = True
+            config["arrow_schema"] = self.arrow_schema
+
+        if self.async_reads:
+            config["async_reads"] = True
+
+        if self.is_multi_collection:
+            del config["collection"]
+            config["collections"] = self.get_source_collections()
+            config["table_name_template"] = self.destination_table
+            config["collection_workers"] = self.collection_workers
         
         return config
+
+    def _get_postgresql_source_config(self):
+        config = {
+            "type": "postgresql",
+            "connection_url": self.source_uri,
+            "schema": self.source_database or "public",
+            "table": self.source_table,
+        }
+        if self.load_type == "incremental" and self.incremental_key:
+            config["incremental_key"] = self.incremental_key
+            config["state"] = self.get_sync_state()
+        if self.extract_partitions > 1:
+            config["partitions"] = self.extract_partitions
+            # defaults to the table's primary key
+            config["partition_key"] = self.partition_key
+        return config
+
+    def get_masking_salt(self):
+        """Salt of the pipeline's hash masking, derived from MASKING_SALT (empty when unset)"""
+        return pipeline_salt(settings.MASKING_SALT, self.pk)
+
+    def get_masked_fields_dropped_by_projection(self):
+        """Masked fields the source projection doesn't read"""
+        return dropped_fields(self.source_projection, (self.masking_config or {}).keys())
+
+    def get_sync_state(self):
+        """Decode the persisted sync state into native (BSON) Python values"""
+        state = json_util.loads(json.dumps(self.sync_state or {}), json_options=SYNC_STATE_JSON_OPTIONS)
+        return _decode_state_values(state)
+
+    def save_sync_state(self, state):
+        """Encode and persist the sync state"""
+        self.sync_state = json.loads(
+            json_util.dumps(state, json_options=SYNC_STATE_JSON_OPTIONS, default=_encode_state_value)
+        )
+        self.save(update_fields=["sync_state", "updated_at"])
     
+    def get_queue(self):
+        """Celery queue this pipeline's runs go to"""
+        if self.load_type == "streaming":
+            # a session holds a worker for its whole length, so streams get
+            # workers of their own instead of starving the heavy queue
+            return "streaming"
+        if self.workload != "auto":
+            return self.workload
+        last_bytes = (
+            self.executions.filter(status="success")
+            .order_by("-created_at")
+            .values_list("bytes_extracted", flat=True)
+            .first()
+        )
+        return "heavy" if (last_bytes or 0) > settings.HEAVY_PIPELINE_MB * 1024 * 1024 else "light"
+
+    def get_write_disposition(self):
+        """How loaded documents are written: the strategy if set, else append"""
+        return self.incremental_strategy or "append"
+
+    def get_primary_key(self):
+        """Primary key fields (comma separated in primary_key), defaulting to _id"""
+        fields = [field.strip() for field in (self.primary_key or "").split(",") if field.strip()]
+        return fields or ["_id"]
+
     def get_destination_config(self):
         """Build destination configuration for this pipeline"""
+        # several collections load into tables named by the source
+        table = None if self.is_multi_collection else self.destination_table
+        if self.destination_type == "s3":
+            config = {
+                "type": "s3",
+                # a local directory, or s3://bucket/prefix
+                "bucket_url": self.destination_uri,
+                "table": table,
+                "partition_field": self.file_partition_field,
+                "max_file_bytes": self.file_max_mb * 1024 * 1024,
+                "write_disposition": self.get_write_disposition(),
+            }
+            if settings.S3_ENDPOINT_URL:
+                # MinIO or another S3 stand-in
+                config["storage_options"] = {"client_kwargs": {"endpoint_url": settings.S3_ENDPOINT_URL}}
+            return config
+        if self.destination_type == "postgresql":
+            return {
+                "type": "postgresql",
+                "connection_url": self.destination_uri,
+                "schema": self.destination_database or "public",
+                "table": table,
+                "batch_size": self.batch_size,
+                "write_disposition": self.get_write_disposition(),
+                "primary_key": self.get_primary_key(),
+            }
         return {
             "type": "mongodb",
             "connection_url": self.destination_uri,
             "database": self.destination_database,
-            "collection": self.destination_table
+            "collection": table,
+            "batch_size": self.batch_size,
+            "write_concurrency": self.write_concurrency,
+            "write_disposition": self.get_write_disposition(),
+            "primary_key": self.get_primary_key(),
         }
 
 
@@ -108,6 +521,8 @@ class JobExecution(models.Model):
         ("success", "Success"),
         ("failed", "Failed"),
         ("cancelled", "Cancelled"),
+        # a streaming run that can't resume until a full load re-syncs the destination
+        ("resync_required", "Re-sync required"),
     )
 
     pipeline = models.ForeignKey(
@@ -127,6 +542,30 @@ class JobExecution(models.Model):
     rows_inserted = models.BigIntegerField(null=True, blank=True)
     rows_updated = models.BigIntegerField(null=True, blank=True)
     rows_failed = models.BigIntegerField(null=True, blank=True)
+    rows_deleted = models.BigIntegerField(null=True, blank=True)
+    rows_normalized = models.BigIntegerField(null=True, blank=True)
+    bytes_extracted = models.BigIntegerField(null=True, blank=True)
+    bytes_normalized = models.BigIntegerField(null=True, blank=True)
+    files_extracted = models.IntegerField(null=True, blank=True)
+    files_loaded = models.IntegerField(null=True, blank=True)
+    rows_per_second = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, blank=True, help_text="Rows written per second of the run"
+    )
+    extract_rows_per_second = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, blank=True, help_text="Rows extracted per second of extraction"
+    )
+    masking_cache_hits = models.BigIntegerField(null=True, blank=True)
+    masking_cache_misses = models.BigIntegerField(null=True, blank=True)
+    peak_rss_bytes = models.BigIntegerField(null=True, blank=True, help_text="Peak resident memory of the worker during the run")
+    rss_growth_bytes = models.BigIntegerField(
+        null=True, blank=True, help_text="How far resident memory rose above its level at the start of the run"
+    )
+    # Row and byte counts per destination table, e.g. {"people": {"rows_extracted": 10, ...}}
+    table_metrics = models.JSONField(default=dict, blank=True)
+
+    # Seconds and calls per stage, e.g. {"mongo_read": {"seconds": 1.2, "calls": 10}}
+    stage_timings = models.JSONField(default=dict, blank=True)
+    profile = models.TextField(blank=True, null=True, help_text="cProfile report of the run, if profiling was enabled")
 
     # Logs
     logs = models.TextField(blank=True, null=True)
@@ -152,7 +591,13 @@ class JobExecution(models.Model):
         self.execution_id = str(uuid.uuid4())
         self.save()
     
-    def complete_success(self, load_info):
+    @property
+    def masking_cache_hit_rate(self):
+        """Share of masked values served from the memo, or None if nothing was masked"""
+        lookups = (self.masking_cache_hits or 0) + (self.masking_cache_misses or 0)
+        return self.masking_cache_hits / lookups if lookups else None
+
+    def complete_success(self, load_info, write_result=None, masking_stats=None, metrics=None):
         """Mark execution as successfully completed"""
         from django.utils import timezone
         from decimal import Decimal
@@ -163,8 +608,37 @@ class JobExecution(models.Model):
     
     
         self.logs = f"Pipeline executed successfully. Load Info: {str(load_info)}"
+        if metrics is not None:
+            self._update_metrics(metrics)
+        if write_result is not None:
+            if metrics is None:
+                self.rows_inserted = write_result.inserted
+                self.rows_updated = write_result.updated
+                self.rows_failed = write_result.failed
+            self.logs += (
+                f"\nWrite results: {write_result.inserted} inserted, {write_result.updated} updated, "
+                f"{write_result.failed} failed, "
+                f"{write_result.write_errors} write errors, {write_result.retried} retried, "
+                f"{write_result.ambiguous} ambiguous duplicates"
+            )
+        if masking_stats is not None:
+            self.masking_cache_hits = masking_stats["hits"]
+            self.masking_cache_misses = masking_stats["misses"]
+            hit_rate = self.masking_cache_hit_rate
+            if hit_rate is not None:
+                self.logs += (
+                    f"\nMasking cache: {self.masking_cache_hits} hits, "
+                    f"{self.masking_cache_misses} misses ({hit_rate:.1%} hit rate)"
+                )
         self.save()
     
+    def require_resync(self, reason):
+        """Mark a completed streaming run whose pipeline must be re-synced by a full load"""
+        self.status = "resync_required"
+        self.error_message = reason
+        self.logs = f"{self.logs}\n{reason}" if self.logs else reason
+        self.save()
+
     def complete_failure(self, error_message):
         """Mark execution as failed"""
         from django.utils import timezone
@@ -176,6 +650,30 @@ class JobExecution(models.Model):
         self.logs = f"Pipeline execution failed with error: {error_message}"
         self.save()
     
+    def _update_metrics(self, metrics):
+        """Copy run counters and derive throughput"""
+        from decimal import Decimal
+
+        self.rows_processed = metrics.rows_extracted
+        self.rows_normalized = metrics.rows_normalized
+        self.rows_inserted = metrics.rows_written
+        self.rows_updated = metrics.rows_updated
+        self.rows_deleted = metrics.rows_deleted
+        self.rows_failed = metrics.rows_failed
+        self.bytes_extracted = metrics.bytes_extracted
+        self.bytes_normalized = metrics.bytes_normalized
+        self.files_extracted = metrics.files_extracted
+        self.files_loaded = metrics.files_loaded
+        self.table_metrics = metrics.tables
+
+        if metrics.rows_written is not None and self.duration_seconds:
+            written = metrics.rows_written + (metrics.rows_updated or 0)
+            self.rows_per_second = Decimal(str(round(written / float(self.duration_seconds), 2)))
+        if metrics.rows_extracted is not None and metrics.extract_seconds:
+            self.extract_rows_per_second = Decimal(
+                str(round(metrics.rows_extracted / metrics.extract_seconds, 2))
+            )
+
     def _update_duration(self):
         """Calculate and update duration"""
         from decimal import Decimal
@@ -0,0 +1,42 @@
+"""
+Queue routing for pipeline runs.
+
+Runs go to the "light" or "heavy" queue by their pipeline's workload (see
+Pipeline.get_queue), each served by its own worker pool, so a long full load
+of a large collection can't hold up small incremental runs or share a worker
+process's memory with them. Streaming sessions, which hold a worker for
+their whole length, go to the "streaming" queue; its worker concurrency
+caps how many streams run at once.
+
+Call sites that already hold the pipeline (requeues, the partitions of a
+fanned-out run) publish with an explicit queue. The router is the fallback
+for those that only have its id (beat, the admin), and looks the pipeline up.
+"""
+
+import logging
+
+from .schedules import RUN_PARTITION_TASK, RUN_PIPELINE_TASK
+
+logger = logging.getLogger(__name__)
+
+LIGHT_QUEUE = "light"
+HEAVY_QUEUE = "heavy"
+STREAMING_QUEUE = "streaming"
+
+
+def route_pipeline_task(name, args, kwargs, options, task=None, **kw):
+    """Celery router: the queue of a pipeline run's or partition's pipeline, None for other tasks"""
+    if name not in (RUN_PIPELINE_TASK, RUN_PARTITION_TASK) or options.get("queue"):
+        # other tasks, or published with their pipeline's queue already
+        return None
+    # imported here: the router is loaded with the celery app, before models
+    from .models import Pipeline
+
+    pipeline_id = args[0] if args else kwargs.get("pipeline_id")
+    try:
+        queue = Pipeline.objects.get(pk=pipeline_id).get_queue()
+    except Pipeline.DoesNotExist:
+        # the run reports the missing pipeline; any worker can do that
+        queue = LIGHT_QUEUE
+    logger.debug(f"Routing pipeline {pipeline_id} to the {queue} queue")
+    return {"queue": queue}
@@ -0,0 +1,80 @@
+"""
+Celery beat entries for pipeline schedules.
+
+Every pipeline with a frequency (a five-field cron expression) gets one
+django-celery-beat PeriodicTask running run_pipeline_task, kept in sync when
+the pipeline is saved or deleted. The entry is disabled while the pipeline
+is disabled or inactive, and removed when the frequency is cleared.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from celery.schedules import crontab
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RUN_PIPELINE_TASK = "etl_jobs.tasks.run_pipeline_task"
+RUN_PARTITION_TASK = "etl_jobs.tasks.run_partition_task"
+CRON_FIELDS = ("minute", "hour", "day_of_month", "month_of_year", "day_of_week")
+# fields a pipeline's beat entry depends on
+SCHEDULE_FIELDS = {"name", "frequency", "is_enabled", "is_active"}
+
+
+def periodic_task_name(pipeline_id: int) -> str:
+    return f"etl-pipeline-{pipeline_id}"
+
+
+def parse_cron(expression: str) -> Dict[str, str]:
+    """Crontab fields of a five-field cron expression; raises ValueError if it isn't valid"""
+    values = expression.split()
+    if len(values) != len(CRON_FIELDS):
+        raise ValueError(
+            f"'{expression}' is not a cron expression: expected {len(CRON_FIELDS)} fields "
+            "(minute hour day-of-month month day-of-week)"
+        )
+    fields = dict(zip(CRON_FIELDS, values))
+    # celery parses every field, so bad values surface here rather than in beat
+    crontab(**fields)
+    return fields
+
+
+def sync_pipeline_schedule(pipeline: Any) -> Optional[Any]:
+    """Create, update or remove the beat entry of a pipeline; returns the entry, if any"""
+    # imported here: models.py validates frequencies with parse_cron while apps load
+    from django_celery_beat.models import CrontabSchedule, PeriodicTask
+
+    name = periodic_task_name(pipeline.pk)
+    if not pipeline.frequency:
+        deleted, _ = PeriodicTask.objects.filter(name=name).delete()
+        if deleted:
+            logger.info(f"Removed the schedule of pipeline {pipeline.name}")
+        return None
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        **parse_cron(pipeline.frequency), timezone=settings.CELERY_TIMEZONE
+    )
+    task, created = PeriodicTask.objects.update_or_create(
+        name=name,
+        defaults={
+            "task": RUN_PIPELINE_TASK,
+            "crontab": schedule,
+            "interval": None,
+            "args": json.dumps([pipeline.pk]),
+            "enabled": pipeline.is_enabled and pipeline.is_active,
+            "description": f"Runs pipeline {pipeline.name}",
+        },
+    )
+    logger.info(
+        f"{'Scheduled' if created else 'Updated the schedule of'} pipeline {pipeline.name}: "
+        f"'{pipeline.frequency}'{'' if task.enabled else ' (disabled)'}"
+    )
+    return task
+
+
+def remove_pipeline_schedule(pipeline_id: int) -> None:
+    from django_celery_beat.models import PeriodicTask
+
+    PeriodicTask.objects.filter(name=periodic_task_name(pipeline_id)).delete()
@@ -1,10 +1,31 @@
+import cProfile
+import io
 import logging
+import pstats
+from django.conf import settings
 from django.utils import timezone
+from .dlt_config import Masker, StageTimings
+from .dlt_config.memory import MemoryMonitor
+from .dlt_config.mongodb.checkpoint import Checkpoint
+from .dlt_config.mongodb.client import pool_stats
+from .dlt_config.mongodb.stream import StreamInfo, stream_collection
+from .dlt_config.mongodb.writer import WriteResult
+from .fanout import (
+    MergedPartitions,
+    decode_range,
+    encode_range,
+    partition_report,
+    partition_source_config,
+    plan_partitions,
+)
+from .metrics import collect_run_metrics
 from .models import Pipeline, JobExecution
 from .pipeline import run_pipeline
 
 logger = logging.getLogger(__name__)
 
+PROFILE_REPORT_LINES = 60
+
 
 class PipelineExecutionService:
     """Service class for executing ETL pipelines"""
@@ -13,15 +34,25 @@ class PipelineExecutionService:
         self.pipeline_id = pipeline_id
         self.pipeline = None
         self.execution = None
+        self.write_result = WriteResult()
+        self.source_config = None
+        self.timings = StageTimings()
+        self.memory = MemoryMonitor()
+        self.profile = None
     
     def execute(self):
         """Execute the pipeline and return result"""
         try:
-            self._load_pipeline()
-            self._create_execution()
-            load_info = self._run_pipeline()
+            with self.timings.measure("load_pipeline"):
+                self._load_pipeline()
+            with self.timings.measure("create_execution"):
+                self._create_execution()
+            if self.pipeline.fanout_partitions > 1:
+                return self._plan_partitions()
+            with self.timings.measure("run_pipeline"), self.memory:
+                load_info = self._run_pipeline()
             self._handle_success(load_info)
-            return self._success_result()
+            return self._success_result(load_info)
             
         except Pipeline.DoesNotExist:
             return self._pipeline_not_found_result()
@@ -43,26 +74,135 @@ class PipelineExecutionService:
         self.execution.start_execution()
     
     def _run_pipeline(self):
-        """Execute the actual pipeline"""
+        """Execute the actual pipeline, profiled if the pipeline asks for it"""
+        if not self.pipeline.profile_runs:
+            return self._run()
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self._run)
+        finally:
+            self.profile = _format_profile(profiler)
+
+    def _plan_partitions(self):
+        """Split a fanned-out run into key ranges; the caller dispatches one task per range"""
+        with self.timings.measure("plan_partitions"):
+            range_filters = plan_partitions(
+                self.pipeline.get_source_config(),
+                self.pipeline.fanout_partitions,
+                key=self.pipeline.partition_key or "_id",
+            )
+        logger.info(f"Fanning pipeline {self.pipeline.name} out over {len(range_filters)} partitions")
+        self.execution.stage_timings = self.timings.as_dict()
+        self.execution.save(update_fields=["stage_timings"])
+        return {
+            "status": "partitioned",
+            "execution_id": self.execution.execution_id,
+            "execution_pk": self.execution.pk,
+            "ranges": [encode_range(range_filter) for range_filter in range_filters],
+        }
+
+    def _get_source_config(self):
+        return self.pipeline.get_source_config()
+
+    def _dlt_pipeline_name(self):
+        return self.pipeline.name
+
+    def _run(self):
+        self.source_config = self._get_source_config()
+        self.source_config["timings"] = self.timings
+        if self.pipeline.masking_config:
+            # compiled once per run; the salt stays out of the stored config
+            self.source_config["masker"] = Masker(
+                self.pipeline.masking_config,
+                salt=self.pipeline.get_masking_salt(),
+                cache_size=self.pipeline.masking_cache_size,
+            )
+        destination_config = {
+            **self.pipeline.get_destination_config(),
+            "write_result": self.write_result,
+            "timings": self.timings,
+        }
+        checkpoint = self._start_checkpoint()
+        if checkpoint is not None:
+            self.source_config["checkpoint"] = destination_config["checkpoint"] = checkpoint
+        if self.pipeline.load_type == "streaming":
+            return stream_collection(
+                self.source_config,
+                destination_config,
+                # the resume token is saved after every applied batch
+                on_flush=self.pipeline.save_sync_state,
+                run_seconds=settings.STREAM_RUN_SECONDS,
+            )
         return run_pipeline(
-            source_config=self.pipeline.get_source_config(),
-            destination_config=self.pipeline.get_destination_config(),
-            pipeline_name=self.pipeline.name,
-            dev_mode=False
+            source_config=self.source_config,
+            destination_config=destination_config,
+            pipeline_name=self._dlt_pipeline_name(),
+            dev_mode=False,
+            native=self.pipeline.native_transfer,
+            timings=self.timings,
         )
     
+    def _start_checkpoint(self):
+        """Checkpoint of a full load split over several runs, marked in progress"""
+        segment_size = self.source_config.get("checkpoint_size")
+        if not segment_size:
+            return None
+        checkpoint = Checkpoint(
+            self.source_config["state"], segment_size=segment_size, on_save=self.pipeline.save_sync_state
+        )
+        checkpoint.begin()
+        return checkpoint
+
     def _handle_success(self, load_info):
         """Handle successful execution"""
-        self.execution.complete_success(load_info)
+        masker = self.source_config.get("masker")
+        self._attach_diagnostics()
+        self.execution.complete_success(
+            load_info,
+            write_result=self.write_result,
+            masking_stats=masker.cache_stats() if masker else None,
+            metrics=collect_run_metrics(load_info, self.write_result),
+        )
+        if isinstance(load_info, StreamInfo) and load_info.history_lost:
+            self.execution.require_resync(
+                "The change stream's resume token is no longer in the source's oplog. "
+                "Run a full load to re-sync the destination, then restart streaming."
+            )
+        self._save_sync_state()
         duration = float(self.execution.duration_seconds or 0)
         logger.info(f"Pipeline {self.pipeline.name} completed successfully in {duration:.2f} seconds")
+        logger.info(f"MongoDB client pool stats: {pool_stats()}")
     
+    def _attach_diagnostics(self):
+        """Store stage timings, memory and the profile report on the execution"""
+        self.execution.stage_timings = self.timings.as_dict()
+        self.execution.profile = self.profile
+        self.execution.peak_rss_bytes = self.memory.peak_rss
+        self.execution.rss_growth_bytes = self.memory.growth
+        budget = self.pipeline.memory_budget_mb * 1024 * 1024
+        if budget and (self.memory.growth or 0) > budget:
+            logger.warning(
+                f"Pipeline {self.pipeline.name} grew resident memory by {self.memory.growth / 2**20:.0f} MB, "
+                f"over its {self.pipeline.memory_budget_mb} MB budget"
+            )
+
+    def _save_sync_state(self):
+        """Persist state advanced by the source (only after a successful load)"""
+        checkpoint = self.source_config.get("checkpoint")
+        if checkpoint is not None:
+            checkpoint.finish()
+        state = self.source_config.get("state")
+        if state is not None:
+            self.pipeline.save_sync_state(state)
+
     def _handle_failure(self, error):
         """Handle failed execution"""
         error_msg = f"Pipeline execution failed: {str(error)}"
         logger.error(error_msg, exc_info=True)
         
         if self.execution:
+            self._attach_diagnostics()
             self.execution.complete_failure(error_msg)
         
         return {
@@ -71,16 +211,102 @@ class PipelineExecutionService:
             "execution_id": self.execution.execution_id if self.execution else None
         }
     
-    def _success_result(self):
+    def _success_result(self, load_info=None):
         """Return success result"""
         return {
-            "status": "success",
+            "status": self.execution.status,
             "execution_id": self.execution.execution_id,
-            "duration_seconds": float(self.execution.duration_seconds or 0)
+            "duration_seconds": float(self.execution.duration_seconds or 0),
+            "requeue": self._should_requeue(load_info),
         }
+
+    def _should_requeue(self, load_info):
+        """A streaming session ended on its time limit, or a checkpointed load has more to read"""
+        if isinstance(load_info, StreamInfo):
+            return not (load_info.invalidated or load_info.history_lost)
+        checkpoint = self.source_config.get("checkpoint") if self.source_config else None
+        return checkpoint is not None and not checkpoint.complete
     
     def _pipeline_not_found_result(self):
         """Return pipeline not found result"""
         error_msg = f"Pipeline with ID {self.pipeline_id} not found or not active/enabled"
         logger.error(error_msg)
-        return {"status": "failed", "error": error_msg}
\ No newline at end of file
+        return {"status": "failed", "error": error_msg}
+
+
+class PartitionExecutionService(PipelineExecutionService):
+    """
+    Loads one key range of a fanned-out run and reports back to the chord
+    callback, which completes the run's execution
+    """
+
+    def __init__(self, pipeline_id, index, range_filter):
+        super().__init__(pipeline_id)
+        self.index = index
+        self.range_filter = decode_range(range_filter)
+
+    def execute(self):
+        try:
+            with self.timings.measure("load_pipeline"):
+                self._load_pipeline()
+            with self.timings.measure("run_pipeline"), self.memory:
+                load_info = self._run_pipeline()
+            return partition_report(
+                self.index,
+                collect_run_metrics(load_info, self.write_result),
+                self.write_result,
+                self.timings,
+                self.memory.peak_rss,
+                self.memory.growth,
+            )
+        except Exception as e:
+            logger.error(f"Partition {self.index} of pipeline {self.pipeline_id} failed: {e}", exc_info=True)
+            return {"index": self.index, "status": "failed", "error": str(e)}
+
+    def _get_source_config(self):
+        return partition_source_config(self.pipeline.get_source_config(), self.range_filter)
+
+    def _dlt_pipeline_name(self):
+        # partitions sharing a worker host keep separate dlt working directories
+        return f"{self.pipeline.name}__partition_{self.index}"
+
+
+def complete_partitioned_execution(execution_pk, reports):
+    """Merge the partition reports of a fanned-out run into its execution"""
+    execution = JobExecution.objects.select_related("pipeline").get(pk=execution_pk)
+    merged = MergedPartitions(reports)
+    timings = StageTimings()
+    for stage, totals in (execution.stage_timings or {}).items():
+        timings.add(stage, totals["seconds"], totals["calls"])
+    for stage, totals in merged.timings.as_dict().items():
+        timings.add(stage, totals["seconds"], totals["calls"])
+    execution.stage_timings = timings.as_dict()
+    execution.peak_rss_bytes = merged.peak_rss
+    execution.rss_growth_bytes = merged.rss_growth
+    if merged.error:
+        logger.error(f"Pipeline {execution.pipeline.name}: {merged.error}")
+        execution.complete_failure(merged.error)
+        return {"status": "failed", "error": merged.error, "execution_id": execution.execution_id}
+    execution.complete_success(merged, write_result=merged.write_result, metrics=merged.metrics)
+    duration = float(execution.duration_seconds or 0)
+    logger.info(f"Pipeline {execution.pipeline.name} completed {merged} in {duration:.2f} seconds")
+    return {"status": "success", "execution_id": execution.execution_id, "duration_seconds": duration}
+
+
+def fail_partitioned_execution(execution_pk, error):
+    """Fail the execution of a fanned-out run whose chord broke off, unless it was completed"""
+    execution = JobExecution.objects.select_related("pipeline").get(pk=execution_pk)
+    if execution.completed_at is not None:
+        return {"status": execution.status, "execution_id": execution.execution_id}
+    error_msg = f"Pipeline execution failed: {error}"
+    logger.error(f"Pipeline {execution.pipeline.name}: {error_msg}")
+    execution.complete_failure(error_msg)
+    return {"status": "failed", "error": error_msg, "execution_id": execution.execution_id}
+
+
+def _format_profile(profiler):
+    """Top functions by cumulative time, as text"""
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_LINES)
+    return stream.getvalue()
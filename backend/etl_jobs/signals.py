@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Pipeline
+from .schedules import SCHEDULE_FIELDS, remove_pipeline_schedule, sync_pipeline_schedule
+
+
+@receiver(post_save, sender=Pipeline)
+def sync_schedule_on_save(sender, instance, update_fields=None, **kwargs):
+    """Keep the pipeline's beat entry in step with its frequency and flags"""
+    if update_fields is not None and not SCHEDULE_FIELDS.intersection(update_fields):
+        # e.g. the sync state saved after every run
+        return
+    sync_pipeline_schedule(instance)
+
+
+@receiver(post_delete, sender=Pipeline)
+def remove_schedule_on_delete(sender, instance, **kwargs):
+    remove_pipeline_schedule(instance.pk)
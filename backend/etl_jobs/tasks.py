@@ -1,6 +1,15 @@
-from celery import shared_task
+from celery import chord, shared_task
+from celery.signals import worker_process_shutdown
+from django.conf import settings
 import logging
-from .services import PipelineExecutionService
+from .dlt_config.mongodb.client import close_clients
+from .locks import LOCK_GRACE_SECONDS, pipeline_lock, release_pipeline_lock
+from .services import (
+    PartitionExecutionService,
+    PipelineExecutionService,
+    complete_partitioned_execution,
+    fail_partitioned_execution,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +18,13 @@ logger = logging.getLogger(__name__)
 def run_pipeline_task(pipeline_id):
     """
     Execute an ETL pipeline by Pipeline ID.
-    
+
+    Runs of one pipeline never overlap: a run started while another holds
+    the pipeline's lock is skipped. A pipeline with fanout_partitions is
+    split into key ranges here and loaded by a chord of run_partition_task,
+    which keeps the lock until finish_partitioned_run_task (or, if the chord
+    breaks off, fail_partitioned_run_task).
+
     Args:
         pipeline_id: The ID of the Pipeline model to execute
         
@@ -18,8 +33,77 @@ def run_pipeline_task(pipeline_id):
     """
     logger.info(f"Starting run_pipeline_task with pipeline_id: {pipeline_id}")
     
-    service = PipelineExecutionService(pipeline_id)
-    return service.execute()
+    with pipeline_lock(pipeline_id) as run_lock:
+        if not run_lock:
+            logger.info(f"Pipeline {pipeline_id} is already running; skipping this run")
+            return {"status": "skipped", "error": "Pipeline is already running"}
+        service = PipelineExecutionService(pipeline_id)
+        result = service.execute()
+        if result["status"] == "partitioned":
+            return _dispatch_partitions(service, result, run_lock)
+    # requeued once the lock is released, so the next run can take it
+    if result.get("requeue"):
+        # resumes from the resume token or checkpoint saved by this run
+        run_pipeline_task.apply_async((pipeline_id,), queue=service.pipeline.get_queue())
+    return result
+
+
+def _dispatch_partitions(service, plan, run_lock):
+    """Start the chord loading a fanned-out run, handing it the run lock"""
+    pipeline_id = service.pipeline_id
+    queue = service.pipeline.get_queue()
+    ranges = plan["ranges"]
+    # long enough for partitions that end up running one after another
+    token = run_lock.hand_off(settings.CELERY_TASK_TIME_LIMIT * len(ranges) + LOCK_GRACE_SECONDS)
+    try:
+        callback = finish_partitioned_run_task.s(pipeline_id, plan["execution_pk"], token)
+        # a partition task that dies (time limit, lost worker) or a failing callback
+        callback.link_error(fail_partitioned_run_task.s(pipeline_id, plan["execution_pk"], token))
+        chord(
+            [
+                run_partition_task.s(pipeline_id, index, range_filter).set(queue=queue)
+                for index, range_filter in enumerate(ranges)
+            ]
+        )(callback)
+    except Exception as e:
+        run_lock.take_back()
+        error_msg = f"Could not dispatch partitions: {e}"
+        logger.error(f"Pipeline {pipeline_id}: {error_msg}", exc_info=True)
+        service.execution.complete_failure(error_msg)
+        return {"status": "failed", "error": error_msg, "execution_id": plan["execution_id"]}
+    logger.info(f"Dispatched {len(ranges)} partitions of pipeline {pipeline_id}")
+    return {"status": "dispatched", "execution_id": plan["execution_id"], "partitions": len(ranges)}
+
+
+@shared_task
+def run_partition_task(pipeline_id, index, range_filter):
+    """Load one key range (Extended JSON) of a fanned-out pipeline run"""
+    logger.info(f"Starting partition {index} of pipeline {pipeline_id}")
+    return PartitionExecutionService(pipeline_id, index, range_filter).execute()
+
+
+@shared_task
+def finish_partitioned_run_task(reports, pipeline_id, execution_pk, lock_token):
+    """Chord callback: complete the run's execution and release the pipeline's lock"""
+    try:
+        return complete_partitioned_execution(execution_pk, reports)
+    finally:
+        release_pipeline_lock(pipeline_id, lock_token)
+
+
+@shared_task
+def fail_partitioned_run_task(request, exc, traceback, pipeline_id, execution_pk, lock_token):
+    """Chord errback: fail the run's execution and release the pipeline's lock"""
+    try:
+        return fail_partitioned_execution(execution_pk, exc)
+    finally:
+        release_pipeline_lock(pipeline_id, lock_token)
+
+
+@worker_process_shutdown.connect
+def close_mongo_clients(**kwargs):
+    """Close pooled MongoDB clients when a worker process exits"""
+    close_clients()
 
 
 @shared_task
@@ -0,0 +1,587 @@
+"""Stubs and helpers shared by the test modules"""
+
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from unittest import mock
+
+from bson import encode, json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from ..dlt_config.mongodb.native import copy_collection
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class StubCollection:
+    """Collection stub for insert_many: unique _id, scripted failures"""
+
+    name = "stub"
+
+    def __init__(self, existing=(), failures=None, reconnects=0):
+        self.docs = {doc_id: {"_id": doc_id} for doc_id in existing}
+        # _id -> number of times the document fails with a retryable error
+        self.failures = dict(failures or {})
+        self.reconnects = reconnects
+        self.calls = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def insert_many(self, documents, ordered=True):
+        with self._lock:
+            self.calls.append((len(documents), ordered))
+            self.threads.add(threading.current_thread().name)
+            errors = []
+            inserted = []
+            for index, doc in enumerate(documents):
+                if self.failures.get(doc["_id"], 0) > 0:
+                    self.failures[doc["_id"]] -= 1
+                    errors.append({"index": index, "code": 91})
+                elif doc["_id"] in self.docs:
+                    errors.append({"index": index, "code": 11000})
+                else:
+                    self.docs[doc["_id"]] = doc
+                    inserted.append(doc["_id"])
+            if self.reconnects:
+                self.reconnects -= 1
+                raise AutoReconnect("connection reset")
+            if errors:
+                raise BulkWriteError({"nInserted": len(inserted), "writeErrors": errors})
+            return mock.Mock(inserted_ids=inserted)
+
+
+class UpsertCollection:
+    """Collection stub for bulk_write of ReplaceOne/UpdateOne keyed by one field"""
+
+    name = "stub"
+
+    def __init__(self, key, existing=(), races=0):
+        self.key = key
+        self.docs = {doc[key]: dict(doc) for doc in existing}
+        self.indexes = []
+        self.operations = []
+        # number of upserts failing with a duplicate key race
+        self.races = races
+
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+
+    def bulk_write(self, operations, ordered=True):
+        upserted = matched = 0
+        errors = []
+        for index, operation in enumerate(operations):
+            self.operations.append(operation)
+            doc = operation._doc
+            value = operation._filter[self.key]
+            if self.races:
+                self.races -= 1
+                errors.append({"index": index, "code": 11000})
+                continue
+            if value in self.docs:
+                matched += 1
+            else:
+                upserted += 1
+            if isinstance(operation, ReplaceOne):
+                self.docs[value] = dict(doc)
+            else:
+                target = self.docs.setdefault(value, {self.key: value, **doc.get("$setOnInsert", {})})
+                target.update(doc.get("$set", {}))
+        if errors:
+            raise BulkWriteError({"nUpserted": upserted, "nMatched": matched, "writeErrors": errors})
+        return mock.Mock(upserted_count=upserted, matched_count=matched)
+
+
+class StubDatabase(dict):
+    """Database stub creating StubCollections on access; renames replace the target"""
+
+    name = "analytics"
+
+    def __missing__(self, name):
+        collection = self[name] = StubCollection()
+        collection.name = name
+        collection.full_name = f"{self.name}.{name}"
+        collection.database = self
+        collection.indexes = {}
+        collection.index_information = lambda: {"_id_": {"key": [("_id", 1)], "v": 2}, **collection.indexes}
+        collection.create_index = lambda keys, name, **options: collection.indexes.update(
+            {name: {"key": keys, **options}}
+        )
+        collection.rename = lambda new_name, dropTarget=False: self.update({new_name: self.pop(name)})
+        collection.drop = lambda: self.pop(name, None)
+        return collection
+
+    def list_collection_names(self, filter=None):
+        return [name for name in self if filter is None or name == filter["name"]]
+
+    def create_collection(self, name):
+        return self[name]
+
+
+class StubChangeStream:
+    """Replays scripted change events; None stands for an empty await"""
+
+    def __init__(self, events):
+        self.events = list(events)
+        self.alive = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.alive = False
+
+    def try_next(self):
+        if not self.events:
+            self.alive = False
+            return None
+        event = self.events.pop(0)
+        if isinstance(event, Exception):
+            raise event
+        return event
+
+
+class StubWatchedCollection:
+    full_name = "university.people"
+
+    def __init__(self, events):
+        self.events = events
+        self.watch_calls = []
+
+    def watch(self, pipeline, **options):
+        self.watch_calls.append(options)
+        return StubChangeStream(self.events)
+
+
+class StubBulkCollection:
+    full_name = "analytics.people"
+
+    def __init__(self):
+        self.batches = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.batches.append(operations)
+        return mock.Mock(
+            upserted_count=sum(isinstance(op, ReplaceOne) for op in operations),
+            matched_count=0,
+            deleted_count=sum(isinstance(op, DeleteOne) for op in operations),
+        )
+
+
+def change(token, operation, _id, document=None):
+    event = {"_id": {"_data": token}, "operationType": operation, "documentKey": {"_id": _id}}
+    if document is not None:
+        event["fullDocument"] = document
+    return event
+
+
+class StubCursor:
+    def __init__(self, docs):
+        self.docs = iter(docs)
+        self.sort_spec = None
+
+    def sort(self, spec):
+        self.sort_spec = spec
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.docs)
+
+
+class StubSourceCollection:
+    name = "people"
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.find_query = None
+        self.find_projection = None
+        self.pipeline = None
+
+    def find(self, query, projection=None):
+        self.find_query = query
+        self.find_projection = projection
+        self.cursor = StubCursor([dict(doc) for doc in self.docs])
+        return self.cursor
+
+    def aggregate(self, pipeline):
+        self.pipeline = pipeline
+        return StubCursor([dict(doc) for doc in self.docs])
+
+    def index_information(self):
+        return {"_id_": {"key": [("_id", 1)]}, "updated_at_1": {"key": [("updated_at", 1)]}}
+
+
+class RawBatchCollection(StubSourceCollection):
+    """Serves find_raw_batches() in raw BSON batches of `batch_docs` documents"""
+
+    def __init__(self, docs, batch_docs=2):
+        super().__init__(docs)
+        self.batch_docs = batch_docs
+
+    def find_raw_batches(self, query, projection=None, batch_size=None):
+        self.find_query = query
+        self.find_projection = projection
+        batches = [
+            b"".join(encode(doc) for doc in self.docs[start : start + self.batch_docs])
+            for start in range(0, len(self.docs), self.batch_docs)
+        ]
+        self.cursor = StubCursor(batches)
+        return self.cursor
+
+
+class RawDocumentCollection(StubSourceCollection):
+    """Serves undecoded documents once asked for RawBSONDocument"""
+
+    codec_options = CodecOptions(tz_aware=True)
+
+    def __init__(self, docs, raw=False):
+        super().__init__(docs)
+        self.raw = raw
+
+    def with_options(self, codec_options):
+        return RawDocumentCollection(self.docs, raw=codec_options.document_class is RawBSONDocument)
+
+    def find(self, query, projection=None):
+        if not self.raw:
+            return super().find(query, projection)
+        return StubCursor([RawBSONDocument(encode(doc)) for doc in self.docs])
+
+
+class NativeSourceCollection(StubSourceCollection):
+    """Source collection that hands out RawBSONDocuments when asked to"""
+
+    full_name = "university.people"
+
+    def __init__(self, docs):
+        super().__init__(docs)
+        self.codec_options = CodecOptions()
+
+    def with_options(self, codec_options):
+        self.codec_options = codec_options
+        return self
+
+    def find(self, query, projection=None):
+        cursor = super().find(query, projection)
+        if self.codec_options.document_class is RawBSONDocument:
+            cursor = StubCursor([RawBSONDocument(encode(doc)) for doc in self.docs])
+        return cursor
+
+
+class CheckpointCollection:
+    """Source collection evaluating _id range filters, returning documents in _id order"""
+
+    name = "people"
+    full_name = "university.people"
+
+    def __init__(self, count):
+        self.docs = [{"_id": i, "name": f"person {i}"} for i in range(count)]
+        self.queries = []
+        self.cursors = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        cursor = StubCursor([dict(doc) for doc in self.docs if self._matches(doc, query)])
+        self.cursors.append(cursor)
+        return cursor
+
+    def _matches(self, doc, query):
+        operators = {"$gt": lambda a, b: a > b, "$gte": lambda a, b: a >= b, "$lt": lambda a, b: a < b}
+        for key, condition in query.items():
+            if key == "$and":
+                if not all(self._matches(doc, q) for q in condition):
+                    return False
+            elif not all(operators[op](doc[key], value) for op, value in condition.items()):
+                return False
+        return True
+
+
+class StubPostgresCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement):
+        self.connection.statements.append(statement)
+        if statement.startswith("INSERT"):
+            self.rowcount = self.connection.copied_rows
+
+    def copy_expert(self, statement, buffer):
+        data = buffer.read()
+        self.connection.statements.append(statement)
+        self.connection.copies.append(data)
+        self.connection.copied_rows += data.count("\n")
+
+    def fetchone(self):
+        return self.connection.merge_counts
+
+
+class StubPostgresConnection:
+    def __init__(self, merge_counts=(0, 0)):
+        self.statements = []
+        self.copies = []
+        self.copied_rows = 0
+        self.merge_counts = merge_counts
+        self.committed = self.rolled_back = self.closed = False
+
+    def cursor(self):
+        return StubPostgresCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+class StubTable:
+    """Rows of a PostgreSQL table, filtered by the comparisons of a generated query"""
+
+    def __init__(self, rows, primary_key=("id",), percentiles=None):
+        self.rows = rows
+        self.primary_key = list(primary_key)
+        self.percentiles = percentiles
+        self.queries = []
+        self.named_cursors = []
+        self.connections = []
+
+    def select(self, query, params):
+        self.queries.append((query, list(params)))
+        rows = self.rows
+        for (column, operator), value in zip(re.findall(r'"(\w+)" (>=|<) %s', query), params):
+            if isinstance(value, str) and any(isinstance(row[column], uuid.UUID) for row in rows):
+                # Postgres casts the untyped literal to the uuid column's type
+                value = uuid.UUID(value)
+            if operator == ">=":
+                rows = [row for row in rows if row[column] is not None and row[column] >= value]
+            else:
+                rows = [row for row in rows if row[column] is None or row[column] < value]
+        order = re.search(r'ORDER BY "(\w+)"', query)
+        if order:
+            rows = sorted(rows, key=lambda row: row[order.group(1)])
+        return [tuple(row.values()) for row in rows]
+
+
+class StubNamedCursor:
+    def __init__(self, table, name):
+        self.table = table
+        self.name = name
+        self.itersize = None
+        self.fetches = []
+        self.closed = False
+        self.description = [(column,) for column in table.rows[0]] if table.rows else []
+
+    def execute(self, query, params):
+        self.result = self.table.select(query, params)
+
+    def fetchmany(self, size):
+        rows, self.result = self.result[:size], self.result[size:]
+        self.fetches.append(len(rows))
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+class StubCatalogCursor:
+    def __init__(self, table):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        self.query = query
+        self.table.queries.append((query, list(params)))
+
+    def fetchall(self):
+        return [(column,) for column in self.table.primary_key]
+
+    def fetchone(self):
+        return (self.table.percentiles,)
+
+
+class StubSourceConnection:
+    def __init__(self, table):
+        self.table = table
+        self.readonly = False
+        self.rolled_back = self.closed = False
+        table.connections.append(self)
+
+    def set_session(self, readonly=False):
+        self.readonly = readonly
+
+    def cursor(self, name=None):
+        if name is None:
+            return StubCatalogCursor(self.table)
+        cursor = StubNamedCursor(self.table, name)
+        self.table.named_cursors.append(cursor)
+        return cursor
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+class NamedSourceCollection(StubSourceCollection):
+    def __init__(self, name, docs):
+        super().__init__(docs)
+        self.name = name
+        self.threads = set()
+
+    def find(self, query, projection=None):
+        self.threads.add(threading.current_thread().name)
+        return super().find(query, projection)
+
+
+class StubSourceDatabase(dict):
+    name = "shop"
+
+    def list_collection_names(self):
+        return list(self)
+
+
+class FakeAsyncCursor:
+    in_flight = 0
+    most_in_flight = 0
+
+    def __init__(self, docs, fail_after=None):
+        self.docs = [dict(doc) for doc in docs]
+        self.fail_after = fail_after
+        self.reads = 0
+        self.sort_spec = None
+        self.closed = False
+
+    def sort(self, spec):
+        self.sort_spec = spec
+        return self
+
+    async def to_list(self, length):
+        import asyncio
+
+        cls = type(self)
+        cls.in_flight += 1
+        cls.most_in_flight = max(cls.most_in_flight, cls.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            cls.in_flight -= 1
+        if self.fail_after is not None and self.reads >= self.fail_after:
+            raise AutoReconnect("connection reset")
+        self.reads += 1
+        docs, self.docs = self.docs[:length], self.docs[length:]
+        return docs
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.cursors = []
+
+    def find(self, query, projection=None):
+        self.find_args = (query, projection)
+        self.cursors.append(FakeAsyncCursor([doc for doc in self.docs if _in_range(doc, query)]))
+        return self.cursors[-1]
+
+    async def aggregate(self, pipeline):
+        self.pipeline = pipeline
+        self.cursors.append(FakeAsyncCursor(self.docs))
+        return self.cursors[-1]
+
+
+def _in_range(doc, query):
+    bounds = query.get("_id", {})
+    return bounds.get("$gte", doc["_id"]) <= doc["_id"] < bounds.get("$lt", doc["_id"] + 1)
+
+
+class FakeAsyncClient(dict):
+    closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class PartitionedCollection:
+    """Returns $bucketAuto buckets, and the documents of each range filter for find()"""
+
+    name = "people"
+
+    def __init__(self, buckets, docs_by_filter=None, failing_filter=None):
+        self.buckets = buckets
+        self.docs_by_filter = docs_by_filter or {}
+        self.failing_filter = failing_filter
+        self.aggregations = []
+
+    def aggregate(self, pipeline, **kwargs):
+        self.aggregations.append(pipeline)
+        return iter(self.buckets)
+
+    def find(self, query, projection=None):
+        key = json_util.dumps(query)
+        if key == self.failing_filter:
+            raise RuntimeError("cursor killed")
+        return StubCursor([dict(doc) for doc in self.docs_by_filter.get(key, [])])
+
+
+class StubRedisLock:
+    # lock name -> token
+    held = {}
+
+    def __init__(self, name, timeout=None):
+        self.name = name
+        self.timeout = timeout
+        self.local = mock.Mock(token=None)
+
+    def acquire(self, blocking=True, token=None):
+        if self.name in self.held:
+            return False
+        self.held[self.name] = self.local.token = token.encode()
+        return True
+
+    def extend(self, seconds, replace_ttl=False):
+        self.timeout = seconds
+
+    def release(self):
+        if self.held.get(self.name) != self.local.token:
+            raise RuntimeError("not owned")
+        del self.held[self.name]
+
+
+def copy_native(source, destination, **source_config):
+    """copy_collection from university.people into analytics.people_analytics, in batches of 2"""
+    clients = {
+        "mongodb://source": {"university": {"people": source}},
+        "mongodb://destination": {"analytics": {"people_analytics": destination}},
+    }
+    with mock.patch("etl_jobs.dlt_config.mongodb.native.get_client", side_effect=clients.get):
+        return copy_collection(
+            {"connection_url": "mongodb://source", "database": "university", "collection": "people", **source_config},
+            {
+                "connection_url": "mongodb://destination",
+                "database": "analytics",
+                "collection": "people_analytics",
+                "batch_size": 2,
+            },
+        )
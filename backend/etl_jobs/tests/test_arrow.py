@@ -0,0 +1,118 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+import dlt
+import pyarrow as pa
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ..dlt_config.masking import Masker
+from ..dlt_config.mongodb.arrow import InferredColumns
+from ..dlt_config.mongodb.source import CollectionLoader, IncrementalCursor
+from ..dlt_config.mongodb.writer import WriteResult
+from ..dlt_config.postgresql import destination as postgres_destination
+from ..models import Pipeline
+from ..pipeline import run_pipeline
+from .fixtures import RawBatchCollection, StubPostgresConnection, T0
+
+
+class ArrowExtractionTests(SimpleTestCase):
+    def _docs(self):
+        return [
+            {"_id": ObjectId(), "name": "Ann", "total": Decimal128("1.50"), "updated_at": T0, "address": {"city": "Almaty"}},
+            {"_id": ObjectId(), "name": "Bob", "total": Decimal128("2.00"), "updated_at": T0, "address": {"city": "Astana"}},
+            {"_id": ObjectId(), "name": "Cid", "total": None, "updated_at": T0 + timedelta(minutes=1), "address": None},
+        ]
+
+    def test_decodes_raw_batches_into_tables_dlt_understands(self):
+        docs = self._docs()
+        loader = CollectionLoader(None, RawBatchCollection(docs), query={}, arrow=True)
+
+        tables = list(loader.load_documents())
+
+        self.assertEqual([table.num_rows for table in tables], [2, 1])
+        self.assertEqual(tables[0].schema.field("_id").type, pa.string())
+        self.assertEqual(tables[0].schema.field("updated_at").type, pa.timestamp("ms", tz="UTC"))
+        self.assertEqual(
+            tables[0].to_pylist()[0],
+            {"_id": str(docs[0]["_id"]), "name": "Ann", "total": "1.50", "updated_at": T0, "address": {"city": "Almaty"}},
+        )
+
+    def test_declared_schema_sets_types_and_projection(self):
+        collection = RawBatchCollection(self._docs(), batch_docs=3)
+        loader = CollectionLoader(
+            None, collection, query={}, arrow_schema={"_id": "objectid", "total": "decimal128", "updated_at": "timestamp"}
+        )
+
+        (table,) = list(loader.load_documents())
+
+        self.assertEqual(collection.find_projection, {"_id": 1, "total": 1, "updated_at": 1})
+        self.assertEqual(table.column_names, ["_id", "total", "updated_at"])
+        self.assertEqual(table.column("total").to_pylist(), ["1.50", "2.00", None])
+
+    def test_inferred_columns_keep_their_first_type(self):
+        columns = InferredColumns()
+        columns.align(pa.table({"n": pa.array([1], pa.int32()), "address": pa.array([{"city": "Almaty"}])}))
+
+        table = columns.align(pa.table({"n": pa.array([2], pa.int64()), "address": pa.array([None], pa.string())}))
+        self.assertEqual(table.schema.field("n").type, pa.int32())
+        self.assertEqual(table.schema.field("address").type, pa.struct([("city", pa.string())]))
+        self.assertEqual(columns.align(pa.table({"tags": pa.array([None], pa.string())})).column_names, [])
+        with self.assertRaises(ValueError):
+            columns.align(pa.table({"n": pa.array(["two"])}))
+
+    def test_incremental_loads_skip_boundary_documents(self):
+        docs = self._docs()
+        state = {"incremental": {"key": "updated_at", "last_value": T0, "last_ids": [docs[0]["_id"]]}}
+        loader = CollectionLoader(
+            None, RawBatchCollection(docs), query={}, incremental=IncrementalCursor("updated_at", state), arrow=True
+        )
+
+        ids = [_id for table in loader.load_documents() for _id in table.column("_id").to_pylist()]
+
+        self.assertEqual(ids, [str(docs[1]["_id"]), str(docs[2]["_id"])])
+        self.assertEqual(state["incremental"]["last_ids"], [docs[2]["_id"]])
+
+    def test_rejects_masking_and_unknown_types(self):
+        with self.assertRaises(ValueError):
+            CollectionLoader(None, None, query={}, arrow=True, masker=Masker({"name": "stars"}))
+        with self.assertRaises(ValueError):
+            CollectionLoader(None, None, query={}, arrow_schema={"name": "varchar"})
+
+        pipeline = Pipeline(name="people", arrow_extraction=True, masking_config={"name": "stars"})
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
+
+    def test_run_pipeline_copies_arrow_tables_into_postgres(self):
+        connection = StubPostgresConnection()
+        write_result = WriteResult()
+        docs = self._docs()
+        loader = CollectionLoader(None, RawBatchCollection(docs), query={}, arrow=True)
+        source = dlt.resource(loader.load_documents(), name="people", max_table_nesting=0)
+
+        make_pipeline = dlt.pipeline
+        with tempfile.TemporaryDirectory() as pipelines_dir, mock.patch(
+            "etl_jobs.pipeline.get_source_factory", return_value=lambda config: source
+        ), mock.patch.object(postgres_destination, "connect", return_value=connection), mock.patch(
+            "etl_jobs.pipeline.dlt.pipeline",
+            side_effect=lambda **kwargs: make_pipeline(pipelines_dir=pipelines_dir, **kwargs),
+        ):
+            run_pipeline(
+                {"type": "mongodb"},
+                {
+                    "type": "postgresql",
+                    "connection_url": "postgresql://etl",
+                    "table": "people",
+                    "write_disposition": "append",
+                    "write_result": write_result,
+                },
+                pipeline_name="arrow_test",
+            )
+
+        copied = "".join(connection.copies)
+        self.assertIn(str(docs[0]["_id"]), copied)
+        self.assertIn('""city"": ""Almaty""', copied)
+        self.assertEqual(write_result.inserted, 3)
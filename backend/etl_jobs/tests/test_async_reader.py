@@ -0,0 +1,109 @@
+from functools import partial
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from pymongo.errors import AutoReconnect
+
+from ..dlt_config.mongodb import async_reader
+from ..dlt_config.partitions import PARTITION_DONE
+from ..dlt_config.mongodb.source import CollectionLoader, IncrementalCursor
+from ..models import Pipeline
+from .fixtures import FakeAsyncClient, FakeAsyncCollection, FakeAsyncCursor, StubSourceCollection
+
+
+class AsyncReaderTests(SimpleTestCase):
+    def setUp(self):
+        FakeAsyncCursor.in_flight = FakeAsyncCursor.most_in_flight = 0
+        self.collection = FakeAsyncCollection([{"_id": i, "n": i} for i in range(10)])
+        self.client = FakeAsyncClient(university=FakeAsyncClient(people=self.collection))
+        patcher = mock.patch.object(async_reader, "AsyncMongoClient", return_value=self.client)
+        self.client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def openers(self, *ranges):
+        async def open_cursor(client, range_filter):
+            return client["university"]["people"].find(range_filter)
+
+        return {index: partial(open_cursor, range_filter=range_filter) for index, range_filter in enumerate(ranges)}
+
+    def test_reads_every_range_concurrently(self):
+        ranges = ({"_id": {"$lt": 5}}, {"_id": {"$gte": 5}})
+        items = list(async_reader.read_partitions_async("mongodb://source", self.openers(*ranges), chunk_size=2))
+
+        docs = [doc for _, chunk in items if chunk is not PARTITION_DONE for doc in chunk]
+        self.assertEqual(sorted(doc["_id"] for doc in docs), list(range(10)))
+        self.assertEqual(sorted(index for index, chunk in items if chunk is PARTITION_DONE), [0, 1])
+        self.assertEqual(FakeAsyncCursor.most_in_flight, 2)
+        self.assertTrue(self.client.closed and all(cursor.closed for cursor in self.collection.cursors))
+        self.assertTrue(self.client_class.call_args.kwargs["tz_aware"])
+
+    def test_raises_a_failed_read(self):
+        async def failing(client):
+            return FakeAsyncCursor([{"_id": 1}], fail_after=0)
+
+        with self.assertRaises(AutoReconnect):
+            list(async_reader.read_partitions_async("mongodb://source", {0: failing}, chunk_size=2))
+        self.assertTrue(self.client.closed)
+
+    def test_closing_early_cancels_the_reads(self):
+        reads = async_reader.read_partitions_async("mongodb://source", self.openers({}), chunk_size=1)
+        self.assertEqual(next(reads)[1], [{"_id": 0, "n": 0}])
+        reads.close()
+
+        self.assertTrue(self.client.closed)
+        self.assertTrue(self.collection.cursors[0].closed)
+        self.assertLess(self.collection.cursors[0].reads, 10)
+
+    def test_loader_reads_through_the_async_client(self):
+        sync_collection = StubSourceCollection([])
+        sync_collection.database = mock.Mock()
+        sync_collection.database.name = "university"
+        state = {}
+        loader = CollectionLoader(
+            None,
+            sync_collection,
+            query={"n": {"$gte": 0}},
+            incremental=IncrementalCursor("n", state),
+            async_connection_url="mongodb://source",
+        )
+
+        docs = [doc for chunk in loader.load_documents() for doc in chunk]
+
+        self.assertEqual([doc["_id"] for doc in docs], list(range(10)))
+        self.assertEqual(self.collection.find_args[0], {"n": {"$gte": 0}})
+        self.assertEqual(self.collection.cursors[0].sort_spec, [("n", 1)])
+        self.assertEqual(state["incremental"]["last_value"], 9)
+
+    def test_async_reads_need_decoded_documents(self):
+        with self.assertRaises(ValueError):
+            CollectionLoader(
+                None, StubSourceCollection([]), query={}, memory_budget=1024, async_connection_url="mongodb://x"
+            )
+        pipeline = Pipeline(name="people", source_table="people", async_reads=True)
+        self.assertTrue(pipeline.get_source_config()["async_reads"])
+        pipeline.memory_budget_mb = 64
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
+
+    def test_loader_rejects_exclusive_read_options_on_its_own(self):
+        collection = StubSourceCollection([])
+        for options in (
+            {"arrow": True, "memory_budget": 1024},
+            {"arrow_schema": {"n": "int64"}, "masker": mock.Mock()},
+            {"checkpoint": mock.Mock(), "aggregation_pipeline": [{"$limit": 1}]},
+            {"async_connection_url": "mongodb://x", "arrow": True},
+        ):
+            with self.subTest(options=sorted(options)), self.assertRaises(ValueError):
+                CollectionLoader(None, collection, query={}, **options)
+        CollectionLoader(None, collection, query={}, memory_budget=1024, checkpoint=mock.Mock(), masker=mock.Mock())
+
+    def test_clean_checks_read_options_like_the_loader(self):
+        pipeline = Pipeline(name="people", source_table="people", arrow_extraction=True, memory_budget_mb=64)
+        with self.assertRaisesMessage(ValidationError, "arrow can't be combined with memory_budget"):
+            pipeline.clean()
+        pipeline = Pipeline(
+            name="people", source_table="people", checkpoint_size=1000, source_aggregation_query=[{"$limit": 1}]
+        )
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
@@ -0,0 +1,180 @@
+from unittest import mock
+
+from bson import json_util
+from django.test import SimpleTestCase
+
+from ..dlt_config.mongodb import source as mongo_source
+from ..dlt_config.mongodb import destination as mongo_destination
+from ..dlt_config.mongodb.checkpoint import Checkpoint
+from ..dlt_config.mongodb.staging import StagingCollection
+from ..dlt_config.mongodb.source import CollectionLoader
+from ..dlt_config.mongodb.writer import WriteResult
+from ..models import Pipeline
+from .fixtures import CheckpointCollection, NativeSourceCollection, StubCollection, StubDatabase, copy_native
+
+
+class CheckpointTests(SimpleTestCase):
+    def _load(self, collection, state, segment_size, **options):
+        checkpoint = Checkpoint(state, segment_size=segment_size, **options)
+        loader = CollectionLoader(None, collection, query={}, checkpoint=checkpoint, convert=False)
+        with mock.patch.object(mongo_source, "CHUNK_SIZE", 4):
+            ids = [doc["_id"] for docs in loader.load_documents() for doc in docs]
+        return checkpoint, ids
+
+    def test_resumes_after_the_last_id_of_each_finished_run(self):
+        collection = CheckpointCollection(25)
+        state = {}
+
+        checkpoint, ids = self._load(collection, state, 10)
+        self.assertEqual(ids, list(range(10)))
+        self.assertEqual(collection.cursors[0].sort_spec, [("_id", 1)])
+        # nothing is committed until the run has loaded its segment
+        self.assertNotIn("checkpoint", state)
+        checkpoint.finish()
+        self.assertEqual(state["checkpoint"]["partitions"][0]["last_id"], 9)
+
+        checkpoint, ids = self._load(collection, state, 10)
+        self.assertEqual(collection.queries[-1], {"_id": {"$gt": 9}})
+        self.assertEqual(ids, list(range(10, 20)))
+        checkpoint.finish()
+
+        checkpoint, ids = self._load(collection, state, 10)
+        self.assertEqual(ids, list(range(20, 25)))
+        self.assertTrue(checkpoint.complete)
+        checkpoint.finish()
+        self.assertNotIn("checkpoint", state)
+
+    def test_interrupted_run_is_replayed_from_the_last_commit(self):
+        collection = CheckpointCollection(10)
+        state = {}
+        saves = []
+
+        checkpoint, _ = self._load(collection, state, 5)
+        checkpoint.finish()
+        checkpoint = Checkpoint(state, segment_size=5, on_save=lambda s: saves.append(json_util.dumps(s)))
+        checkpoint.begin()
+        # the run dies before finish(): its reads were never committed
+
+        checkpoint, ids = self._load(collection, state, 5)
+        self.assertTrue(checkpoint.interrupted)
+        self.assertEqual(ids, list(range(5, 10)))
+        self.assertIn('"in_progress": true', saves[0])
+
+    def test_partitions_keep_their_own_positions(self):
+        collection = CheckpointCollection(20)
+        state = {}
+        checkpoint = Checkpoint(state)
+        checkpoint.plan([{"_id": {"$lt": 10}}, {"_id": {"$gte": 10}}])
+        checkpoint.commit()
+
+        loaded = []
+        for _ in range(5):
+            checkpoint, ids = self._load(collection, state, 6)
+            loaded.extend(ids)
+            checkpoint.finish()
+            if checkpoint.complete:
+                break
+
+        self.assertEqual(sorted(loaded), list(range(20)))
+        self.assertNotIn("checkpoint", state)
+
+    def test_rejects_aggregation_pipelines(self):
+        with self.assertRaises(ValueError):
+            CollectionLoader(None, CheckpointCollection(1), {}, aggregation_pipeline=[{"$match": {}}], checkpoint=Checkpoint())
+
+    def test_replays_merge_by_id_and_reuse_the_staging_collection(self):
+        database = StubDatabase()
+        state = {"checkpoint": {"partitions": [], "staging": "people__etl_staging_abc", "in_progress": True}}
+        checkpoint = Checkpoint(state)
+
+        collection, staging, disposition, key = mongo_destination.open_target(
+            database["people"], "replace", None, checkpoint
+        )
+
+        self.assertEqual(staging.collection.name, "people__etl_staging_abc")
+        self.assertIs(collection, staging.collection)
+        self.assertEqual((disposition, key), ("merge", ["_id"]))
+        self.assertEqual(
+            mongo_destination.open_target(database["people"], "append", None, Checkpoint())[2], "append"
+        )
+
+    def _write(self, database, checkpoint, docs, succeeded=True):
+        write_result = WriteResult()
+        with mock.patch.object(mongo_destination, "get_client", return_value={"analytics": database}):
+            writer = mongo_destination._get_writer(
+                "mongodb://destination",
+                "analytics",
+                "people",
+                write_batch_size=10,
+                max_in_flight=1,
+                max_retries=0,
+                write_result=write_result,
+                write_disposition="replace",
+                checkpoint=checkpoint,
+            )
+        writer.write(docs)
+        mongo_destination.close_writers(write_result, succeeded=succeeded, checkpoint=checkpoint)
+
+    def test_replace_swaps_in_the_staging_collection_after_the_last_run(self):
+        database = StubDatabase()
+        database["people"].docs = {0: {"_id": 0}}
+        state = {}
+        checkpoint = Checkpoint(state)
+        checkpoint.plan([{}])
+
+        self._write(database, checkpoint, [{"_id": 1}])
+        self._write(database, checkpoint, [{"_id": 2}], succeeded=False)
+        self.assertEqual(len(database), 2)
+        self.assertEqual(set(database["people"].docs), {0})
+
+        checkpoint.mark_done(0)
+        self._write(database, checkpoint, [{"_id": 3}])
+
+        self.assertEqual(list(database), ["people"])
+        self.assertEqual(set(database["people"].docs), {1, 2, 3})
+        self.assertIsNone(checkpoint.staging)
+
+    def test_last_run_without_documents_still_swaps_in_the_staging_collection(self):
+        database = StubDatabase()
+        database["people__etl_staging_abc"].docs = {1: {"_id": 1}}
+        checkpoint = Checkpoint({"checkpoint": {"partitions": [{"filter": {}, "last_id": 1, "done": True}]}})
+        checkpoint.staging = "people__etl_staging_abc"
+
+        mongo_destination.finish_unwritten_replace(database["people"], succeeded=True, checkpoint=checkpoint)
+
+        self.assertEqual(list(database), ["people"])
+        self.assertEqual(set(database["people"].docs), {1})
+
+    def test_failed_documents_restart_the_load(self):
+        database = StubDatabase()
+        state = {}
+        checkpoint = Checkpoint(state)
+        checkpoint.plan([{}])
+        checkpoint.commit()
+        staging = StagingCollection(database["people"], name="people__etl_staging_abc")
+
+        mongo_destination.finish_staging(staging, False, WriteResult(failed=1), checkpoint)
+
+        self.assertEqual(list(database), ["people"])
+        self.assertNotIn("checkpoint", state)
+
+    def test_native_copy_commits_after_every_chunk(self):
+        source = NativeSourceCollection([{"_id": i} for i in range(3)])
+        destination = StubCollection()
+        destination.full_name = "analytics.people_analytics"
+        saved = []
+        checkpoint = Checkpoint(
+            {}, on_save=lambda state: saved.append(state["checkpoint"]["partitions"][0]["last_id"])
+        )
+
+        with mock.patch.object(mongo_source, "CHUNK_SIZE", 2):
+            copy_native(source, destination, checkpoint=checkpoint)
+
+        self.assertEqual(saved, [1, 2])
+        self.assertEqual(set(destination.docs), {0, 1, 2})
+
+    def test_full_loads_carry_the_checkpoint_size_and_state(self):
+        pipeline = Pipeline(name="people", load_type="full", checkpoint_size=50_000, sync_state={})
+        config = pipeline.get_source_config()
+        self.assertEqual((config["checkpoint_size"], config["state"]), (50_000, {}))
+        self.assertNotIn("checkpoint_size", Pipeline(name="people", load_type="full").get_source_config())
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..dlt_config.mongodb import client as client_registry
+
+
+class MongoClientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            client_registry, "MongoClient", side_effect=lambda *args, **kwargs: mock.Mock()
+        )
+        self.mongo_client = patcher.start()
+        self.addCleanup(patcher.stop)
+        client_registry._reset_after_fork()
+        self.addCleanup(client_registry._reset_after_fork)
+
+    def test_reuses_client_for_same_url_and_options(self):
+        first = client_registry.get_client("mongodb://host/", tz_aware=True, appname="etl")
+        second = client_registry.get_client("mongodb://host/", appname="etl", tz_aware=True)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.mongo_client.call_count, 1)
+
+    def test_different_options_get_separate_clients(self):
+        first = client_registry.get_client("mongodb://host/")
+        second = client_registry.get_client("mongodb://host/", tz_aware=False)
+        third = client_registry.get_client("mongodb://other/")
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(self.mongo_client.call_count, 3)
+
+    def test_counts_hits_and_misses(self):
+        client_registry.get_client("mongodb://host/")
+        client_registry.get_client("mongodb://host/")
+        client_registry.get_client("mongodb://host/")
+        client_registry.get_client("mongodb://other/")
+
+        self.assertEqual(
+            client_registry.pool_stats(), {"hits": 2, "misses": 2, "open_clients": 2}
+        )
+
+    def test_close_clients_closes_and_resets_registry(self):
+        first = client_registry.get_client("mongodb://host/")
+        second = client_registry.get_client("mongodb://other/")
+
+        client_registry.close_clients()
+
+        first.close.assert_called_once_with()
+        second.close.assert_called_once_with()
+        self.assertEqual(client_registry.pool_stats()["open_clients"], 0)
+        self.assertIsNot(client_registry.get_client("mongodb://host/"), first)
+
+    def test_reset_after_fork_drops_clients_without_closing(self):
+        inherited = client_registry.get_client("mongodb://host/")
+
+        client_registry._reset_after_fork()
+
+        inherited.close.assert_not_called()
+        self.assertEqual(
+            client_registry.pool_stats(), {"hits": 0, "misses": 0, "open_clients": 0}
+        )
+        self.assertIsNot(client_registry.get_client("mongodb://host/"), inherited)
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from bson import ObjectId
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ..dlt_config.timing import StageTimings
+from ..dlt_config.mongodb.writer import WriteResult
+from .. import fanout, locks
+from ..metrics import RunMetrics
+from ..models import JobExecution, Pipeline
+from .fixtures import StubRedisLock, T0
+
+
+class FanoutTests(SimpleTestCase):
+    def setUp(self):
+        StubRedisLock.held = {}
+        patcher = mock.patch.object(locks, "_redis", return_value=mock.Mock(lock=StubRedisLock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def report(self, index, rows, extract_seconds, peak):
+        return fanout.partition_report(
+            index,
+            RunMetrics(rows_extracted=rows, rows_written=rows, extract_seconds=extract_seconds),
+            WriteResult(inserted=rows, retried=1),
+            StageTimings(),
+            peak,
+            peak // 2,
+        )
+
+    def test_ranges_round_trip_through_json(self):
+        bound = ObjectId()
+        since = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        range_filter = {"$and": [{"_id": {"$gte": bound}}, {"at": {"$lt": since}}]}
+        self.assertEqual(fanout.decode_range(fanout.encode_range(range_filter)), range_filter)
+
+    def test_partition_narrows_the_source(self):
+        range_filter = {"_id": {"$gte": 5}}
+        self.assertEqual(fanout.partition_source_config({"collection": "people"}, range_filter)["query"], range_filter)
+        config = fanout.partition_source_config(
+            {"collection": "people", "aggregation_pipeline": [{"$limit": 3}]}, range_filter
+        )
+        self.assertEqual(config["aggregation_pipeline"], [{"$match": range_filter}, {"$limit": 3}])
+        self.assertEqual(fanout.partition_source_config({"collection": "people"}, {}), {"collection": "people"})
+
+    def test_merges_partition_reports(self):
+        merged = fanout.MergedPartitions([self.report(1, 30, 4.0, 300), self.report(0, 20, 6.0, 200)])
+        self.assertIsNone(merged.error)
+        self.assertEqual((merged.metrics.rows_extracted, merged.metrics.extract_seconds), (50, 6.0))
+        self.assertEqual((merged.write_result.inserted, merged.write_result.retried), (50, 2))
+        self.assertEqual((merged.peak_rss, merged.rss_growth), (300, 150))
+
+        merged = fanout.MergedPartitions(
+            [self.report(0, 20, 6.0, 200), {"index": 1, "status": "failed", "error": "boom"}]
+        )
+        self.assertEqual(merged.error, "1 of 2 partitions failed: partition 1: boom")
+
+    def test_partition_loads_its_range_under_its_own_dlt_name(self):
+        from .. import services
+
+        pipeline = Pipeline(pk=7, name="people", source_uri="mongodb://source", source_table="people")
+        with mock.patch.object(Pipeline.objects, "get", return_value=pipeline), mock.patch.object(
+            services, "run_pipeline", return_value=None
+        ) as run:
+            report = services.PartitionExecutionService(7, 2, fanout.encode_range({"_id": {"$gte": 5}})).execute()
+
+        self.assertEqual((report["index"], report["status"]), (2, "success"))
+        self.assertEqual(run.call_args.kwargs["source_config"]["query"], {"_id": {"$gte": 5}})
+        self.assertEqual(run.call_args.kwargs["pipeline_name"], "people__partition_2")
+
+        with mock.patch.object(Pipeline.objects, "get", return_value=pipeline), mock.patch.object(
+            services, "run_pipeline", side_effect=RuntimeError("source went away")
+        ):
+            report = services.PartitionExecutionService(7, 2, fanout.encode_range({})).execute()
+        self.assertEqual(report, {"index": 2, "status": "failed", "error": "source went away"})
+
+    def test_chord_holds_the_lock_until_the_callback(self):
+        from .. import tasks
+
+        plan = {"status": "partitioned", "execution_id": "run-1", "execution_pk": 3, "ranges": ["{}", "{}"]}
+        with mock.patch.object(tasks, "PipelineExecutionService") as service, mock.patch.object(tasks, "chord") as chord:
+            service.return_value.pipeline_id = 7
+            service.return_value.pipeline = Pipeline(pk=7, workload="heavy")
+            service.return_value.execute.return_value = plan
+            result = tasks.run_pipeline_task(7)
+
+        self.assertEqual(result, {"status": "dispatched", "execution_id": "run-1", "partitions": 2})
+        self.assertEqual([task.args for task in chord.call_args.args[0]], [(7, 0, "{}"), (7, 1, "{}")])
+        self.assertEqual([task.options["queue"] for task in chord.call_args.args[0]], ["heavy", "heavy"])
+        callback = chord.return_value.call_args.args[0]
+        self.assertIn(locks.lock_name(7), StubRedisLock.held)
+        self.assertEqual(tasks.run_pipeline_task(7)["status"], "skipped")
+
+        with mock.patch.object(tasks, "complete_partitioned_execution", return_value={"status": "success"}) as complete:
+            tasks.finish_partitioned_run_task([], *callback.args)
+        complete.assert_called_once_with(3, [])
+        self.assertEqual(StubRedisLock.held, {})
+
+    def test_broken_chord_fails_the_execution_and_releases_the_lock(self):
+        from celery.exceptions import ChordError
+        from myproject.celery import app
+        from .. import tasks
+
+        plan = {"status": "partitioned", "execution_id": "run-1", "execution_pk": 3, "ranges": ["{}", "{}"]}
+        with mock.patch.object(tasks, "PipelineExecutionService") as service, mock.patch.object(tasks, "chord") as chord:
+            service.return_value.pipeline_id = 7
+            service.return_value.pipeline = Pipeline(pk=7, workload="light")
+            service.return_value.execute.return_value = plan
+            tasks.run_pipeline_task(7)
+        callback = chord.return_value.call_args.args[0]
+        self.assertIn(locks.lock_name(7), StubRedisLock.held)
+
+        execution = JobExecution(pk=3, pipeline=Pipeline(name="people"), status="running", started_at=T0)
+        with mock.patch.object(JobExecution.objects, "select_related") as select, mock.patch.object(
+            JobExecution, "save"
+        ), mock.patch.object(app.backend, "fail_from_current_stack") as fail_callback:
+            select.return_value.get.return_value = execution
+            # what celery does when a partition task dies before reporting
+            app.backend.chord_error_from_stack(callback, ChordError("partition 1 was lost with its worker"))
+
+        fail_callback.assert_called_once()
+
+        select.return_value.get.assert_called_once_with(pk=3)
+        self.assertEqual(execution.status, "failed")
+        self.assertIn("partition 1 was lost", execution.error_message)
+        self.assertEqual(StubRedisLock.held, {})
+
+    def test_chord_errback_leaves_a_completed_execution_alone(self):
+        from .. import tasks
+
+        execution = JobExecution(pk=3, pipeline=Pipeline(name="people"), status="success", completed_at=T0)
+        with mock.patch.object(JobExecution.objects, "select_related") as select, mock.patch.object(
+            JobExecution, "save"
+        ) as save:
+            select.return_value.get.return_value = execution
+            result = tasks.fail_partitioned_run_task(None, RuntimeError("late"), None, 7, 3, "token")
+
+        self.assertEqual((result["status"], execution.status), ("success", "success"))
+        save.assert_not_called()
+
+    def test_failed_dispatch_releases_the_lock(self):
+        from .. import tasks
+
+        plan = {"status": "partitioned", "execution_id": "run-1", "execution_pk": 3, "ranges": ["{}"]}
+        with mock.patch.object(tasks, "PipelineExecutionService") as service, mock.patch.object(
+            tasks, "chord", side_effect=ConnectionError("broker down")
+        ):
+            service.return_value.execute.return_value = plan
+            result = tasks.run_pipeline_task(7)
+
+        self.assertEqual(result["status"], "failed")
+        service.return_value.execution.complete_failure.assert_called_once()
+        self.assertEqual(StubRedisLock.held, {})
+
+    def test_completes_one_execution_from_the_reports(self):
+        from .. import services
+
+        execution = JobExecution(
+            pk=3,
+            pipeline=Pipeline(name="people"),
+            started_at=datetime.now(timezone.utc) - timedelta(seconds=10),
+            stage_timings={"plan_partitions": {"seconds": 0.5, "calls": 1}},
+        )
+        with mock.patch.object(JobExecution.objects, "select_related") as select, mock.patch.object(
+            JobExecution, "save"
+        ):
+            select.return_value.get.return_value = execution
+            result = services.complete_partitioned_execution(
+                3, [self.report(0, 20, 6.0, 200), self.report(1, 30, 4.0, 300)]
+            )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual((execution.status, execution.rows_processed, execution.rows_inserted), ("success", 50, 50))
+        self.assertEqual(execution.peak_rss_bytes, 300)
+        self.assertIn("plan_partitions", execution.stage_timings)
+
+    def test_fanout_needs_a_non_replacing_full_load(self):
+        pipeline = Pipeline(
+            name="people", source_type="mongodb", load_type="full", fanout_partitions=4, incremental_strategy="replace"
+        )
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
+        pipeline.incremental_strategy = "upsert"
+        pipeline.clean()
+        pipeline.load_type = "incremental"
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
@@ -0,0 +1,141 @@
+import hashlib
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, override_settings
+
+from ..dlt_config.masking import Masker
+from ..dlt_config.mongodb.source import CollectionLoader
+from ..models import JobExecution, Pipeline
+from ..services import PipelineExecutionService
+from .fixtures import StubSourceCollection
+
+
+class MaskingTests(SimpleTestCase):
+    def _person(self):
+        return {
+            "first_name": "Carol",
+            "email": "carol.doe@example.com",
+            "phone": "536-555-0142",
+            "date_of_birth": datetime(1961, 4, 2, tzinfo=timezone.utc),
+            "address": {"city": "Smithchester", "geo": {"lat": 39.686203, "lng": -12.279112}},
+            "emergency_contacts": [{"phone": "555-0100"}, {"phone": None}],
+            "tags": ["a", "bc"],
+        }
+
+    def test_applies_rules_to_top_level_and_nested_fields(self):
+        masker = Masker(
+            {
+                "email": "email",
+                "phone": "phone",
+                "date_of_birth": "year_only",
+                "address.geo.lat": "stars",
+                "emergency_contacts.phone": "phone",
+                "tags": "stars",
+                "address.missing.field": "hash",
+            },
+            salt="pepper",
+        )
+
+        [doc] = masker.mask([self._person()])
+
+        self.assertEqual(doc["email"], "c*******e@example.com")
+        self.assertEqual(doc["phone"], "536-***-****")
+        self.assertEqual(doc["date_of_birth"], 1961)
+        self.assertEqual(doc["address"]["geo"], {"lat": "*********", "lng": -12.279112})
+        self.assertEqual(doc["emergency_contacts"], [{"phone": "555-****"}, {"phone": None}])
+        self.assertEqual(doc["tags"], ["*", "**"])
+        self.assertEqual(doc["address"]["city"], "Smithchester")
+
+    def test_hash_is_deterministic_and_salted(self):
+        salted = Masker({"first_name": "hash"}, salt="pepper").mask([self._person(), self._person()])
+
+        self.assertEqual(salted[0]["first_name"], hashlib.sha256(b"pepperCarol").hexdigest())
+        self.assertEqual(salted[0]["first_name"], salted[1]["first_name"])
+        self.assertNotIn("pepper", repr(Masker({"first_name": "hash"}, salt="pepper")))
+
+    def test_refuses_hash_rules_without_a_salt(self):
+        with self.assertRaises(ValueError):
+            Masker({"first_name": "hash"})
+        Masker({"email": "email"})
+
+        with override_settings(MASKING_SALT=""), self.assertRaises(ValidationError):
+            Pipeline(pk=1, name="people", masking_config={"first_name": "hash"}).clean()
+        with override_settings(MASKING_SALT="secret"):
+            Pipeline(pk=1, name="people", masking_config={"first_name": "hash"}).clean()
+
+    def test_salt_is_derived_per_pipeline_from_the_secret(self):
+        with override_settings(MASKING_SALT="secret"):
+            first = Pipeline(pk=1, name="people").get_masking_salt()
+            second = Pipeline(pk=2, name="people").get_masking_salt()
+            self.assertEqual(first, Pipeline(pk=1, name="renamed").get_masking_salt())
+        with override_settings(MASKING_SALT="rotated"):
+            rotated = Pipeline(pk=1, name="people").get_masking_salt()
+
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(first, rotated)
+        self.assertNotIn("secret", first)
+        with override_settings(MASKING_SALT=""):
+            self.assertEqual(Pipeline(pk=1, name="people").get_masking_salt(), "")
+
+    def test_rejects_unknown_rules(self):
+        with self.assertRaises(ValueError):
+            Masker({"email": "scramble"})
+        with self.assertRaises(ValidationError):
+            Pipeline(name="people", masking_config={"email": "scramble"}).clean()
+
+    def test_memoizes_masked_values_per_masker(self):
+        people = [{"first_name": name} for name in ["Carol", "Carol", "Dave", "Carol", 1, 1.0, True]]
+        masker = Masker({"first_name": "hash"}, salt="pepper", cache_size=10)
+
+        masked = masker.mask(people)
+
+        self.assertEqual(masker.cache_stats(), {"hits": 2, "misses": 5})
+        self.assertEqual(masked[0]["first_name"], masked[3]["first_name"])
+        self.assertEqual(len({doc["first_name"] for doc in masked[4:]}), 3)
+        self.assertEqual(Masker({"first_name": "hash"}, salt="pepper", cache_size=10).cache_stats(), {"hits": 0, "misses": 0})
+
+    def test_cache_can_be_disabled_and_skips_unhashable_values(self):
+        uncached = Masker({"first_name": "hash"}, salt="pepper", cache_size=0)
+        uncached.mask([{"first_name": "Carol"}, {"first_name": "Carol"}])
+        self.assertEqual(uncached.cache_stats(), {"hits": 0, "misses": 0})
+
+        masker = Masker({"metadata": "stars"})
+        [doc] = masker.mask([{"metadata": {"notes": "x"}}])
+        self.assertEqual(doc["metadata"], "*" * len(str({"notes": "x"})))
+        self.assertEqual(masker.cache_stats(), {"hits": 0, "misses": 1})
+
+    def test_execution_records_cache_hit_rate(self):
+        execution = JobExecution(pipeline=Pipeline(name="people"))
+
+        with mock.patch.object(JobExecution, "save"):
+            execution.complete_success("load info", masking_stats={"hits": 3, "misses": 1})
+
+        self.assertEqual(execution.masking_cache_hits, 3)
+        self.assertEqual(execution.masking_cache_hit_rate, 0.75)
+        self.assertIn("75.0% hit rate", execution.logs)
+
+    def test_loader_masks_each_chunk(self):
+        collection = StubSourceCollection([{"_id": 1, "email": "ab@example.com"}])
+        loader = CollectionLoader(None, collection, query={}, masker=Masker({"email": "email"}))
+
+        self.assertEqual(list(loader.load_documents()), [[{"_id": 1, "email": "**@example.com"}]])
+
+    def test_pipelines_hash_the_same_value_differently(self):
+        hashed = []
+        for pipeline_id in (1, 2):
+            service = PipelineExecutionService(pipeline_id=pipeline_id)
+            service.pipeline = Pipeline(pk=pipeline_id, name="people", masking_config={"email": "hash"})
+            with override_settings(MASKING_SALT="secret"), mock.patch(
+                "etl_jobs.services.run_pipeline"
+            ) as run, mock.patch.object(Pipeline, "get_source_config", return_value={"type": "mongodb"}):
+                service._run()
+            masker = run.call_args.kwargs["source_config"]["masker"]
+            # the memo of one run never serves the other run's values
+            [doc, again] = masker.mask([{"email": "ab@example.com"}, {"email": "ab@example.com"}])
+            self.assertEqual(doc, again)
+            self.assertEqual(masker.cache_stats(), {"hits": 1, "misses": 1})
+            hashed.append(doc["email"])
+
+        self.assertNotEqual(hashed[0], hashed[1])
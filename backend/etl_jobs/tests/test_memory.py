@@ -0,0 +1,57 @@
+import os
+from unittest import mock
+
+from bson import encode
+from django.test import SimpleTestCase
+
+from ..dlt_config import memory
+from ..dlt_config.memory import MemoryBudget, MemoryMonitor
+from ..dlt_config.mongodb import source as mongo_source
+from ..dlt_config.mongodb.source import CollectionLoader
+from ..models import Pipeline
+from .fixtures import RawDocumentCollection
+
+
+class MemoryBudgetTests(SimpleTestCase):
+    def test_budget_bounds_the_chunks_held_at_once(self):
+        budget = MemoryBudget(256 * 1024 * 1024, readers=4)
+
+        self.assertEqual(budget.chunks_in_memory, 13)
+        self.assertEqual(budget.chunk_bytes, 128 * 1024 * 1024 // 13)
+        self.assertEqual(MemoryBudget(1024).chunk_bytes, memory.MIN_CHUNK_BYTES)
+
+    def test_chunks_are_sized_by_bson_bytes_and_read_ahead(self):
+        docs = [{"_id": index, "payload": "x" * 100} for index in range(10)]
+        loader = CollectionLoader(None, RawDocumentCollection(docs), query={}, memory_budget=1)
+        loader.chunk_bytes = 3 * len(encode(docs[0]))
+
+        with mock.patch.object(mongo_source, "read_partitions", wraps=mongo_source.read_partitions) as read:
+            chunks = list(loader.load_documents())
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 3, 1])
+        self.assertEqual([doc["_id"] for chunk in chunks for doc in chunk], list(range(10)))
+        self.assertIsInstance(chunks[0][0], dict)
+        read.assert_called_once()
+
+    def test_extract_buffer_is_scoped_to_the_run(self):
+        from ..pipeline import _extract_config
+
+        with _extract_config("orders", {"memory_budget": 1024}):
+            self.assertEqual(os.environ["ORDERS__SOURCES__DATA_WRITER__BUFFER_MAX_ITEMS"], "1")
+        self.assertNotIn("ORDERS__SOURCES__DATA_WRITER__BUFFER_MAX_ITEMS", os.environ)
+
+    def test_monitor_keeps_the_peak_rss(self):
+        samples = iter([100, 300, 200])
+        with mock.patch.object(memory, "current_rss", side_effect=lambda: next(samples, 200)):
+            monitor = MemoryMonitor(interval=3600)
+            monitor.start()
+            monitor._record()
+            monitor.stop()
+
+        self.assertEqual((monitor.start_rss, monitor.peak_rss, monitor.end_rss), (100, 300, 200))
+        self.assertEqual(monitor.growth, 200)
+
+    def test_pipeline_passes_the_budget_in_bytes(self):
+        pipeline = Pipeline(name="orders", source_table="orders", memory_budget_mb=64)
+
+        self.assertEqual(pipeline.get_source_config()["memory_budget"], 64 * 1024 * 1024)
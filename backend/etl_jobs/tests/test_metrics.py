@@ -0,0 +1,121 @@
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import dlt
+from django.test import SimpleTestCase
+
+from ..dlt_config.masking import Masker
+from ..dlt_config.timing import StageTimings
+from ..dlt_config.mongodb.source import CollectionLoader
+from ..dlt_config.mongodb.writer import WriteResult
+from ..metrics import RunMetrics, collect_run_metrics
+from ..models import JobExecution, Pipeline
+from ..pipeline import run_pipeline
+from ..services import PipelineExecutionService
+from .fixtures import StubSourceCollection, T0
+
+
+class RunMetricsTests(SimpleTestCase):
+    def test_collects_counters_from_dlt_trace(self):
+        @dlt.resource(name="people")
+        def people():
+            yield [{"_id": i, "name": "x" * i} for i in range(50)]
+            yield [{"_id": i} for i in range(50, 80)]
+
+        @dlt.destination(batch_size=10, loader_file_format="typed-jsonl", skip_dlt_columns_and_tables=True)
+        def sink(items, table):
+            pass
+
+        with tempfile.TemporaryDirectory() as pipelines_dir:
+            pipeline = dlt.pipeline("metrics_test", destination=sink, pipelines_dir=pipelines_dir, dev_mode=True)
+            metrics = collect_run_metrics(pipeline.run(people()), WriteResult())
+
+        self.assertEqual((metrics.rows_extracted, metrics.rows_normalized, metrics.rows_written), (80, 80, 80))
+        self.assertEqual((metrics.files_extracted, metrics.files_loaded), (1, 1))
+        self.assertGreater(metrics.bytes_extracted, 0)
+        self.assertGreater(metrics.bytes_normalized, 0)
+        self.assertIsNotNone(metrics.extract_seconds)
+
+    def test_write_result_overrides_written_rows(self):
+        metrics = collect_run_metrics("load info", WriteResult(inserted=7, failed=2))
+
+        self.assertEqual((metrics.rows_written, metrics.rows_failed), (7, 2))
+        self.assertIsNone(metrics.rows_extracted)
+
+    def test_execution_stores_counters_and_throughput(self):
+        execution = JobExecution(pipeline=Pipeline(name="people"), started_at=T0)
+        metrics = RunMetrics(rows_extracted=1000, rows_normalized=1000, rows_written=990, rows_failed=10, extract_seconds=4)
+
+        with mock.patch.object(JobExecution, "save"), mock.patch(
+            "django.utils.timezone.now", return_value=T0 + timedelta(seconds=10)
+        ):
+            execution.complete_success("load info", write_result=WriteResult(inserted=990, failed=10), metrics=metrics)
+
+        self.assertEqual((execution.rows_processed, execution.rows_inserted, execution.rows_failed), (1000, 990, 10))
+        self.assertEqual(float(execution.rows_per_second), 99.0)
+        self.assertEqual(float(execution.extract_rows_per_second), 250.0)
+
+
+class StageTimingsTests(SimpleTestCase):
+    def test_accumulates_seconds_and_calls_across_threads(self):
+        timings = StageTimings()
+
+        def measure():
+            with timings.measure("mongo_read"):
+                pass
+
+        threads = [threading.Thread(target=measure) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        timings.add("dlt_extract", 1.5)
+
+        stages = timings.as_dict()
+        self.assertEqual(list(stages), ["mongo_read", "dlt_extract"])
+        self.assertEqual(stages["mongo_read"]["calls"], 4)
+        self.assertEqual(stages["dlt_extract"], {"seconds": 1.5, "calls": 1})
+
+    def test_loader_times_read_convert_and_mask(self):
+        timings = StageTimings()
+        collection = StubSourceCollection([{"_id": 1, "email": "ab@example.com"}])
+        loader = CollectionLoader(None, collection, query={}, masker=Masker({"email": "stars"}), timings=timings)
+
+        list(loader.load_documents())
+
+        self.assertEqual(set(timings.as_dict()), {"mongo_read", "convert", "mask"})
+        self.assertEqual(timings.as_dict()["mongo_read"]["calls"], 2)
+
+    def test_run_pipeline_records_dlt_steps(self):
+        timings = StageTimings()
+        source = dlt.resource([{"_id": 1}], name="people")
+
+        @dlt.destination(loader_file_format="typed-jsonl", skip_dlt_columns_and_tables=True)
+        def sink(items, table):
+            pass
+
+        make_pipeline = dlt.pipeline
+        with tempfile.TemporaryDirectory() as pipelines_dir, mock.patch(
+            "etl_jobs.pipeline.get_source_factory", return_value=lambda config: source
+        ), mock.patch("etl_jobs.pipeline.get_destination_factory", return_value=lambda config: sink), mock.patch(
+            "etl_jobs.pipeline.dlt.pipeline",
+            side_effect=lambda **kwargs: make_pipeline(pipelines_dir=pipelines_dir, **kwargs),
+        ):
+            run_pipeline({"type": "mongodb"}, {"type": "mongodb"}, pipeline_name="timings_test", timings=timings)
+
+        self.assertTrue({"dlt_run", "finalize_destination", "dlt_extract", "dlt_normalize", "dlt_load"} <= set(timings.as_dict()))
+
+    def test_service_attaches_profile_when_enabled(self):
+        service = PipelineExecutionService(pipeline_id=1)
+        service.pipeline = Pipeline(name="people", profile_runs=True)
+        service.execution = JobExecution(pipeline=service.pipeline)
+
+        with mock.patch.object(PipelineExecutionService, "_run", return_value="load info"):
+            self.assertEqual(service._run_pipeline(), "load info")
+        service.timings.add("run_pipeline", 2.0)
+        service._attach_diagnostics()
+
+        self.assertIn("cumulative", service.execution.profile)
+        self.assertEqual(service.execution.stage_timings["run_pipeline"]["seconds"], 2.0)
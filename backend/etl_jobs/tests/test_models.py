@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from bson import ObjectId
+from django.test import SimpleTestCase
+
+from ..models import Pipeline
+from .fixtures import T0
+
+
+class PipelineSyncStateTests(SimpleTestCase):
+    def test_round_trips_bson_values_through_extended_json(self):
+        object_id = ObjectId()
+        state = {
+            "incremental": {
+                "key": "updated_at",
+                "last_value": datetime(2025, 1, 1, 12, 30, 15, 123000, tzinfo=timezone.utc),
+                "last_ids": [object_id, 7],
+            }
+        }
+        pipeline = Pipeline(name="people")
+
+        with mock.patch.object(Pipeline, "save") as save:
+            pipeline.save_sync_state(state)
+
+        save.assert_called_once_with(update_fields=["sync_state", "updated_at"])
+        # stored as plain JSON
+        self.assertEqual(pipeline.sync_state["incremental"]["last_ids"][0], {"$oid": str(object_id)})
+        self.assertEqual(pipeline.get_sync_state(), state)
+
+    def test_source_config_includes_state_for_incremental_loads(self):
+        pipeline = Pipeline(
+            name="people",
+            load_type="incremental",
+            incremental_key="updated_at",
+            sync_state={"incremental": {"key": "updated_at", "last_value": {"$date": "2025-01-01T00:00:00Z"}}},
+        )
+
+        config = pipeline.get_source_config()
+
+        self.assertEqual(config["incremental_key"], "updated_at")
+        self.assertEqual(config["state"]["incremental"]["last_value"], T0)
@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..dlt_config import DestinationType, finalize_destination
+from ..dlt_config.mongodb import destination as mongo_destination
+from ..dlt_config.mongodb.staging import StagingCollection
+from ..dlt_config.mongodb.writer import WriteResult
+from ..models import Pipeline
+from .fixtures import StubDatabase
+
+
+class ReplaceLoadTests(SimpleTestCase):
+    def _write(self, database, docs, succeeded=True):
+        write_result = WriteResult()
+        with mock.patch.object(mongo_destination, "get_client", return_value={"analytics": database}):
+            writer = mongo_destination._get_writer(
+                "mongodb://destination",
+                "analytics",
+                "people",
+                write_batch_size=10,
+                max_in_flight=1,
+                max_retries=0,
+                write_result=write_result,
+                write_disposition="replace",
+            )
+        writer.write(docs)
+        mongo_destination.close_writers(write_result, succeeded=succeeded)
+        return writer
+
+    def test_loads_into_staging_and_swaps_it_in_with_target_indexes(self):
+        database = StubDatabase()
+        target = database["people"]
+        target.docs = {0: {"_id": 0}}
+        target.indexes = {"email_1": {"key": [("email", 1)], "unique": True, "v": 2}}
+
+        writer = self._write(database, [{"_id": 1}, {"_id": 2}])
+
+        self.assertIn("__etl_staging_", writer.collection.name)
+        self.assertEqual(list(database), ["people"])
+        self.assertEqual(set(database["people"].docs), {1, 2})
+        self.assertEqual(database["people"].indexes["email_1"], {"key": [("email", 1)], "unique": True})
+
+    def test_drops_staging_when_the_run_fails(self):
+        database = StubDatabase()
+        database["people"].docs = {0: {"_id": 0}}
+
+        self._write(database, [{"_id": 1}], succeeded=False)
+
+        self.assertEqual(list(database), ["people"])
+        self.assertEqual(set(database["people"].docs), {0})
+
+    def test_keeps_target_when_documents_failed(self):
+        database = StubDatabase()
+        target = database["people"]
+        staging = StagingCollection(target)
+        staging.collection.docs = {1: {"_id": 1}}
+
+        with self.assertRaises(RuntimeError):
+            mongo_destination.finish_staging(staging, True, WriteResult(inserted=1, failed=1))
+
+        self.assertEqual(list(database), ["people"])
+
+    def test_replace_is_opt_in(self):
+        self.assertEqual(Pipeline(name="people", load_type="full").get_write_disposition(), "append")
+        self.assertEqual(Pipeline(name="people", load_type="incremental").get_write_disposition(), "append")
+        self.assertEqual(
+            Pipeline(name="people", load_type="full", incremental_strategy="replace").get_write_disposition(),
+            "replace",
+        )
+
+    def _finalize(self, database, succeeded=True):
+        config = {
+            "connection_url": "mongodb://destination",
+            "database": "analytics",
+            "collection": "people",
+            "write_disposition": "replace",
+            "write_result": WriteResult(),
+        }
+        with mock.patch(
+            "etl_jobs.dlt_config.mongodb.client.get_client", return_value={"analytics": database}
+        ):
+            finalize_destination(DestinationType.MONGODB, config, succeeded=succeeded)
+
+    def test_replace_without_documents_empties_the_target(self):
+        database = StubDatabase()
+        target = database["people"]
+        target.docs = {0: {"_id": 0}}
+        target.indexes = {"email_1": {"key": [("email", 1)], "unique": True, "v": 2}}
+
+        self._finalize(database)
+
+        self.assertEqual(list(database), ["people"])
+        self.assertEqual(database["people"].docs, {})
+        self.assertIn("email_1", database["people"].indexes)
+
+    def test_failed_run_without_documents_keeps_the_target(self):
+        database = StubDatabase()
+        database["people"].docs = {0: {"_id": 0}}
+
+        self._finalize(database, succeeded=False)
+
+        self.assertEqual(list(database), ["people"])
+        self.assertEqual(set(database["people"].docs), {0})
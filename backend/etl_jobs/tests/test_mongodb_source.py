@@ -0,0 +1,389 @@
+import re
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from bson import ObjectId, json_util
+from bson.binary import Binary, UuidRepresentation
+from bson.decimal128 import Decimal128
+from bson.int64 import Int64
+from bson.regex import Regex
+from bson.timestamp import Timestamp
+import dlt
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ..dlt_config.timing import StageTimings
+from ..dlt_config.mongodb import source as mongo_source
+from ..dlt_config.mongodb.source import CollectionLoader, IncrementalCursor, compute_partition_filters
+from ..dlt_config.mongodb.writer import WriteResult
+from .. import fanout
+from ..metrics import RunMetrics, collect_run_metrics
+from ..models import JobExecution, Pipeline
+from ..pipeline import run_pipeline
+from .fixtures import NamedSourceCollection, PartitionedCollection, StubSourceCollection, StubSourceDatabase, T0
+
+
+class IncrementalCursorTests(SimpleTestCase):
+    def test_first_run_has_no_filter(self):
+        cursor = IncrementalCursor("updated_at", {})
+
+        self.assertEqual(cursor.filter(), {})
+        self.assertEqual(cursor.sort(), [("updated_at", 1)])
+
+    def test_tracks_last_value_and_ids_at_that_value(self):
+        state = {}
+        cursor = IncrementalCursor("updated_at", state)
+
+        cursor.update([{"_id": 1, "updated_at": T0}, {"_id": 2, "updated_at": T0 + timedelta(seconds=1)}])
+        cursor.update([{"_id": 3, "updated_at": T0 + timedelta(seconds=1)}, {"_id": 4}])
+
+        self.assertEqual(
+            state["incremental"],
+            {"key": "updated_at", "last_value": T0 + timedelta(seconds=1), "last_ids": [2, 3]},
+        )
+
+    def test_resumes_with_gte_and_drops_documents_already_loaded(self):
+        state = {"incremental": {"key": "updated_at", "last_value": T0, "last_ids": [1, 2]}}
+        cursor = IncrementalCursor("updated_at", state)
+
+        docs = cursor.drop_loaded(
+            [
+                {"_id": 1, "updated_at": T0},
+                {"_id": 2, "updated_at": T0},
+                {"_id": 3, "updated_at": T0},
+                {"_id": 1, "updated_at": T0 + timedelta(seconds=1)},
+            ]
+        )
+
+        self.assertEqual(cursor.filter(), {"updated_at": {"$gte": T0}})
+        self.assertEqual([doc["_id"] for doc in docs], [3, 1])
+
+    def test_stored_value_ignored_when_key_changes(self):
+        state = {"incremental": {"key": "created_at", "last_value": T0, "last_ids": [1]}}
+        cursor = IncrementalCursor("updated_at", state)
+
+        self.assertEqual(cursor.filter(), {})
+        self.assertEqual(cursor.drop_loaded([{"_id": 1, "updated_at": T0}]), [{"_id": 1, "updated_at": T0}])
+
+    def test_orders_decimal128_and_mixed_types_like_mongodb(self):
+        state = {}
+        cursor = IncrementalCursor("version", state)
+
+        tracked = cursor.update(
+            [
+                {"_id": 1, "version": Decimal128("1.5")},
+                {"_id": 2, "version": 2},
+                {"_id": 3, "version": "a"},
+                {"_id": 4, "version": Decimal128("3")},
+            ]
+        )
+
+        self.assertEqual(tracked, 4)
+        # strings sort after numbers in BSON order
+        self.assertEqual(state["incremental"]["last_value"], "a")
+
+    def test_orders_postgres_dates_decimals_and_uuids(self):
+        sort_key = mongo_source.bson_sort_key
+
+        self.assertLess(sort_key(date(2025, 1, 1)), sort_key(datetime(2025, 1, 1, 0, 0, 1)))
+        self.assertEqual(sort_key(date(2025, 1, 1)), sort_key(datetime(2025, 1, 1, tzinfo=timezone.utc)))
+        self.assertLess(sort_key(Decimal("1.5")), sort_key(2))
+        self.assertEqual(sort_key(Decimal("3")), sort_key(Decimal128("3")))
+        self.assertIsNone(sort_key(Decimal("NaN")))
+        low, high = uuid.UUID(int=1), uuid.UUID(int=2 << 120)
+        self.assertLess(sort_key(low), sort_key(high))
+        self.assertEqual(sort_key(high), sort_key(Binary.from_uuid(high)))
+        # binary data sorts after strings and before ObjectIds
+        self.assertLess(sort_key("z"), sort_key(low))
+        self.assertLess(sort_key(high), sort_key(ObjectId()))
+
+    def test_tracks_ids_of_uuid_and_decimal_primary_keys(self):
+        ids = [uuid.UUID(int=1), Decimal("2.50"), date(2025, 1, 2)]
+        state = {"incremental": {"key": "n", "last_value": 1, "last_ids": ids}}
+        cursor = IncrementalCursor("n", state)
+
+        docs = cursor.drop_loaded([{"_id": _id, "n": 1} for _id in ids] + [{"_id": "other", "n": 1}])
+
+        self.assertEqual(docs, [{"_id": "other", "n": 1}])
+
+    def test_skips_unorderable_values(self):
+        state = {}
+        cursor = IncrementalCursor("version", state)
+
+        tracked = cursor.update([{"_id": 1, "version": {"major": 1}}, {"_id": 2, "version": 5}])
+
+        self.assertEqual(tracked, 1)
+        self.assertEqual(state["incremental"]["last_value"], 5)
+
+    def test_compares_naive_and_aware_datetimes(self):
+        state = {"incremental": {"key": "updated_at", "last_value": T0, "last_ids": []}}
+        cursor = IncrementalCursor("updated_at", state)
+
+        cursor.update([{"_id": 1, "updated_at": datetime(2025, 1, 2)}])
+
+        self.assertEqual(state["incremental"]["last_ids"], [1])
+
+
+class CollectionLoaderIncrementalTests(SimpleTestCase):
+    def _loader(self, collection, state, query=None, aggregation_pipeline=None):
+        return CollectionLoader(
+            None,
+            collection,
+            query=query or {},
+            aggregation_pipeline=aggregation_pipeline,
+            incremental=IncrementalCursor("updated_at", state),
+        )
+
+    def test_merges_incremental_filter_into_query(self):
+        state = {"incremental": {"key": "updated_at", "last_value": T0, "last_ids": []}}
+
+        self.assertEqual(
+            self._loader(None, state)._build_query(), {"updated_at": {"$gte": T0}}
+        )
+        self.assertEqual(
+            self._loader(None, state, query={"type": "Student"})._build_query(),
+            {"$and": [{"type": "Student"}, {"updated_at": {"$gte": T0}}]},
+        )
+        self.assertEqual(
+            self._loader(None, {}, query={"type": "Student"})._build_query(), {"type": "Student"}
+        )
+
+    def test_prepends_match_and_sort_to_aggregation_pipeline(self):
+        state = {"incremental": {"key": "updated_at", "last_value": T0, "last_ids": []}}
+
+        self.assertEqual(
+            self._loader(None, state, aggregation_pipeline=[{"$limit": 10}])._build_pipeline(),
+            [
+                {"$match": {"updated_at": {"$gte": T0}}},
+                {"$sort": {"updated_at": 1}},
+                {"$limit": 10},
+            ],
+        )
+        self.assertEqual(
+            self._loader(None, {}, aggregation_pipeline=[{"$limit": 10}])._build_pipeline()[0],
+            {"$match": {"updated_at": {"$exists": True, "$ne": None}}},
+        )
+
+    def test_find_loads_sorted_and_skips_boundary_documents(self):
+        ids = [ObjectId() for _ in range(3)]
+        collection = StubSourceCollection(
+            [
+                {"_id": ids[0], "updated_at": T0},
+                {"_id": ids[1], "updated_at": T0},
+                {"_id": ids[2], "updated_at": T0 + timedelta(minutes=1)},
+            ]
+        )
+        state = {"incremental": {"key": "updated_at", "last_value": T0, "last_ids": [ids[0]]}}
+
+        docs = [doc for chunk in self._loader(collection, state).load_documents() for doc in chunk]
+
+        self.assertEqual([doc["_id"] for doc in docs], [str(ids[1]), str(ids[2])])
+        self.assertEqual(collection.cursor.sort_spec, [("updated_at", 1)])
+        self.assertEqual(state["incremental"]["last_ids"], [ids[2]])
+
+    def test_raises_when_aggregation_drops_the_key(self):
+        collection = StubSourceCollection([{"_id": 1, "name": "a"}])
+        loader = self._loader(collection, {}, aggregation_pipeline=[{"$project": {"name": 1}}])
+
+        with self.assertRaises(ValueError):
+            list(loader.load_documents())
+
+
+class MultiCollectionTests(SimpleTestCase):
+    def database(self):
+        database = StubSourceDatabase()
+        for name, count in (("orders_2024", 3), ("orders_2025", 2), ("people", 4), ("system.views", 1)):
+            database[name] = NamedSourceCollection(
+                name, [{"_id": i, "updated_at": T0 + timedelta(minutes=i)} for i in range(count)]
+            )
+        return database
+
+    def test_matches_names_and_patterns(self):
+        names = ["people", "orders_2025", "orders_2024", "system.views", "audit"]
+        self.assertEqual(
+            mongo_source.match_collections(names, ["orders_*", "people", "orders_2024", "*views"]),
+            ["orders_2024", "orders_2025", "people"],
+        )
+
+    def test_pipeline_config_for_several_collections(self):
+        pipeline = Pipeline(
+            name="shop", source_table="orders_*, people", destination_table="raw_*", collection_workers=3
+        )
+        config = pipeline.get_source_config()
+        self.assertNotIn("collection", config)
+        self.assertEqual(
+            (config["collections"], config["table_name_template"], config["collection_workers"]),
+            (["orders_*", "people"], "raw_*", 3),
+        )
+        self.assertIsNone(pipeline.get_destination_config()["collection"])
+        self.assertEqual(Pipeline(name="one", source_table="people", destination_table="people").get_source_config()["collection"], "people")
+
+        pipeline.destination_table = "raw"
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
+        pipeline.destination_table = "raw_*"
+        pipeline.clean()
+        pipeline.source_type = "postgresql"
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
+
+    def test_loads_every_collection_in_one_run(self):
+        database = self.database()
+        loaded = {}
+
+        @dlt.destination(loader_file_format="typed-jsonl", skip_dlt_columns_and_tables=True)
+        def sink(items, table):
+            loaded.setdefault(table["name"], []).extend(item["_id"] for item in items)
+
+        state = {}
+        source_config = {
+            "type": "mongodb",
+            "connection_url": "mongodb://source",
+            "database": "shop",
+            "collections": ["orders_*", "people"],
+            "table_name_template": "raw_*",
+            "collection_workers": 3,
+            "incremental_key": "updated_at",
+            "state": state,
+        }
+        make_pipeline = dlt.pipeline
+        with tempfile.TemporaryDirectory() as pipelines_dir, mock.patch.object(
+            mongo_source, "get_client", return_value={"shop": database}
+        ), mock.patch("etl_jobs.pipeline.get_destination_factory", return_value=lambda config: sink), mock.patch(
+            "etl_jobs.pipeline.dlt.pipeline",
+            side_effect=lambda **kwargs: make_pipeline(pipelines_dir=pipelines_dir, **kwargs),
+        ):
+            load_info = run_pipeline(source_config, {"type": "mongodb"}, pipeline_name="multi_collection_test")
+
+        self.assertEqual(
+            {table: sorted(ids) for table, ids in loaded.items()},
+            {"raw_orders_2024": [0, 1, 2], "raw_orders_2025": [0, 1], "raw_people": [0, 1, 2, 3]},
+        )
+        metrics = collect_run_metrics(load_info)
+        self.assertEqual(metrics.rows_extracted, 9)
+        self.assertEqual(
+            {table: counters["rows_extracted"] for table, counters in metrics.tables.items()},
+            {"raw_orders_2024": 3, "raw_orders_2025": 2, "raw_people": 4},
+        )
+        self.assertEqual(set(state["collections"]), {"orders_2024", "orders_2025", "people"})
+        self.assertEqual(
+            state["collections"]["people"]["incremental"]["last_value"], T0 + timedelta(minutes=3)
+        )
+        # extracted on dlt's worker threads, not the thread running the pipeline
+        self.assertNotIn(threading.current_thread().name, database["people"].threads)
+
+    def test_execution_keeps_counters_per_table(self):
+        execution = JobExecution(pipeline=Pipeline(name="shop"), started_at=T0)
+        metrics = RunMetrics(rows_extracted=5, tables={"raw_people": {"rows_extracted": 5}})
+        with mock.patch.object(JobExecution, "save"):
+            execution.complete_success("load info", metrics=metrics)
+        self.assertEqual(execution.table_metrics, {"raw_people": {"rows_extracted": 5}})
+
+        merged = fanout.MergedPartitions(
+            [
+                fanout.partition_report(
+                    index, RunMetrics(rows_extracted=rows, tables={"people": {"rows_extracted": rows}}),
+                    WriteResult(), StageTimings(), None, None,
+                )
+                for index, rows in enumerate((2, 3))
+            ]
+        )
+        self.assertEqual(merged.metrics.tables, {"people": {"rows_extracted": 5}})
+
+
+class PartitionedExtractionTests(SimpleTestCase):
+    def _buckets(self, *mins):
+        return [{"_id": {"min": low, "max": None}, "count": 1} for low in mins]
+
+    def test_computes_disjoint_ranges_from_bucket_boundaries(self):
+        collection = PartitionedCollection(self._buckets(0, 10, 20))
+
+        filters = compute_partition_filters(collection, "n", 3, {"active": True})
+
+        self.assertEqual(
+            collection.aggregations[0],
+            [{"$match": {"active": True}}, {"$bucketAuto": {"groupBy": "$n", "buckets": 3}}],
+        )
+        self.assertEqual(
+            filters,
+            [
+                {"$or": [{"n": {"$lt": 10}}, {"n": {"$not": {"$type": "number"}}}]},
+                {"n": {"$gte": 10, "$lt": 20}},
+                {"n": {"$gte": 20}},
+            ],
+        )
+
+    def test_single_or_mixed_type_buckets_are_not_partitioned(self):
+        self.assertEqual(compute_partition_filters(PartitionedCollection(self._buckets(0)), "n", 4), [{}])
+        self.assertEqual(
+            compute_partition_filters(PartitionedCollection(self._buckets(0, "a", ObjectId())), "n", 3),
+            [{}],
+        )
+
+    def test_merges_partitions_and_counts_rows_per_partition(self):
+        buckets = self._buckets(0, 100, 200)
+        filters = compute_partition_filters(PartitionedCollection(buckets), "_id", 3)
+        docs_by_filter = {
+            json_util.dumps(filters[0]): [{"_id": i} for i in range(0, 100)],
+            json_util.dumps(filters[1]): [{"_id": i} for i in range(100, 200)],
+            json_util.dumps(filters[2]): [{"_id": i} for i in range(200, 250)],
+        }
+        collection = PartitionedCollection(buckets, docs_by_filter)
+        loader = CollectionLoader(None, collection, query={}, partitions=3)
+
+        with mock.patch.object(mongo_source, "CHUNK_SIZE", 30):
+            chunks = list(loader.load_documents())
+
+        self.assertEqual(sorted(doc["_id"] for chunk in chunks for doc in chunk), list(range(250)))
+        self.assertTrue(all(len(chunk) <= 30 for chunk in chunks))
+        self.assertEqual(loader.partition_counts, {0: 100, 1: 100, 2: 50})
+
+    def test_partition_errors_are_raised_to_the_consumer(self):
+        buckets = self._buckets(0, 100)
+        filters = compute_partition_filters(PartitionedCollection(buckets), "_id", 2)
+        collection = PartitionedCollection(
+            buckets,
+            {json_util.dumps(filters[0]): [{"_id": 1}]},
+            failing_filter=json_util.dumps(filters[1]),
+        )
+        loader = CollectionLoader(None, collection, query={}, partitions=2)
+
+        with self.assertRaisesMessage(RuntimeError, "cursor killed"):
+            list(loader.load_documents())
+
+
+class ConvertMongoObjsTests(SimpleTestCase):
+    def test_converts_bson_types(self):
+        value = uuid.uuid4()
+        cases = [
+            (ObjectId("6936dcbf513cd68d0ebb26aa"), "6936dcbf513cd68d0ebb26aa"),
+            (Decimal128("2.14"), "2.14"),
+            (value, str(value)),
+            (Binary.from_uuid(value), str(value)),
+            (Binary.from_uuid(value, UuidRepresentation.PYTHON_LEGACY), str(value)),
+            (Binary(b"raw"), b"raw"),
+            (Int64(144), 144),
+            (Regex("^carol", "i"), "^carol"),
+            (re.compile("^doe"), "^doe"),
+        ]
+        for original, expected in cases:
+            with self.subTest(type=type(original).__name__):
+                converted = mongo_source.convert_mongo_objs(original)
+                self.assertEqual(converted, expected)
+                self.assertIs(type(converted), type(expected))
+
+    def test_converts_datetimes_and_timestamps_to_utc(self):
+        naive = mongo_source.convert_mongo_objs(datetime(2025, 1, 1))
+        timestamp = mongo_source.convert_mongo_objs(Timestamp(int(T0.timestamp()), 1))
+
+        self.assertEqual(naive, T0)
+        self.assertEqual(timestamp, T0)
+        self.assertEqual(timestamp.utcoffset(), timedelta(0))
+
+    def test_passes_through_other_values(self):
+        for value in ["x", 1, 1.5, True, None, {"a": 1}, [1]]:
+            self.assertIs(mongo_source.convert_mongo_objs(value), value)
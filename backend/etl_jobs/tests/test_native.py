@@ -0,0 +1,96 @@
+from unittest import mock
+
+from bson import ObjectId, encode
+from bson.raw_bson import RawBSONDocument
+from bson.decimal128 import Decimal128
+from django.test import SimpleTestCase
+
+from ..dlt_config.masking import Masker
+from ..dlt_config.mongodb.native import copy_collection
+from ..metrics import collect_run_metrics
+from ..pipeline import run_pipeline
+from .fixtures import NativeSourceCollection, StubCollection, StubDatabase, T0, copy_native
+
+
+class NativeCopyTests(SimpleTestCase):
+    def _destination(self):
+        destination = StubCollection()
+        destination.full_name = "analytics.people_analytics"
+        return destination
+
+    def test_copies_raw_bson_keeping_native_types(self):
+        ids = [ObjectId() for _ in range(3)]
+        source = NativeSourceCollection(
+            [{"_id": _id, "gpa": Decimal128("3.5"), "enrolled_at": T0} for _id in ids]
+        )
+        destination = self._destination()
+
+        info = copy_native(source, destination)
+
+        self.assertEqual((info.documents, info.write_result.inserted), (3, 3))
+        self.assertEqual(collect_run_metrics(info).bytes_extracted, sum(len(encode(doc)) for doc in source.docs))
+        self.assertEqual(destination.calls, [(2, False), (1, False)])
+        written = destination.docs[ids[0]]
+        self.assertIsInstance(written, RawBSONDocument)
+        self.assertIsInstance(written["_id"], ObjectId)
+        self.assertIsInstance(written["gpa"], Decimal128)
+
+    def test_replace_of_an_empty_source_empties_the_target(self):
+        database = StubDatabase()
+        database["people_analytics"].docs = {0: {"_id": 0}}
+        clients = {
+            "mongodb://source": {"university": {"people": NativeSourceCollection([])}},
+            "mongodb://destination": {"analytics": database},
+        }
+        with mock.patch("etl_jobs.dlt_config.mongodb.native.get_client", side_effect=clients.get):
+            info = copy_collection(
+                {"connection_url": "mongodb://source", "database": "university", "collection": "people"},
+                {
+                    "connection_url": "mongodb://destination",
+                    "database": "analytics",
+                    "collection": "people_analytics",
+                    "write_disposition": "replace",
+                },
+            )
+
+        self.assertEqual(info.documents, 0)
+        self.assertEqual(list(database), ["people_analytics"])
+        self.assertEqual(database["people_analytics"].docs, {})
+
+    def test_masks_decoded_documents_and_tracks_incremental_state(self):
+        _id = ObjectId()
+        source = NativeSourceCollection([{"_id": _id, "email": "carol@example.com", "updated_at": T0}])
+        destination = self._destination()
+        state = {}
+
+        copy_native(
+            source,
+            destination,
+            masker=Masker({"email": "email"}),
+            incremental_key="updated_at",
+            state=state,
+        )
+
+        self.assertIsNot(source.codec_options.document_class, RawBSONDocument)
+        self.assertEqual(destination.docs[_id]["email"], "c***l@example.com")
+        self.assertIsInstance(destination.docs[_id]["_id"], ObjectId)
+        self.assertEqual(state["incremental"]["last_value"], T0)
+
+    def test_run_pipeline_dispatches_mongo_to_mongo_copies(self):
+        source_config = {"type": "mongodb", "connection_url": "mongodb://source"}
+        destination_config = {"type": "mongodb", "connection_url": "mongodb://destination"}
+
+        with mock.patch("etl_jobs.dlt_config.mongodb.native.copy_collection") as copy:
+            result = run_pipeline(source_config, destination_config, native=True)
+
+        copy.assert_called_once_with(source_config, destination_config)
+        self.assertIs(result, copy.return_value)
+
+    def test_tracks_incremental_state_on_raw_documents(self):
+        state = {}
+        source = NativeSourceCollection([{"_id": 1, "updated_at": T0, "meta": {"v": 2}}])
+
+        copy_native(source, self._destination(), incremental_key="meta.v", state=state)
+
+        self.assertEqual(state["incremental"]["last_value"], 2)
+        self.assertEqual(state["incremental"]["last_ids"], [1])
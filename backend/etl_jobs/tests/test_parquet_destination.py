@@ -0,0 +1,183 @@
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+import dlt
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ..dlt_config.mongodb.writer import WriteResult
+from ..dlt_config.parquet import destination as parquet_destination
+from ..models import Pipeline
+from ..pipeline import run_pipeline
+from .fixtures import T0
+
+
+class ParquetDestinationTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+
+    def _writer(self, **options):
+        return parquet_destination.ParquetDatasetWriter(self.root, "events", **options)
+
+    def _files(self):
+        return sorted(
+            os.path.relpath(os.path.join(path, name), self.root)
+            for path, _, names in os.walk(self.root)
+            for name in names
+        )
+
+    def test_partitions_timestamps_by_date_in_hive_directories(self):
+        writer = self._writer(partition_field="created_at")
+        batch = pa.RecordBatch.from_pylist(
+            [
+                {"_id": "a", "created_at": T0},
+                {"_id": "b", "created_at": T0 + timedelta(days=1)},
+                {"_id": "c", "created_at": None},
+            ]
+        )
+
+        writer.write(batch)
+        writer.close()
+
+        directories = [os.path.dirname(path) for path in self._files()]
+        self.assertEqual(
+            directories,
+            [
+                "events/created_at=2025-01-01",
+                "events/created_at=2025-01-02",
+                "events/created_at=__HIVE_DEFAULT_PARTITION__",
+            ],
+        )
+        table = pq.read_table(os.path.join(self.root, self._files()[0]))
+        self.assertEqual(table.column("_id").to_pylist(), ["a"])
+        self.assertEqual(pq.ParquetFile(os.path.join(self.root, self._files()[0])).metadata.row_group(0).column(0).compression, "ZSTD")
+        self.assertEqual(writer.result.inserted, 3)
+
+    def test_rolls_to_a_new_file_at_max_file_bytes(self):
+        writer = self._writer(max_file_bytes=1, row_group_rows=2)
+
+        for start in range(0, 6, 2):
+            writer.write(pa.RecordBatch.from_pylist([{"n": start}, {"n": start + 1}]))
+        writer.close()
+
+        files = self._files()
+        self.assertEqual(len(files), 3)
+        self.assertEqual(
+            sorted(n for path in files for n in pq.read_table(os.path.join(self.root, path)).column("n").to_pylist()),
+            list(range(6)),
+        )
+
+    def test_caps_open_partitions_by_closing_the_least_recently_written(self):
+        writer = self._writer(partition_field="day", max_open_partitions=2)
+
+        for day in ["a", "b", "a", "c", "b"]:
+            writer.write(pa.RecordBatch.from_pylist([{"day": day, "n": 1}]))
+            self.assertLessEqual(len(writer._partitions), 2)
+        self.assertEqual(list(writer._partitions), ["day=c", "day=b"])
+        writer.close()
+
+        files = self._files()
+        # b was closed to make room for c and continued in a second file
+        self.assertEqual(
+            [os.path.dirname(path) for path in files],
+            ["events/day=a", "events/day=b", "events/day=b", "events/day=c"],
+        )
+        self.assertEqual(sum(pq.read_table(os.path.join(self.root, path)).num_rows for path in files), 5)
+        self.assertEqual(pq.read_table(os.path.join(self.root, "events/day=a")).num_rows, 2)
+
+    def test_schema_change_starts_a_new_file(self):
+        writer = self._writer()
+
+        writer.write(pa.RecordBatch.from_pylist([{"n": 1}]))
+        writer.write(pa.RecordBatch.from_pylist([{"n": 2, "name": "b"}]))
+        writer.close()
+
+        self.assertEqual(len(self._files()), 2)
+
+    def test_failed_run_deletes_its_files(self):
+        writer = self._writer(max_file_bytes=1, row_group_rows=1)
+
+        writer.write(pa.RecordBatch.from_pylist([{"n": 1}, {"n": 2}]))
+        self.assertEqual(len(self._files()), 1)
+        writer.close(succeeded=False)
+
+        self.assertEqual(self._files(), [])
+
+    def test_replace_deletes_files_of_earlier_runs(self):
+        first = self._writer()
+        first.write(pa.RecordBatch.from_pylist([{"n": 1}]))
+        first.close()
+        second = self._writer(write_disposition="replace")
+        second.write(pa.RecordBatch.from_pylist([{"n": 2}]))
+        second.close()
+
+        files = self._files()
+        self.assertEqual(len(files), 1)
+        self.assertIn(second.run_id, files[0])
+
+    def test_rejects_merge(self):
+        with self.assertRaises(ValueError):
+            self._writer(write_disposition="merge")
+
+    def test_run_pipeline_writes_parquet_files(self):
+        write_result = WriteResult()
+        source = dlt.resource(
+            [{"_id": "a", "day": "x", "address": {"city": "Almaty"}}, {"_id": "b", "day": "y"}],
+            name="people",
+            max_table_nesting=0,
+        )
+
+        make_pipeline = dlt.pipeline
+        with tempfile.TemporaryDirectory() as pipelines_dir, mock.patch(
+            "etl_jobs.pipeline.get_source_factory", return_value=lambda config: source
+        ), mock.patch(
+            "etl_jobs.pipeline.dlt.pipeline",
+            side_effect=lambda **kwargs: make_pipeline(pipelines_dir=pipelines_dir, **kwargs),
+        ):
+            run_pipeline(
+                {"type": "mongodb"},
+                {
+                    "type": "s3",
+                    "bucket_url": self.root,
+                    "table": "people_export",
+                    "partition_field": "day",
+                    "write_disposition": "append",
+                    "write_result": write_result,
+                },
+                pipeline_name="parquet_test",
+            )
+
+        files = self._files()
+        self.assertEqual([os.path.dirname(path) for path in files], ["people_export/day=x", "people_export/day=y"])
+        table = pq.read_table(os.path.join(self.root, files[0]))
+        self.assertEqual(table.column("_id").to_pylist(), ["a"])
+        self.assertIn("Almaty", table.column("address")[0].as_py())
+        self.assertEqual(write_result.inserted, 2)
+
+    def test_pipeline_builds_s3_destination_config(self):
+        pipeline = Pipeline(
+            name="events",
+            destination_type="s3",
+            destination_uri="s3://etl-exports/mongo",
+            destination_table="events",
+            file_partition_field="created_at",
+            file_max_mb=64,
+        )
+        with self.settings(S3_ENDPOINT_URL="http://minio:9000"):
+            config = pipeline.get_destination_config()
+
+        self.assertEqual(
+            (config["type"], config["bucket_url"], config["partition_field"], config["max_file_bytes"]),
+            ("s3", "s3://etl-exports/mongo", "created_at", 64 * 1024 * 1024),
+        )
+        self.assertEqual(config["storage_options"], {"client_kwargs": {"endpoint_url": "http://minio:9000"}})
+
+        pipeline.incremental_strategy = "merge"
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
@@ -0,0 +1,137 @@
+import tempfile
+from unittest import mock
+
+import dlt
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ..dlt_config.mongodb.checkpoint import Checkpoint
+from ..dlt_config.mongodb.writer import WriteResult
+from ..dlt_config.postgresql import destination as postgres_destination
+from ..models import Pipeline
+from ..pipeline import run_pipeline
+from .fixtures import StubPostgresConnection, T0
+
+
+class PostgresDestinationTests(SimpleTestCase):
+    COLUMNS = {"_id": {"data_type": "text"}, "name": {"data_type": "text"}}
+
+    def _writer(self, connection, write_disposition="append"):
+        return postgres_destination.PostgresWriter(
+            connection, "public", "people", write_disposition=write_disposition
+        )
+
+    def test_csv_fields_quote_values_and_leave_nulls_empty(self):
+        csv_value = postgres_destination._csv_value
+        self.assertEqual(csv_value(None), "")
+        self.assertEqual(csv_value(""), '""')
+        self.assertEqual(csv_value('say "hi",\nbye'), '"say ""hi"",\nbye"')
+        self.assertEqual(csv_value({"city": "Almaty"}, "json"), '"{""city"": ""Almaty""}"')
+        self.assertEqual(csv_value("plain", "json"), '"""plain"""')
+        self.assertEqual(csv_value(True), '"true"')
+        self.assertEqual(csv_value(b"\x01\xff"), '"\\x01ff"')
+        self.assertEqual(csv_value(T0), '"2025-01-01T00:00:00+00:00"')
+
+    def test_copies_into_an_unlogged_staging_table_and_appends_on_close(self):
+        connection = StubPostgresConnection()
+        writer = self._writer(connection)
+
+        writer.write([{"_id": "a", "name": "Ann"}], self.COLUMNS)
+        writer.write([{"_id": "b"}], {**self.COLUMNS, "tags": {"data_type": "json"}})
+        writer.close()
+
+        statements = "\n".join(connection.statements)
+        self.assertIn('CREATE TABLE IF NOT EXISTS "public"."people" ("_id" text, "name" text)', statements)
+        self.assertIn(f'CREATE UNLOGGED TABLE "public"."{writer.staging_table}" ("_etl_seq" bigserial', statements)
+        self.assertIn('ALTER TABLE "public"."people" ADD COLUMN IF NOT EXISTS "tags" jsonb', statements)
+        self.assertIn(f'COPY "public"."{writer.staging_table}" ("_id", "name", "tags") FROM STDIN', statements)
+        self.assertEqual(connection.copies, ['"a","Ann"\n', '"b",,\n'])
+        self.assertTrue(connection.statements[-2].startswith('INSERT INTO "public"."people"'))
+        self.assertEqual(connection.statements[-1], f'DROP TABLE "public"."{writer.staging_table}"')
+        self.assertEqual(writer.result.inserted, 2)
+        self.assertTrue(connection.committed and connection.closed)
+
+    def test_merge_keeps_the_last_row_per_key(self):
+        connection = StubPostgresConnection(merge_counts=(3, 2))
+        writer = self._writer(connection, "merge")
+
+        writer.write([{"_id": "a", "name": "Ann"}], self.COLUMNS)
+        writer.close()
+
+        merge = connection.statements[-2]
+        self.assertIn('SELECT DISTINCT ON ("_id")', merge)
+        self.assertIn('ORDER BY "_id", "_etl_seq" DESC', merge)
+        self.assertIn('ON CONFLICT ("_id") DO UPDATE SET "name" = EXCLUDED."name"', merge)
+        self.assertIn('CREATE UNIQUE INDEX IF NOT EXISTS "people_etl_primary_key__id"', connection.statements[-3])
+        self.assertEqual((writer.result.inserted, writer.result.updated), (3, 2))
+
+    def test_upsert_keeps_existing_values_for_missing_columns(self):
+        connection = StubPostgresConnection()
+        writer = self._writer(connection, "upsert")
+
+        writer.write([{"_id": "a"}], self.COLUMNS)
+        writer.close()
+
+        self.assertIn('"name" = COALESCE(EXCLUDED."name", target."name")', connection.statements[-2])
+
+    def test_failed_run_rolls_back_without_touching_the_target(self):
+        connection = StubPostgresConnection()
+        writer = self._writer(connection, "replace")
+
+        writer.write([{"_id": "a"}], self.COLUMNS)
+        writer.close(succeeded=False)
+
+        self.assertFalse(any(s.startswith(("TRUNCATE", "INSERT")) for s in connection.statements))
+        self.assertTrue(connection.rolled_back and connection.closed)
+        self.assertFalse(connection.committed)
+
+    def test_checkpointed_replace_truncates_only_on_the_first_run(self):
+        resolve = postgres_destination._checkpointed_disposition
+        state = {"checkpoint": {"partitions": [{"filter": {}, "last_id": 9, "done": False}]}}
+
+        self.assertEqual(resolve("replace", None, Checkpoint()), ("replace", None))
+        self.assertEqual(resolve("replace", None, Checkpoint(state)), ("append", None))
+        state["checkpoint"]["in_progress"] = True
+        self.assertEqual(resolve("replace", None, Checkpoint(state)), ("merge", ["_id"]))
+
+    def test_run_pipeline_loads_nested_documents_as_jsonb(self):
+        connection = StubPostgresConnection()
+        write_result = WriteResult()
+        source = dlt.resource(
+            [{"_id": "a", "name": "Ann", "address": {"city": "Almaty"}}], name="people", max_table_nesting=0
+        )
+
+        make_pipeline = dlt.pipeline
+        with tempfile.TemporaryDirectory() as pipelines_dir, mock.patch(
+            "etl_jobs.pipeline.get_source_factory", return_value=lambda config: source
+        ), mock.patch.object(postgres_destination, "connect", return_value=connection), mock.patch(
+            "etl_jobs.pipeline.dlt.pipeline",
+            side_effect=lambda **kwargs: make_pipeline(pipelines_dir=pipelines_dir, **kwargs),
+        ):
+            run_pipeline(
+                {"type": "mongodb"},
+                {
+                    "type": "postgresql",
+                    "connection_url": "postgresql://etl",
+                    "table": "people_analytics",
+                    "write_disposition": "append",
+                    "write_result": write_result,
+                },
+                pipeline_name="postgres_test",
+            )
+
+        self.assertIn('"address" jsonb', "\n".join(connection.statements))
+        self.assertIn('""city"": ""Almaty""', connection.copies[0])
+        self.assertEqual(write_result.inserted, 1)
+        self.assertTrue(connection.committed)
+
+    def test_pipeline_builds_postgres_destination_config(self):
+        pipeline = Pipeline(
+            name="people", destination_type="postgresql", destination_uri="postgresql://etl", destination_table="people"
+        )
+        config = pipeline.get_destination_config()
+        self.assertEqual((config["type"], config["schema"], config["table"]), ("postgresql", "public", "people"))
+
+        pipeline.load_type = "streaming"
+        with self.assertRaises(ValidationError):
+            pipeline.clean()
@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase
+
+from ..dlt_config.mongodb.projection import ensure_projected, projection_drops_field
+from ..dlt_config.mongodb.source import CollectionLoader, IncrementalCursor
+from ..models import Pipeline
+from .fixtures import StubSourceCollection
+
+
+class ProjectionTests(SimpleTestCase):
+    def test_detects_fields_dropped_by_inclusion_projection(self):
+        projection = {"first_name": 1, "address.city": 1}
+
+        self.assertFalse(projection_drops_field(projection, "first_name"))
+        self.assertFalse(projection_drops_field(projection, "address"))
+        self.assertFalse(projection_drops_field(projection, "address.city"))
+        self.assertTrue(projection_drops_field(projection, "address.street"))
+        self.assertTrue(projection_drops_field(projection, "email"))
+        self.assertFalse(projection_drops_field(projection, "_id"))
+        self.assertTrue(projection_drops_field({"_id": 0, "email": 1}, "_id"))
+
+    def test_detects_fields_dropped_by_exclusion_projection(self):
+        projection = {"metadata": 0, "student.enrolled_courses": 0}
+
+        self.assertTrue(projection_drops_field(projection, "metadata.notes"))
+        self.assertTrue(projection_drops_field(projection, "student.enrolled_courses"))
+        self.assertFalse(projection_drops_field(projection, "student.gpa"))
+        self.assertFalse(projection_drops_field(None, "email"))
+
+    def test_ensure_projected_keeps_required_fields(self):
+        self.assertEqual(ensure_projected({"email": 1}, ["updated_at"]), {"email": 1, "updated_at": 1})
+        self.assertEqual(ensure_projected({"metadata": 0}, ["metadata.updated_at"]), {})
+        self.assertEqual(ensure_projected({"email": 1}, ["email"]), {"email": 1})
+
+    def test_find_and_aggregate_receive_projection(self):
+        collection = StubSourceCollection([{"_id": 1, "email": "a@example.com"}])
+        list(CollectionLoader(None, collection, query={}, projection={"email": 1}).load_documents())
+        self.assertEqual(collection.find_projection, {"email": 1})
+
+        loader = CollectionLoader(
+            None,
+            collection,
+            query={},
+            aggregation_pipeline=[{"$match": {"type": "Student"}}],
+            incremental=IncrementalCursor("updated_at", {}),
+            projection={"email": 1},
+        )
+        self.assertEqual(loader._build_pipeline()[-1], {"$project": {"email": 1, "updated_at": 1}})
+
+    def test_pipeline_warns_when_projection_drops_masked_fields(self):
+        pipeline = Pipeline(
+            name="people",
+            source_projection={"first_name": 1, "address": 1},
+            masking_config={"email": "email", "address.city": "hash"},
+        )
+
+        with self.assertLogs("etl_jobs.models", level="WARNING"):
+            config = pipeline.get_source_config()
+
+        self.assertEqual(config["projection"], {"first_name": 1, "address": 1})
+        self.assertEqual(pipeline.get_masked_fields_dropped_by_projection(), ["email"])
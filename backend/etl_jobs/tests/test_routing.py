@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .. import routing, schedules
+from ..models import Pipeline
+
+
+class PipelineQueueTests(SimpleTestCase):
+    def last_run_bytes(self, pipeline, extracted):
+        executions = mock.MagicMock()
+        executions.filter.return_value.order_by.return_value.values_list.return_value.first.return_value = extracted
+        return mock.patch.object(Pipeline, "executions", executions)
+
+    def test_auto_workload_follows_the_last_run(self):
+        pipeline = Pipeline(name="people")
+        with self.settings(HEAVY_PIPELINE_MB=1):
+            with self.last_run_bytes(pipeline, 512 * 1024):
+                self.assertEqual(pipeline.get_queue(), "light")
+            with self.last_run_bytes(pipeline, 2 * 1024 * 1024):
+                self.assertEqual(pipeline.get_queue(), "heavy")
+            with self.last_run_bytes(pipeline, None):
+                self.assertEqual(pipeline.get_queue(), "light")
+
+    def test_streaming_and_explicit_workloads(self):
+        self.assertEqual(Pipeline(name="changes", load_type="streaming").get_queue(), "streaming")
+        self.assertEqual(Pipeline(name="changes", load_type="streaming", workload="heavy").get_queue(), "streaming")
+        self.assertEqual(Pipeline(name="people", workload="heavy").get_queue(), "heavy")
+
+    def test_routes_pipeline_runs_by_workload(self):
+        with mock.patch.object(Pipeline.objects, "get", return_value=Pipeline(pk=7, workload="heavy")) as get:
+            self.assertEqual(
+                routing.route_pipeline_task(schedules.RUN_PIPELINE_TASK, [7], {}, {}), {"queue": "heavy"}
+            )
+            get.assert_called_once_with(pk=7)
+            self.assertIsNone(routing.route_pipeline_task("etl_jobs.tasks.sample_etl_task", [], {}, {}))
+            get.reset_mock()
+            self.assertIsNone(routing.route_pipeline_task(schedules.RUN_PIPELINE_TASK, [7], {}, {"queue": "light"}))
+            get.assert_not_called()
+        with mock.patch.object(Pipeline.objects, "get", side_effect=Pipeline.DoesNotExist):
+            self.assertEqual(
+                routing.route_pipeline_task(schedules.RUN_PIPELINE_TASK, [], {"pipeline_id": 8}, {}),
+                {"queue": "light"},
+            )
+
+    def test_celery_app_uses_the_router(self):
+        from myproject.celery import app
+
+        with mock.patch.object(Pipeline.objects, "get", return_value=Pipeline(pk=7, workload="heavy")):
+            route = app.amqp.router.route({}, schedules.RUN_PIPELINE_TASK, args=[7])
+        self.assertEqual(route["queue"].name, "heavy")
+        with mock.patch.object(Pipeline.objects, "get") as get:
+            route = app.amqp.router.route({"queue": "streaming"}, schedules.RUN_PIPELINE_TASK, args=[7])
+        self.assertEqual(route["queue"].name, "streaming")
+        get.assert_not_called()
+        self.assertEqual(app.conf.worker_prefetch_multiplier, 1)
+        self.assertTrue(app.conf.task_acks_late)
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from .. import locks, schedules
+from ..models import Pipeline
+from .fixtures import StubRedisLock
+
+
+class PipelineScheduleTests(SimpleTestCase):
+    def setUp(self):
+        StubRedisLock.held = {}
+        redis = mock.Mock(lock=StubRedisLock)
+        patcher = mock.patch.object(locks, "_redis", return_value=redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parses_five_field_cron_expressions(self):
+        self.assertEqual(
+            schedules.parse_cron("30 2 * * mon-fri"),
+            {"minute": "30", "hour": "2", "day_of_month": "*", "month_of_year": "*", "day_of_week": "mon-fri"},
+        )
+        for expression in ("0 2 * *", "61 * * * *"):
+            with self.assertRaises(ValueError):
+                schedules.parse_cron(expression)
+        with self.assertRaises(ValidationError):
+            Pipeline(name="people", frequency="every day").clean()
+
+    def test_syncs_the_frequency_into_a_periodic_task(self):
+        from django_celery_beat.models import CrontabSchedule, PeriodicTask
+
+        pipeline = Pipeline(pk=7, name="people", frequency="0 2 * * *", is_enabled=False)
+        crontab = mock.Mock()
+        with mock.patch.object(CrontabSchedule.objects, "get_or_create", return_value=(crontab, True)) as schedule, \
+                mock.patch.object(PeriodicTask.objects, "update_or_create", return_value=(mock.Mock(), True)) as task:
+            schedules.sync_pipeline_schedule(pipeline)
+
+        schedule.assert_called_once_with(
+            minute="0", hour="2", day_of_month="*", month_of_year="*", day_of_week="*", timezone="UTC"
+        )
+        defaults = task.call_args.kwargs["defaults"]
+        self.assertEqual(task.call_args.kwargs["name"], "etl-pipeline-7")
+        self.assertEqual((defaults["task"], defaults["args"]), ("etl_jobs.tasks.run_pipeline_task", "[7]"))
+        self.assertIs(defaults["crontab"], crontab)
+        self.assertFalse(defaults["enabled"])
+
+    def test_clearing_the_frequency_removes_the_task(self):
+        from django_celery_beat.models import PeriodicTask
+
+        with mock.patch.object(PeriodicTask.objects, "filter") as filter_tasks:
+            filter_tasks.return_value.delete.return_value = (1, {})
+            self.assertIsNone(schedules.sync_pipeline_schedule(Pipeline(pk=7, name="people")))
+        filter_tasks.assert_called_once_with(name="etl-pipeline-7")
+
+    def test_sync_state_saves_leave_the_schedule_alone(self):
+        from .. import signals
+
+        with mock.patch.object(signals, "sync_pipeline_schedule") as sync:
+            signals.sync_schedule_on_save(Pipeline, Pipeline(pk=7), update_fields={"sync_state", "updated_at"})
+            sync.assert_not_called()
+            signals.sync_schedule_on_save(Pipeline, Pipeline(pk=7), update_fields=None)
+            sync.assert_called_once()
+
+    def test_run_is_skipped_while_the_pipeline_is_locked(self):
+        from .. import tasks
+
+        with mock.patch.object(tasks, "PipelineExecutionService") as service:
+            with locks.pipeline_lock(7) as acquired:
+                self.assertTrue(acquired)
+                result = tasks.run_pipeline_task(7)
+            self.assertEqual(result["status"], "skipped")
+            service.assert_not_called()
+
+            service.return_value.execute.return_value = {"status": "success"}
+            self.assertEqual(tasks.run_pipeline_task(7)["status"], "success")
+        self.assertEqual(StubRedisLock.held, {})
+
+    def test_requeues_after_releasing_the_lock(self):
+        from .. import tasks
+
+        def requeue(args, queue):
+            self.assertEqual(StubRedisLock.held, {})
+
+        with mock.patch.object(tasks, "PipelineExecutionService") as service, mock.patch.object(
+            tasks.run_pipeline_task, "apply_async", side_effect=requeue
+        ) as apply_async:
+            service.return_value.pipeline = Pipeline(pk=7, load_type="streaming")
+            service.return_value.execute.return_value = {"status": "success", "requeue": True}
+            tasks.run_pipeline_task(7)
+
+        # the service already loaded the pipeline; the router isn't asked again
+        apply_async.assert_called_once_with((7,), queue="streaming")
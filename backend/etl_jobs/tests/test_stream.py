@@ -0,0 +1,134 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import OperationFailure
+
+from ..dlt_config.masking import Masker
+from ..dlt_config.mongodb.stream import ChangeStreamSync, StreamInfo
+from ..models import JobExecution, Pipeline
+from ..services import PipelineExecutionService
+from .fixtures import StubBulkCollection, StubWatchedCollection, change
+
+
+class ChangeStreamSyncTests(SimpleTestCase):
+    def test_applies_last_event_per_document_in_batches_and_saves_token(self):
+        events = [
+            change("1", "insert", 1, {"_id": 1, "email": "ab@x"}),
+            change("2", "update", 1, {"_id": 1, "email": "cd@x"}),
+            change("3", "insert", 2, {"_id": 2, "email": "ef@x"}),
+            change("4", "delete", 2),
+            change("5", "replace", 3, {"_id": 3, "email": "gh@x"}),
+        ]
+        destination = StubBulkCollection()
+        saved = []
+        sync = ChangeStreamSync(
+            StubWatchedCollection(events),
+            destination,
+            state={},
+            batch_size=4,
+            masker=Masker({"email": "stars"}),
+            on_flush=lambda state: saved.append(state["change_stream"]["resume_token"]),
+        )
+
+        info = sync.run()
+
+        first, second = destination.batches
+        self.assertEqual([type(op) for op in first], [ReplaceOne, DeleteOne])
+        self.assertEqual(first[0]._doc, {"_id": 1, "email": "****"})
+        self.assertEqual([op._filter for op in second], [{"_id": 3}])
+        self.assertEqual(saved, [{"_data": "4"}, {"_data": "5"}])
+        self.assertEqual((info.events, info.batches, info.upserted, info.deleted), (5, 2, 2, 1))
+
+    def test_resumes_after_saved_token(self):
+        source = StubWatchedCollection([])
+        state = {"change_stream": {"resume_token": {"_data": "9"}}}
+
+        ChangeStreamSync(source, StubBulkCollection(), state=state).run()
+
+        self.assertEqual(source.watch_calls[0]["resume_after"], {"_data": "9"})
+        self.assertEqual(source.watch_calls[0]["full_document"], "updateLookup")
+
+    def test_flushes_partial_batches_after_flush_seconds(self):
+        destination = StubBulkCollection()
+        sync = ChangeStreamSync(
+            StubWatchedCollection([change("1", "insert", 1, {"_id": 1}), None, None]),
+            destination,
+            flush_seconds=0,
+        )
+
+        with mock.patch.object(sync, "_flush", wraps=sync._flush) as flush:
+            sync.run()
+
+        self.assertEqual(flush.call_count, 1)
+        self.assertEqual(len(destination.batches), 1)
+
+    def test_invalidate_clears_token_and_stops(self):
+        state = {"change_stream": {"resume_token": {"_data": "1"}}}
+        events = [change("2", "insert", 1, {"_id": 1}), {"_id": {"_data": "3"}, "operationType": "invalidate"}]
+
+        info = ChangeStreamSync(StubWatchedCollection(events), StubBulkCollection(), state=state).run()
+
+        self.assertTrue(info.invalidated)
+        self.assertEqual(state["change_stream"], {})
+        self.assertEqual(info.events, 1)
+
+    def test_lost_history_clears_token_and_ends_the_session(self):
+        saved = []
+        state = {"change_stream": {"resume_token": {"_data": "1"}}}
+        destination = StubBulkCollection()
+        events = [
+            change("2", "insert", 1, {"_id": 1}),
+            OperationFailure("resume point no longer in the oplog", code=286),
+            change("3", "insert", 2, {"_id": 2}),
+        ]
+
+        info = ChangeStreamSync(
+            StubWatchedCollection(events), destination, state=state, on_flush=lambda state: saved.append(dict(state))
+        ).run()
+
+        self.assertTrue(info.history_lost)
+        self.assertEqual(state["change_stream"], {})
+        self.assertEqual(saved[-1], {"change_stream": {}})
+        # changes read before the error are still applied
+        self.assertEqual(info.events, 1)
+        self.assertEqual(len(destination.batches), 1)
+        self.assertIn("re-sync", str(info))
+
+    def test_other_change_stream_errors_fail_the_session(self):
+        state = {"change_stream": {"resume_token": {"_data": "1"}}}
+        events = [OperationFailure("not primary", code=10107)]
+
+        with self.assertRaises(OperationFailure):
+            ChangeStreamSync(StubWatchedCollection(events), StubBulkCollection(), state=state).run()
+        self.assertEqual(state["change_stream"], {"resume_token": {"_data": "1"}})
+
+    def test_lost_history_marks_the_run_for_a_resync_without_requeueing(self):
+        service = PipelineExecutionService(pipeline_id=1)
+        service.pipeline = Pipeline(name="people", load_type="streaming")
+        service.execution = JobExecution(pipeline=service.pipeline, execution_id="run-1")
+        service.source_config = {"state": {"change_stream": {}}}
+        info = StreamInfo(source="university.people", destination="analytics.people", history_lost=True)
+
+        with mock.patch.object(JobExecution, "save"), mock.patch.object(Pipeline, "save_sync_state") as save_state:
+            service._handle_success(info)
+            result = service._success_result(info)
+
+        self.assertEqual(service.execution.status, "resync_required")
+        self.assertIn("full load", service.execution.error_message)
+        self.assertEqual((result["status"], result["requeue"]), ("resync_required", False))
+        save_state.assert_called_once_with({"change_stream": {}})
+        self.assertTrue(service._should_requeue(StreamInfo(source="a", destination="b")))
+
+    def test_streaming_source_config(self):
+        pipeline = Pipeline(
+            name="people",
+            load_type="streaming",
+            stream_flush_seconds=2,
+            sync_state={"change_stream": {"resume_token": {"_data": "8"}}},
+        )
+
+        config = pipeline.get_source_config()
+
+        self.assertEqual(config["flush_seconds"], 2)
+        self.assertEqual(config["state"]["change_stream"]["resume_token"], {"_data": "8"})
@@ -0,0 +1,154 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from ..dlt_config.mongodb import writer as bulk_writer
+from ..dlt_config.mongodb.writer import BulkWriter, WriteResult
+from ..models import Pipeline
+from .fixtures import StubCollection, UpsertCollection
+
+
+class BulkWriterTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(bulk_writer, "RETRY_BACKOFF_SECONDS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _docs(self, ids):
+        return [{"_id": doc_id} for doc_id in ids]
+
+    def test_splits_items_into_unordered_batches(self):
+        collection = StubCollection()
+        writer = BulkWriter(collection, batch_size=10)
+
+        writer.write(self._docs(range(25)))
+
+        self.assertEqual(collection.calls, [(10, False), (10, False), (5, False)])
+        self.assertEqual(writer.result.inserted, 25)
+
+    def test_retries_only_retryable_errors(self):
+        collection = StubCollection(existing=[3], failures={5: 1})
+        writer = BulkWriter(collection, batch_size=10)
+
+        writer.write(self._docs(range(10)))
+
+        self.assertEqual(writer.result.inserted, 9)
+        self.assertEqual(writer.result.failed, 1)
+        self.assertEqual(writer.result.retried, 1)
+        self.assertEqual(writer.result.write_errors, 2)
+        # second call only resends the retryable document
+        self.assertEqual(collection.calls, [(10, False), (1, False)])
+
+    def test_gives_up_after_max_retries(self):
+        collection = StubCollection(failures={1: 100})
+        writer = BulkWriter(collection, batch_size=10, max_retries=2)
+
+        writer.write(self._docs(range(3)))
+
+        self.assertEqual(len(collection.calls), 3)
+        self.assertEqual(writer.result.inserted, 2)
+        self.assertEqual(writer.result.failed, 1)
+        self.assertEqual(writer.result.retried, 2)
+
+    def test_duplicates_after_reconnect_are_ambiguous(self):
+        collection = StubCollection(existing=[0], reconnects=1)
+        writer = BulkWriter(collection, batch_size=10)
+
+        writer.write(self._docs(range(10)))
+
+        self.assertEqual(len(collection.docs), 10)
+        self.assertEqual(writer.result.inserted, 0)
+        self.assertEqual(writer.result.ambiguous, 10)
+        self.assertEqual(writer.result.failed, 0)
+
+    def test_parallel_writes_finish_within_the_call_and_share_one_pool(self):
+        collection = StubCollection()
+        result = WriteResult()
+        writer = BulkWriter(collection, batch_size=5, max_in_flight=3, result=result)
+
+        writer.write(self._docs(range(0, 20)))
+        executor = writer._executor
+        # acknowledged before write() returns, nothing carried into the next call
+        self.assertEqual(len(writer._pending), 0)
+        self.assertEqual(len(collection.docs), 20)
+        writer.write(self._docs(range(20, 40)))
+        self.assertIs(writer._executor, executor)
+        writer.close()
+
+        self.assertIsNone(writer._executor)
+        self.assertEqual(result.inserted, 40)
+        self.assertEqual(len(collection.docs), 40)
+        self.assertTrue(all(name.startswith("mongo-bulk-writer") for name in collection.threads))
+
+    def test_failed_parallel_batch_is_raised_by_the_call_that_wrote_it(self):
+        collection = StubCollection()
+        insert_many = collection.insert_many
+
+        def failing_insert(documents, ordered=True):
+            if documents[0]["_id"] == 5:
+                raise OperationFailure("not primary", code=10107)
+            return insert_many(documents, ordered=ordered)
+
+        collection.insert_many = failing_insert
+        writer = BulkWriter(collection, batch_size=5, max_in_flight=2)
+
+        with self.assertRaises(OperationFailure):
+            writer.write(self._docs(range(20)))
+
+        # the other batches of the call were waited for, not left in flight
+        self.assertEqual(len(writer._pending), 0)
+        self.assertEqual(len(collection.docs), 15)
+        writer.write(self._docs(range(20, 25)))
+        writer.close()
+        self.assertEqual(writer.result.inserted, 20)
+
+
+class MergeWriteTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(bulk_writer, "RETRY_BACKOFF_SECONDS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_merge_replaces_documents_by_primary_key(self):
+        collection = UpsertCollection("_id", existing=[{"_id": 1, "name": "old", "stale": True}])
+        writer = BulkWriter(collection, write_disposition="merge")
+
+        writer.write([{"_id": 1, "name": "new"}, {"_id": 2, "name": "b"}])
+
+        self.assertEqual(collection.docs, {1: {"_id": 1, "name": "new"}, 2: {"_id": 2, "name": "b"}})
+        self.assertEqual((writer.result.inserted, writer.result.updated), (1, 1))
+        self.assertEqual(collection.indexes, [])  # _id is already unique
+
+    def test_upsert_sets_fields_and_creates_unique_index(self):
+        collection = UpsertCollection("email", existing=[{"_id": "t1", "email": "a@x", "kept": 1}])
+        writer = BulkWriter(collection, write_disposition="upsert", primary_key=["email"])
+
+        writer.write([{"_id": "s1", "email": "a@x", "name": "A"}, {"_id": "s2", "email": "b@x"}])
+
+        self.assertEqual(collection.indexes, [([("email", 1)], {"unique": True, "name": "etl_primary_key_email"})])
+        self.assertEqual(collection.docs["a@x"], {"_id": "t1", "email": "a@x", "kept": 1, "name": "A"})
+        self.assertEqual(collection.docs["b@x"]["_id"], "s2")
+        self.assertTrue(all(isinstance(op, UpdateOne) for op in collection.operations))
+
+    def test_keeps_last_version_per_key_and_retries_upsert_races(self):
+        collection = UpsertCollection("_id", races=1)
+        writer = BulkWriter(collection, write_disposition="merge")
+
+        writer.write([{"_id": 1, "v": 1}, {"_id": 1, "v": 2}])
+
+        self.assertEqual(collection.docs, {1: {"_id": 1, "v": 2}})
+        self.assertEqual((writer.result.inserted, writer.result.retried, writer.result.failed), (1, 1, 0))
+
+    def test_rejects_unknown_write_disposition(self):
+        with self.assertRaises(ValueError):
+            BulkWriter(UpsertCollection("_id"), write_disposition="replace-all")
+
+    def test_pipeline_destination_config(self):
+        pipeline = Pipeline(name="people", incremental_strategy="upsert", primary_key="tenant, email")
+
+        config = pipeline.get_destination_config()
+
+        self.assertEqual((config["write_disposition"], config["primary_key"]), ("upsert", ["tenant", "email"]))
+        self.assertEqual(Pipeline(name="people").get_destination_config()["primary_key"], ["_id"])
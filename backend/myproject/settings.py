@@ -98,6 +98,18 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Secret from which each pipeline's hash-masking salt is derived (see
+# Pipeline.get_masking_salt); "hash" rules are refused while it is unset
+MASKING_SALT = config("MASKING_SALT", default="")
+
+# Streaming pipelines run in sessions of this length, then requeue themselves
+# (kept below CELERY_TASK_TIME_LIMIT)
+STREAM_RUN_SECONDS = config("STREAM_RUN_SECONDS", default=25 * 60, cast=int)
+
+# S3 stand-in (e.g. MinIO) for Parquet destinations on s3:// URLs; credentials
+# come from AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY
+S3_ENDPOINT_URL = config("S3_ENDPOINT_URL", default="")
+
 # Celery Configuration Options
 CELERY_TIMEZONE = "UTC"
 CELERY_TASK_TRACK_STARTED = True
@@ -109,6 +121,27 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Pipeline runs go to the light, heavy or streaming queue (see etl_jobs/routing.py),
+# each with its own workers in docker-compose.yml; other tasks use the light queue
+CELERY_TASK_DEFAULT_QUEUE = "light"
+CELERY_TASK_ROUTES = ("etl_jobs.routing.route_pipeline_task",)
+# auto-workload pipelines whose last run extracted more than this go to heavy
+HEAVY_PIPELINE_MB = config("HEAVY_PIPELINE_MB", default=512, cast=int)
+# a worker process reserves one run at a time, so a queued run never waits
+# behind a long one in a busy process while another process is idle
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# runs are acknowledged when they finish: a run on a worker that goes down
+# mid-run is redelivered (the pipeline lock skips it if it's still running)
+CELERY_TASK_ACKS_LATE = True
+# redelivery of unacknowledged runs waits out the longest run
+CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": CELERY_TASK_TIME_LIMIT + 5 * 60}
+# worker processes are replaced once their resident memory passes this (KiB),
+# returning memory that long loads leave fragmented; workers override it per queue
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = config("CELERY_WORKER_MAX_MEMORY_PER_CHILD", default=512 * 1024, cast=int)
+
+# Redis holding the per-pipeline run locks (see etl_jobs/locks.py)
+PIPELINE_LOCK_URL = config("PIPELINE_LOCK_URL", default=CELERY_BROKER_URL)
+
 # Celery Beat Schedule Configuration
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_BEAT_SCHEDULE = {